@@ -3,23 +3,45 @@ Main data collection pipeline
 Orchestrates all collectors and stores data
 """
 import asyncio
+import time
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from loguru import logger
 
 from collectors import (
-    CPUCollector, RAMCollector, GPUCollector,
+    BaseCollector, CPUCollector, RAMCollector, GPUCollector,
     DiskCollector, NetworkCollector, ProcessCollector, ContextCollector,
     TemperatureCollector, AIDA64Collector, HWiNFOCollector
 )
-from storage import Database, Repository
+from collectors.snapshot import ProcessSnapshot
+from aggregator.ring_buffer import MetricRingBuffer
+from storage import Database, Repository, SnapshotWriter
 from models import SystemSnapshot
 from config import Config
 
 
+# Numeric snapshot fields kept in the in-memory hot ring
+HOT_METRIC_FIELDS = (
+    'cpu_usage',
+    'ram_usage',
+    'disk_read',
+    'disk_write',
+    'net_download',
+    'net_upload',
+)
+
+
 class Pipeline:
     """Main data collection and aggregation pipeline"""
     
+    # Adaptive polling: back off while metrics are stable, snap back on change
+    ADAPTIVE_EMA_ALPHA = 0.3
+    ADAPTIVE_CHANGE_THRESHOLD = 2.0  # Smoothed abs-delta (percent points / MB/s)
+    ADAPTIVE_STABLE_TICKS = 5
+    
+    # Daily maintenance (archiving, planner statistics) while collecting
+    MAINTENANCE_INTERVAL_SECONDS = 24 * 60 * 60
+    
     def __init__(self, config: Config):
         self.config = config
         
@@ -29,8 +51,10 @@ class Pipeline:
         self.gpu_collector = GPUCollector()
         self.disk_collector = DiskCollector()
         self.network_collector = NetworkCollector()
-        self.process_collector = ProcessCollector(top_n=10)
-        self.context_collector = ContextCollector()
+        # Process and context collectors share one process table walk per tick
+        self._process_snapshot = ProcessSnapshot()
+        self.process_collector = ProcessCollector(top_n=10, snapshot=self._process_snapshot)
+        self.context_collector = ContextCollector(snapshot=self._process_snapshot)
         self.temperature_collector = TemperatureCollector()
         
         # Initialize AIDA64 collector if enabled
@@ -47,17 +71,51 @@ class Pipeline:
             self.hwinfo_collector = HWiNFOCollector()
             logger.info("HWiNFO64 collector enabled")
         
+        # Collectors polled on every tick, in result-unpacking order
+        self._collectors: Tuple[BaseCollector, ...] = tuple(
+            collector for collector in (
+                self.cpu_collector,
+                self.ram_collector,
+                self.gpu_collector,
+                self.disk_collector,
+                self.network_collector,
+                self.process_collector,
+                self.context_collector,
+                self.temperature_collector,
+                self.aida64_collector,
+                self.hwinfo_collector,
+            )
+            if collector is not None
+        )
+        
+        # Recent numeric metrics for in-process consumers (no DB round trip)
+        self._hot_ring = MetricRingBuffer(
+            HOT_METRIC_FIELDS, capacity=config.intervals.hot_window_seconds
+        )
+        
         # Initialize storage
         self.database = Database(config.storage.database_path)
         self.repository = Repository(self.database)
+        # Snapshots that queue up while a write is in flight share its transaction
+        self.writer = SnapshotWriter(self.repository)
         
         # Pipeline state
         self.running = False
         self._collection_task: Optional[asyncio.Task] = None
+        self._pending_write: Optional[asyncio.Future] = None
+        
+        # Adaptive polling state
+        self.adaptive_interval: float = config.intervals.high_frequency
+        self._base_interval: float = config.intervals.high_frequency
+        self._max_interval: float = max(config.intervals.low_frequency, self._base_interval)
+        self._last_values: Optional[Tuple[float, ...]] = None
+        self._change_ema: List[float] = []
+        self._stable_ticks = 0
     
     async def initialize(self):
         """Initialize the pipeline"""
         await self.database.connect()
+        self.writer.start()
         logger.info("Pipeline initialized")
     
     async def shutdown(self):
@@ -65,40 +123,38 @@ class Pipeline:
         self.running = False
         
         if self._collection_task:
-            self._collection_task.cancel()
+            # Give the current tick a chance to finish; wait_for cancels it on timeout
             try:
-                await self._collection_task
-            except asyncio.CancelledError:
+                await asyncio.wait_for(self._collection_task, timeout=self._base_interval * 2)
+            except asyncio.TimeoutError:
                 pass
+            except asyncio.CancelledError:
+                # Only an already-cancelled collection task is expected; if shutdown
+                # itself is being cancelled, pass that on to the caller
+                if not self._collection_task.cancelled() or asyncio.current_task().cancelling():
+                    raise
+        
+        # Never close the connection under an in-flight snapshot write
+        if self._pending_write and not self._pending_write.done():
+            try:
+                await self._pending_write
+            except Exception as e:
+                logger.error(f"Pending snapshot write failed during shutdown: {e}")
         
+        await self.writer.stop()
         await self.database.disconnect()
         logger.info("Pipeline shutdown complete")
     
     async def collect_once(self) -> SystemSnapshot:
         """Collect data once from all collectors"""
         try:
-            # Collect from all sources concurrently
-            tasks = [
-                self.cpu_collector.safe_collect(),
-                self.ram_collector.safe_collect(),
-                self.gpu_collector.safe_collect(),
-                self.disk_collector.safe_collect(),
-                self.network_collector.safe_collect(),
-                self.process_collector.safe_collect(),
-                self.context_collector.safe_collect(),
-                self.temperature_collector.safe_collect()
-            ]
-            
-            # Add AIDA64 collector if enabled
-            if self.aida64_collector:
-                tasks.append(self.aida64_collector.safe_collect())
+            # Start each tick from a fresh process table
+            self._process_snapshot.invalidate()
             
-            # Add HWiNFO collector if enabled
-            if self.hwinfo_collector:
-                tasks.append(self.hwinfo_collector.safe_collect())
-            
-            # Wait for all collectors
-            results = await asyncio.gather(*tasks)
+            # Collect from all sources concurrently
+            results = await asyncio.gather(
+                *[collector.safe_collect() for collector in self._collectors]
+            )
             
             # Unpack results
             cpu = results[0]
@@ -108,7 +164,6 @@ class Pipeline:
             network = results[4]
             processes = results[5]
             context = results[6]
-            temperatures = results[7]
             
             # Get optional collector results
             result_index = 8
@@ -123,19 +178,17 @@ class Pipeline:
                 hwinfo_data = results[result_index]
                 result_index += 1
             
-            # Merge temperature data from AIDA64 if available
+            # Sensor readings are not part of the snapshot yet; only log what arrived
             if aida64_data and 'sensors' in aida64_data:
-                if temperatures is None:
-                    temperatures = {}
-                temperatures['aida64'] = aida64_data['sensors']
-                logger.debug(f"AIDA64 sensors: {len(aida64_data['sensors'])} readings")
+                logger.opt(lazy=True).debug(
+                    "AIDA64 sensors: {} readings", lambda: len(aida64_data['sensors'])
+                )
             
-            # Merge temperature data from HWiNFO if available
             if hwinfo_data:
-                if temperatures is None:
-                    temperatures = {}
-                temperatures['hwinfo'] = hwinfo_data
-                logger.debug(f"HWiNFO sensors: {len(hwinfo_data.get('temperatures', {}))} temperature readings")
+                logger.opt(lazy=True).debug(
+                    "HWiNFO sensors: {} temperature readings",
+                    lambda: len(hwinfo_data.get('temperatures', {}))
+                )
             
             # Create snapshot
             snapshot = SystemSnapshot(
@@ -155,31 +208,121 @@ class Pipeline:
             logger.error(f"Error collecting data: {e}")
             raise
     
-    async def collect_and_store(self) -> int:
-        """Collect data and store in database"""
+    async def collect_and_store(self) -> Tuple[int, SystemSnapshot]:
+        """
+        Collect data and store in database
+        Returns (snapshot_id, snapshot) so callers can reuse the collected data
+        """
         snapshot = await self.collect_once()
-        snapshot_id = await self.repository.save_snapshot(snapshot)
-        return snapshot_id
+        values = self._hot_values(snapshot)
+        self._hot_ring.append(values)
+        # Shield the write so cancellation cannot interrupt it mid-transaction
+        self._pending_write = self.writer.submit(snapshot)
+        snapshot_id = await asyncio.shield(self._pending_write)
+        self._update_adaptive_interval(values)
+        return snapshot_id, snapshot
+    
+    @staticmethod
+    def _hot_values(snapshot: SystemSnapshot) -> Tuple[float, ...]:
+        """Extract the numeric hot metrics from a snapshot (HOT_METRIC_FIELDS order)"""
+        return (
+            snapshot.cpu.usage_percent,
+            snapshot.ram.usage_percent,
+            snapshot.disk.read_mbps,
+            snapshot.disk.write_mbps,
+            snapshot.network.download_mbps,
+            snapshot.network.upload_mbps,
+        )
+    
+    def get_recent_array(self, field: str, n: int) -> memoryview:
+        """
+        Get the n most recent values of a hot metric without querying the database
+        Returns a read-only memoryview of doubles (wrap with numpy.frombuffer if needed)
+        """
+        return self._hot_ring.get_recent(field, n)
+    
+    def _reset_adaptive_state(self):
+        """Start adaptive polling over from the base interval"""
+        self.adaptive_interval = self._base_interval
+        self._last_values = None
+        self._change_ema = []
+        self._stable_ticks = 0
+    
+    def _update_adaptive_interval(self, values: Tuple[float, ...]):
+        """
+        Adjust the polling interval based on how fast metrics are changing
+        Doubles the interval (up to the cap) after a run of stable ticks and
+        resets to the base interval on any large change
+        """
+        last_values = self._last_values
+        self._last_values = values
+        
+        if last_values is None:
+            return
+        
+        alpha = self.ADAPTIVE_EMA_ALPHA
+        threshold = self.ADAPTIVE_CHANGE_THRESHOLD
+        deltas = [abs(new - old) for new, old in zip(values, last_values)]
+        
+        if not self._change_ema:
+            self._change_ema = deltas
+        else:
+            self._change_ema = [
+                alpha * delta + (1 - alpha) * ema
+                for delta, ema in zip(deltas, self._change_ema)
+            ]
+        
+        # Any large raw delta means the system is busy again
+        if max(deltas) >= threshold * 2 or max(self._change_ema) >= threshold:
+            self._stable_ticks = 0
+            if self.adaptive_interval != self._base_interval:
+                logger.debug(f"Metrics changing, polling interval reset to {self._base_interval}s")
+            self.adaptive_interval = self._base_interval
+            return
+        
+        self._stable_ticks += 1
+        if self._stable_ticks >= self.ADAPTIVE_STABLE_TICKS:
+            self._stable_ticks = 0
+            new_interval = min(self.adaptive_interval * 2, self._max_interval)
+            if new_interval != self.adaptive_interval:
+                logger.debug(f"Metrics stable, polling interval raised to {new_interval}s")
+            self.adaptive_interval = new_interval
+    
+    async def _run_maintenance(self):
+        """Archive aged history and refresh the query planner's statistics"""
+        archive_after_days = self.config.storage.archive_after_days
+        if archive_after_days > 0:
+            await self.repository.archive_old_data(archive_after_days)
+        await self.database.optimize()
     
     async def start_continuous_collection(self, interval_seconds: int = 1):
         """Start continuous data collection"""
         self.running = True
-        logger.info(f"Starting continuous collection (interval: {interval_seconds}s)")
+        self._base_interval = interval_seconds
+        self._max_interval = max(self.config.intervals.low_frequency, interval_seconds)
+        self._reset_adaptive_state()
+        logger.info(f"Starting continuous collection (interval: {interval_seconds}s, adaptive up to {self._max_interval}s)")
         
         consecutive_errors = 0
         max_consecutive_errors = 10
+        next_maintenance = time.monotonic() + self.MAINTENANCE_INTERVAL_SECONDS
         
         while self.running:
             try:
                 await self.collect_and_store()
                 consecutive_errors = 0  # Reset error counter on success
-                await asyncio.sleep(interval_seconds)
+                
+                if time.monotonic() >= next_maintenance:
+                    next_maintenance = time.monotonic() + self.MAINTENANCE_INTERVAL_SECONDS
+                    await self._run_maintenance()
+                
+                await asyncio.sleep(self.adaptive_interval)
             except asyncio.CancelledError:
                 logger.info("Collection cancelled")
                 break
             except Exception as e:
                 consecutive_errors += 1
-                logger.error(f"Error in collection loop (attempt {consecutive_errors}/{max_consecutive_errors}): {e}", exc_info=True)
+                logger.warning("Error in collection loop (attempt {}/{}): {}", consecutive_errors, max_consecutive_errors, e)
                 
                 # If too many consecutive errors, stop the pipeline
                 if consecutive_errors >= max_consecutive_errors:
@@ -15,6 +15,11 @@ class QueueManager:
         self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
         self._workers: list[asyncio.Task] = []
         self._running = False
+        
+        # Expose queue state checks as bound methods (no wrapper frame)
+        self.qsize: Callable[[], int] = self.queue.qsize
+        self.is_empty: Callable[[], bool] = self.queue.empty
+        self.is_full: Callable[[], bool] = self.queue.full
     
     async def put(self, item: Any):
         """Add item to queue"""
@@ -88,15 +93,3 @@ class QueueManager:
     async def wait_empty(self):
         """Wait for queue to be empty"""
         await self.queue.join()
-    
-    def qsize(self) -> int:
-        """Get current queue size"""
-        return self.queue.qsize()
-    
-    def is_empty(self) -> bool:
-        """Check if queue is empty"""
-        return self.queue.empty()
-    
-    def is_full(self) -> bool:
-        """Check if queue is full"""
-        return self.queue.full()
@@ -2,8 +2,10 @@
 Ring buffer implementation
 Circular buffer for efficient data storage
 """
-from typing import Generic, TypeVar, List, Optional
+from array import array
+from typing import Generic, TypeVar, List, Optional, Sequence
 from collections import deque
+from itertools import islice
 
 T = TypeVar('T')
 
@@ -44,7 +46,8 @@ class RingBuffer(Generic[T]):
         """Get n most recent items"""
         if n >= len(self._buffer):
             return list(self._buffer)
-        return list(self._buffer)[-n:]
+        # Copy only the tail instead of the whole buffer
+        return list(islice(self._buffer, len(self._buffer) - n, None))
     
     def clear(self):
         """Clear all items from buffer"""
@@ -68,3 +71,70 @@ class RingBuffer(Generic[T]):
     
     def __repr__(self) -> str:
         return f"RingBuffer(capacity={self.capacity}, size={len(self._buffer)})"
+
+
+class MetricRingBuffer:
+    """
+    Fixed-size struct-of-arrays ring buffer for numeric metrics
+    Each field is a contiguous array of doubles written twice (at slot i and
+    i + capacity), so the most recent n values are always one contiguous
+    slice that can be handed out as a zero-copy memoryview
+    
+    Safe for one writer plus concurrent readers without a lock: head and size
+    are packed into a single int that is published with one attribute store
+    after the values are written, so readers always see a consistent pair
+    (possibly one sample stale)
+    """
+    
+    _SIZE_MASK = 0xFFFFFFFF
+    
+    def __init__(self, fields: Sequence[str], capacity: int):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self._columns = {
+            field: array('d', bytes(2 * capacity * array('d').itemsize))
+            for field in self.fields
+        }
+        self._column_list = [self._columns[field] for field in self.fields]
+        self._state = 0  # (head << 32) | size, head = next slot to write
+    
+    def append(self, values: Sequence[float]):
+        """Add one sample (values in field order)"""
+        state = self._state
+        head = state >> 32
+        size = state & self._SIZE_MASK
+        upper = head + self.capacity
+        
+        for column, value in zip(self._column_list, values):
+            column[head] = value
+            column[upper] = value
+        
+        if size < self.capacity:
+            size += 1
+        
+        # Publish head and size together
+        self._state = (((head + 1) % self.capacity) << 32) | size
+    
+    def get_recent(self, field: str, n: int) -> memoryview:
+        """
+        Get the n most recent values of a field (oldest to newest)
+        Returns a read-only view into the buffer, valid until the next append
+        """
+        state = self._state
+        n = min(n, state & self._SIZE_MASK)
+        end = (state >> 32) + self.capacity
+        return memoryview(self._columns[field])[end - n:end].toreadonly()
+    
+    def clear(self):
+        """Forget all samples"""
+        self._state = 0
+    
+    def __len__(self) -> int:
+        """Get current number of samples"""
+        return self._state & self._SIZE_MASK
+    
+    def __repr__(self) -> str:
+        return f"MetricRingBuffer(fields={len(self.fields)}, capacity={self.capacity}, size={len(self)})"
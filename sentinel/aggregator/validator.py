@@ -2,6 +2,7 @@
 Data validation utilities
 Validate collected metrics before storage
 """
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
 
 
@@ -10,6 +11,20 @@ class ValidationError(Exception):
     pass
 
 
+# Flat snapshot check table: (field getter, is_percentage, label)
+# Non-percentage fields are checked for being positive
+_SNAPSHOT_CHECKS = (
+    (attrgetter('cpu.usage_percent'), True, 'CPU usage'),
+    (attrgetter('cpu.frequency_mhz'), False, 'CPU frequency'),
+    (attrgetter('ram.usage_percent'), True, 'RAM usage'),
+    (attrgetter('ram.total_gb'), False, 'Total RAM'),
+    (attrgetter('disk.read_mbps'), False, 'Disk read speed'),
+    (attrgetter('disk.write_mbps'), False, 'Disk write speed'),
+    (attrgetter('network.download_mbps'), False, 'Download speed'),
+    (attrgetter('network.upload_mbps'), False, 'Upload speed'),
+)
+
+
 class DataValidator:
     """Validate collected metrics data"""
     
@@ -140,3 +155,32 @@ class DataValidator:
             return False
         
         return True
+    
+    @staticmethod
+    def validate_snapshot(snapshot: Any) -> List[str]:
+        """
+        Validate all metric groups of a snapshot in a single pass
+        Returns list of validation errors (empty if valid)
+        """
+        if not DataValidator.is_valid_snapshot(snapshot):
+            return ["Snapshot is missing required metric groups"]
+        
+        errors = []
+        
+        for getter, is_percentage, label in _SNAPSHOT_CHECKS:
+            value = getter(snapshot)
+            if is_percentage:
+                if not 0 <= value <= 100:
+                    errors.append(f"{label} must be between 0 and 100, got {value}")
+            elif value < 0:
+                errors.append(f"{label} must be positive, got {value}")
+        
+        for idx, usage in enumerate(snapshot.cpu.per_core_usage):
+            if not 0 <= usage <= 100:
+                errors.append(f"Core {idx} usage must be between 0 and 100, got {usage}")
+        
+        ram = snapshot.ram
+        if ram.used_gb > ram.total_gb:
+            errors.append(f"Used RAM ({ram.used_gb} GB) cannot exceed total RAM ({ram.total_gb} GB)")
+        
+        return errors
@@ -3,9 +3,10 @@ Main CLI entry point
 Provides commands for data collection and monitoring
 """
 import asyncio
+import atexit
 import sys
-from datetime import datetime
 from pathlib import Path
+from typing import Optional
 import click
 from loguru import logger
 from rich.console import Console
@@ -17,9 +18,44 @@ from config import Config
 from aggregator import Pipeline
 from utils.logger import setup_logger
 
+# Optional faster event loops: uvloop (POSIX) or winloop (Windows)
+try:
+    import uvloop
+    _loop_factory = uvloop.new_event_loop
+except ImportError:
+    try:
+        import winloop
+        _loop_factory = winloop.new_event_loop
+    except ImportError:
+        _loop_factory = None
+
+try:
+    import orjson
+except ImportError:  # Optional speedup for JSON export
+    orjson = None
+
 
 console = Console()
 
+# Column schemas for the CLI tables: (header, style, width)
+_DB_STATS_COLUMNS = (("Metric", "cyan", 25), ("Value", "green", None))
+_SYSTEM_COLUMNS = (("Component", "cyan", 20), ("Metric", "yellow", 25), ("Value", "green", None))
+_COMPONENT_COLUMNS = (
+    ("Component", "cyan", 15),
+    ("Status", "yellow", 15),
+    ("Database", "green", 20),
+    ("Details", "dim", None),
+)
+_HISTORY_COLUMNS = (("Timestamp", "cyan", None), ("Value", "green", None))
+
+
+def _new_table(title: str, columns: tuple) -> Table:
+    """Create a table with columns from a precomputed schema"""
+    table = Table(title=title, show_header=True)
+    for header, style, width in columns:
+        table.add_column(header, style=style, width=width)
+    return table
+
 
 @click.group()
 @click.option('--log-level', default='INFO', help='Logging level')
@@ -30,12 +66,27 @@ def cli(log_level):
     setup_logger(log_level=log_level, log_file=log_file)
 
 
+_runner: Optional[asyncio.Runner] = None
+
+
+def _run(coro):
+    """
+    Run a command coroutine on a shared event loop
+    The loop is created once per process and reused by later commands
+    """
+    global _runner
+    if _runner is None:
+        _runner = asyncio.Runner(loop_factory=_loop_factory)
+        atexit.register(_runner.close)
+    return _runner.run(coro)
+
+
 @cli.command()
 @click.option('--interval', default=1, help='Collection interval in seconds')
 @click.option('--duration', default=None, type=int, help='Duration in seconds (default: infinite)')
 def monitor(interval, duration):
     """Start continuous monitoring"""
-    asyncio.run(_monitor(interval, duration))
+    _run(_monitor(interval, duration))
 
 
 async def _monitor(interval: int, duration: int = None):
@@ -48,36 +99,45 @@ async def _monitor(interval: int, duration: int = None):
         console.print("[green]Starting monitoring...[/green]")
         logger.info(f"Monitoring started (interval: {interval}s, duration: {duration or 'infinite'})")
         
-        start_time = datetime.now()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration if duration else None
+        next_tick = loop.time()
         count = 0
         
-        while True:
-            try:
-                # Check duration
-                if duration and (datetime.now() - start_time).seconds >= duration:
-                    logger.info(f"Duration limit reached ({duration}s), stopping monitoring")
-                    break
-                
-                # Collect and store
-                snapshot_id = await pipeline.collect_and_store()
-                count += 1
-                logger.info(f"Collected snapshot {snapshot_id} (iteration {count})")
-                
-                # Display current metrics (only if console is available)
+        # Redraw the frame in place each tick instead of clearing the screen
+        with Live(console=console, auto_refresh=False) as live:
+            while True:
                 try:
-                    snapshot = await pipeline.collect_once()
-                    _display_snapshot(snapshot, count)
-                except Exception as display_error:
-                    # Console display failed (likely running in background), just log
-                    logger.debug(f"Console display skipped: {display_error}")
-                
-                await asyncio.sleep(interval)
+                    # Check duration (monotonic, immune to wall-clock jumps)
+                    if deadline is not None and loop.time() >= deadline:
+                        logger.info(f"Duration limit reached ({duration}s), stopping monitoring")
+                        break
+                    
+                    # Collect and store
+                    snapshot_id, snapshot = await pipeline.collect_and_store()
+                    count += 1
+                    logger.opt(lazy=True).debug("Collected snapshot {} (iteration {})", lambda: snapshot_id, lambda: count)
+                    
+                    # Update the live display in place (only if console is available)
+                    try:
+                        live.update(_build_snapshot_frame(snapshot, count), refresh=True)
+                    except Exception as display_error:
+                        # Console display failed (likely running in background), just log
+                        logger.debug(f"Console display skipped: {display_error}")
+                    
+                except Exception as e:
+                    logger.warning("Error in monitoring loop (iteration {}): {}", count, e)
+                    console.print(f"[red]Error: {e}[/red]")
+                    # Continue monitoring despite errors
                 
-            except Exception as e:
-                logger.error(f"Error in monitoring loop (iteration {count}): {e}", exc_info=True)
-                console.print(f"[red]Error: {e}[/red]")
-                # Continue monitoring despite errors
-                await asyncio.sleep(interval)
+                # Sleep until the next scheduled tick so collection time doesn't cause drift
+                next_tick += interval
+                delay = next_tick - loop.time()
+                if delay < 0:
+                    # Fell behind (e.g. a slow collection); resync rather than burst
+                    next_tick = loop.time()
+                    delay = 0
+                await asyncio.sleep(delay)
     
     except KeyboardInterrupt:
         console.print("\n[yellow]Monitoring stopped by user[/yellow]")
@@ -92,33 +152,45 @@ async def _monitor(interval: int, duration: int = None):
         logger.info("Monitoring stopped")
 
 
+def _build_snapshot_frame(snapshot, count) -> Panel:
+    """Build the metrics frame for a snapshot as a single preformatted panel"""
+    rows = [
+        ("Timestamp", str(snapshot.timestamp)),
+        ("CPU Usage", f"{snapshot.cpu.usage_percent:.1f}%"),
+        ("RAM Usage", f"{snapshot.ram.usage_percent:.1f}%"),
+        ("Disk Read", f"{snapshot.disk.read_mbps:.2f} MB/s"),
+        ("Disk Write", f"{snapshot.disk.write_mbps:.2f} MB/s"),
+        ("Network Down", f"{snapshot.network.download_mbps:.2f} MB/s"),
+        ("Network Up", f"{snapshot.network.upload_mbps:.2f} MB/s"),
+    ]
+    if snapshot.gpu:
+        rows.extend(
+            (f"GPU {idx} Usage", f"{gpu.usage_percent:.1f}%")
+            for idx, gpu in enumerate(snapshot.gpu)
+        )
+    
+    frame = "\n".join(f"[cyan]{label:<13}[/] [green]{value}[/]" for label, value in rows)
+    return Panel(frame, title=f"System Metrics (Sample #{count})", expand=False)
+
+
 def _display_snapshot(snapshot, count):
     """Display snapshot in terminal"""
-    table = Table(title=f"System Metrics (Sample #{count})")
-    
-    table.add_column("Metric", style="cyan")
-    table.add_column("Value", style="green")
+    frame = _build_snapshot_frame(snapshot, count)
     
-    table.add_row("Timestamp", str(snapshot.timestamp))
-    table.add_row("CPU Usage", f"{snapshot.cpu.usage_percent:.1f}%")
-    table.add_row("RAM Usage", f"{snapshot.ram.usage_percent:.1f}%")
-    table.add_row("Disk Read", f"{snapshot.disk.read_mbps:.2f} MB/s")
-    table.add_row("Disk Write", f"{snapshot.disk.write_mbps:.2f} MB/s")
-    table.add_row("Network Down", f"{snapshot.network.download_mbps:.2f} MB/s")
-    table.add_row("Network Up", f"{snapshot.network.upload_mbps:.2f} MB/s")
-    
-    if snapshot.gpu:
-        for idx, gpu in enumerate(snapshot.gpu):
-            table.add_row(f"GPU {idx} Usage", f"{gpu.usage_percent:.1f}%")
-    
-    console.clear()
-    console.print(table)
+    # Render the frame off-screen, then emit clear + frame in a single write
+    with console.capture() as capture:
+        console.print(frame)
+    frame = capture.get()
+    if console.is_terminal:
+        frame = "\x1b[H\x1b[2J" + frame
+    console.file.write(frame)
+    console.file.flush()
 
 
 @cli.command()
 def collect():
     """Collect data once and display"""
-    asyncio.run(_collect())
+    _run(_collect())
 
 
 async def _collect():
@@ -130,9 +202,7 @@ async def _collect():
         await pipeline.initialize()
         
         console.print("[cyan]Collecting system metrics...[/cyan]")
-        snapshot_id = await pipeline.collect_and_store()
-        
-        snapshot = await pipeline.collect_once()
+        snapshot_id, snapshot = await pipeline.collect_and_store()
         _display_snapshot(snapshot, 1)
         
         console.print(f"\n[green]Data saved with ID: {snapshot_id}[/green]")
@@ -145,7 +215,7 @@ async def _collect():
 @click.option('--full', is_flag=True, help='Show full system status including all components')
 def status(full):
     """Show database status and statistics"""
-    asyncio.run(_status(full))
+    _run(_status(full))
 
 
 async def _status(full: bool = False):
@@ -159,9 +229,7 @@ async def _status(full: bool = False):
         # Database statistics
         stats = await pipeline.get_statistics()
         
-        db_table = Table(title="Sentinel Database Statistics", show_header=True)
-        db_table.add_column("Metric", style="cyan", width=25)
-        db_table.add_column("Value", style="green")
+        db_table = _new_table("Sentinel Database Statistics", _DB_STATS_COLUMNS)
         
         db_table.add_row("Total Snapshots", str(stats['total_snapshots']))
         db_table.add_row("Database Size", f"{stats['database_size_mb']:.2f} MB")
@@ -185,10 +253,7 @@ async def _status(full: bool = False):
         try:
             snapshot = await pipeline.collect_once()
             
-            sys_table = Table(title="Current System Metrics", show_header=True)
-            sys_table.add_column("Component", style="cyan", width=20)
-            sys_table.add_column("Metric", style="yellow", width=25)
-            sys_table.add_column("Value", style="green")
+            sys_table = _new_table("Current System Metrics", _SYSTEM_COLUMNS)
             
             # CPU
             sys_table.add_row("CPU", "Usage", f"{snapshot.cpu.usage_percent:.1f}%")
@@ -235,42 +300,27 @@ async def _status(full: bool = False):
 
 async def _show_component_status():
     """Show status of all Phase 2 components"""
-    import subprocess
-    from pathlib import Path
+    import psutil
     
-    components_table = Table(title="Phase 2 Components Status", show_header=True)
-    components_table.add_column("Component", style="cyan", width=15)
-    components_table.add_column("Status", style="yellow", width=15)
-    components_table.add_column("Database", style="green", width=20)
-    components_table.add_column("Details", style="dim")
+    components_table = _new_table("Phase 2 Components Status", _COMPONENT_COLUMNS)
     
     base_path = Path(__file__).parent.parent.parent
     components = ['sentinel', 'oracle', 'sage', 'guardian', 'nexus']
     
-    for component in components:
-        comp_path = base_path / component
-        
-        # Check installation
-        venv_path = comp_path / ".venv" / "Scripts" / "python.exe"
-        installed = venv_path.exists()
-        
-        # Check database
-        db_path = comp_path / "data"
-        db_files = list(db_path.glob("*.db")) if db_path.exists() else []
-        
-        # Check if running (basic check for python processes)
-        running = False
-        try:
-            result = subprocess.run(
-                ['powershell', '-Command', f'Get-Process python -ErrorAction SilentlyContinue | Where-Object {{$_.Path -like "*{component}*"}}'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            running = bool(result.stdout.strip())
-        except:
-            pass
-        
+    # List running Python executables once (in-process) and match components locally
+    python_paths = []
+    for proc in psutil.process_iter(['name', 'exe']):
+        name = proc.info['name']
+        if name and 'python' in name.lower():
+            python_paths.append((proc.info['exe'] or '').lower())
+    
+    # Run the per-component filesystem checks concurrently
+    results = await asyncio.gather(*[
+        asyncio.to_thread(_check_component, base_path, component, python_paths)
+        for component in components
+    ])
+    
+    for component, (installed, db_files, running) in zip(components, results):
         # Status
         if not installed:
             status = "❌ Not Installed"
@@ -291,28 +341,39 @@ async def _show_component_status():
     console.print()
     
     # Show running Python processes
-    try:
-        result = subprocess.run(
-            ['powershell', '-Command', 'Get-Process python -ErrorAction SilentlyContinue | Measure-Object | Select-Object -ExpandProperty Count'],
-            capture_output=True,
-            text=True,
-            timeout=2
-        )
-        count = result.stdout.strip()
-        if count and count != '0':
-            console.print(f"[green]Python Processes Running: {count}[/green]")
-        else:
-            console.print("[yellow]No Python processes detected[/yellow]")
-    except:
-        pass
+    if python_paths:
+        console.print(f"[green]Python Processes Running: {len(python_paths)}[/green]")
+    else:
+        console.print("[yellow]No Python processes detected[/yellow]")
+
+
+def _check_component(base_path: Path, component: str, python_paths: list) -> tuple:
+    """
+    Check a component's installation, databases and running state
+    Returns (installed, db_files, running)
+    """
+    comp_path = base_path / component
+    
+    # Check installation
+    venv_path = comp_path / ".venv" / "Scripts" / "python.exe"
+    installed = venv_path.exists()
+    
+    # Check database
+    db_path = comp_path / "data"
+    db_files = list(db_path.glob("*.db")) if db_path.exists() else []
+    
+    # Check if running (basic check for python processes)
+    running = any(component in path for path in python_paths)
+    
+    return installed, db_files, running
 
 
 @cli.command()
-@click.option('--metric', required=True, help='Metric name (cpu, ram, disk_read, network_download)')
+@click.option('--metric', required=True, help='Metric name (cpu, ram, disk_read, disk_write, network_download, network_upload)')
 @click.option('--hours', default=24, help='Hours of history to show')
 def history(metric, hours):
     """View historical data for a metric"""
-    asyncio.run(_history(metric, hours))
+    _run(_history(metric, hours))
 
 
 async def _history(metric: str, hours: int):
@@ -323,21 +384,20 @@ async def _history(metric: str, hours: int):
     try:
         await pipeline.initialize()
         
-        data = await pipeline.repository.get_metric_history(metric, hours)
+        data = await pipeline.repository.get_metric_history(metric, hours, limit=20)
         
         if not data:
             console.print(f"[yellow]No data found for metric: {metric}[/yellow]")
             return
         
-        table = Table(title=f"{metric.upper()} History (Last {hours} hours)")
-        table.add_column("Timestamp", style="cyan")
-        table.add_column("Value", style="green")
+        table = _new_table(f"{metric.upper()} History (Last {hours} hours)", _HISTORY_COLUMNS)
         
-        for point in data[-20:]:  # Show last 20 points
+        for point in data:
             table.add_row(str(point['timestamp']), f"{point['value']:.2f}")
         
+        total = await pipeline.repository.count_metric_history(metric, hours)
         console.print(table)
-        console.print(f"\n[dim]Showing last 20 of {len(data)} data points[/dim]")
+        console.print(f"\n[dim]Showing last {len(data)} of {total} data points[/dim]")
     
     finally:
         await pipeline.shutdown()
@@ -349,7 +409,7 @@ async def _history(metric: str, hours: int):
 @click.option('--hours', default=24, help='Hours of data to export')
 def export(format, output, hours):
     """Export data to file"""
-    asyncio.run(_export(format, output, hours))
+    _run(_export(format, output, hours))
 
 
 async def _export(format: str, output: str, hours: int):
@@ -360,21 +420,42 @@ async def _export(format: str, output: str, hours: int):
     try:
         await pipeline.initialize()
         
-        data = await pipeline.repository.get_recent_snapshots(limit=hours * 3600)
+        # Stream rows straight from the DB cursor to the file
+        rows = pipeline.repository.iter_recent_snapshots(limit=hours * 3600)
+        count = 0
         
         if format == 'json':
-            import json
+            # Rows are plain JSON types (ISO timestamps), so no default= fallback needed
+            if orjson is not None:
+                def dumps(row) -> str:
+                    return orjson.dumps(row).decode()
+            else:
+                import json
+                dumps = json.dumps
+            
             with open(output, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+                f.write('[')
+                async for row in rows:
+                    f.write(',\n  ' if count else '\n  ')
+                    f.write(dumps(row))
+                    count += 1
+                f.write('\n]\n' if count else ']\n')
         elif format == 'csv':
             import csv
-            if data:
-                with open(output, 'w', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(data)
+            from operator import itemgetter
+            getter = None
+            with open(output, 'w', newline='') as f:
+                writer = csv.writer(f)
+                async for row in rows:
+                    if getter is None:
+                        # Resolve the column order once, then extract each row as a tuple
+                        keys = list(row.keys())
+                        getter = itemgetter(*keys)
+                        writer.writerow(keys)
+                    writer.writerow(getter(row))
+                    count += 1
         
-        console.print(f"[green]Exported {len(data)} records to {output}[/green]")
+        console.print(f"[green]Exported {count} records to {output}[/green]")
     
     finally:
         await pipeline.shutdown()
@@ -0,0 +1,43 @@
+"""
+Fast process iteration helpers
+Avoids the per-process PID-reuse check that psutil < 6.0 runs in process_iter
+"""
+import psutil
+from typing import Dict, Iterator
+
+
+# psutil 6.0 dropped the is_running()/create_time() check from process_iter
+PSUTIL_FAST_ITER = psutil.version_info >= (6, 0)
+
+# Process objects kept across calls so cpu_percent() has a previous sample
+_process_cache: Dict[int, psutil.Process] = {}
+
+
+def fast_process_iter() -> Iterator[psutil.Process]:
+    """
+    Iterate running processes without re-verifying cached instances
+    Uses psutil.process_iter on psutil >= 6.0, otherwise walks psutil.pids()
+    """
+    if PSUTIL_FAST_ITER:
+        return psutil.process_iter()
+    return _iter_pids()
+
+
+def _iter_pids() -> Iterator[psutil.Process]:
+    """Yield cached Process instances for the current PIDs"""
+    pids = psutil.pids()
+    
+    # Forget processes that have exited
+    live = set(pids)
+    for pid in [pid for pid in _process_cache if pid not in live]:
+        del _process_cache[pid]
+    
+    for pid in pids:
+        proc = _process_cache.get(pid)
+        if proc is None:
+            try:
+                proc = psutil.Process(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            _process_cache[pid] = proc
+        yield proc
@@ -0,0 +1,76 @@
+"""
+Shared WMI connection handling
+Talks to WbemScripting through pywin32 directly; opening a connection costs
+a DCOM handshake, so connections are reused
+"""
+import threading
+from typing import Any, Dict, List, Optional
+
+try:
+    import pythoncom
+    import win32com.client
+except ImportError:  # Windows only: pywin32 isn't installed
+    pythoncom = None
+
+WMI_AVAILABLE = pythoncom is not None
+
+DEFAULT_NAMESPACE = "root\\cimv2"
+
+# ExecQuery flags: wbemFlagReturnImmediately | wbemFlagForwardOnly
+WBEM_FLAGS_FORWARD_ONLY = 0x10 | 0x20
+WBEM_IMPERSONATION_IMPERSONATE = 3
+
+
+def com_initialize():
+    """Enter a COM apartment on the calling thread (thread pool initializer)"""
+    if pythoncom is not None:
+        pythoncom.CoInitialize()
+
+
+class WMISession:
+    """A WbemScripting connection to one WMI namespace"""
+    
+    def __init__(self, namespace: Optional[str] = None):
+        locator = win32com.client.Dispatch("WbemScripting.SWbemLocator")
+        self._services = locator.ConnectServer(".", namespace or DEFAULT_NAMESPACE)
+        self._services.Security_.ImpersonationLevel = WBEM_IMPERSONATION_IMPERSONATE
+    
+    def query(self, wql: str) -> List[Any]:
+        """
+        Run a WQL query and return the result objects
+        Properties are read straight off the objects, e.g. row.Name
+        """
+        return list(self._services.ExecQuery(wql, "WQL", WBEM_FLAGS_FORWARD_ONLY))
+
+
+class WMIConnectionCache:
+    """
+    WMI connections keyed by namespace, opened on first use
+    COM objects belong to the apartment that created them, so each thread
+    gets its own set of connections
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+    
+    def _connections(self) -> Dict[Optional[str], Any]:
+        """Connections opened by the calling thread"""
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        return connections
+    
+    def get(self, namespace: Optional[str] = None) -> Any:
+        """Return the connection for a namespace (default: root\\cimv2), connecting if needed"""
+        connections = self._connections()
+        conn = connections.get(namespace)
+        if conn is None:
+            if not WMI_AVAILABLE:
+                raise RuntimeError("pywin32 is not installed")
+            conn = WMISession(namespace)
+            connections[namespace] = conn
+        return conn
+    
+    def invalidate(self, namespace: Optional[str] = None):
+        """Drop a connection after an error so the next call reconnects"""
+        self._connections().pop(namespace, None)
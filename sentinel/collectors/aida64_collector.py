@@ -2,11 +2,30 @@
 AIDA64 integration collector
 Collects data from AIDA64 if available
 """
-import xml.etree.ElementTree as ET
+import re
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from .base import BaseCollector
 
+try:
+    from lxml import etree as ET  # C-accelerated parsing
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+
+# Report sections collected into the result: tag name -> result key
+_SECTIONS = {
+    'Computer': 'computer',
+    'Motherboard': 'motherboard',
+    'Processor': 'processor',
+    'Memory': 'memory',
+    'Display': 'display',
+    'Storage': 'storage',
+}
+
+# First signed decimal number (with optional exponent) in a sensor value
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
 
 class AIDA64Collector(BaseCollector):
     """Collects data from AIDA64 reports"""
@@ -14,6 +33,8 @@ class AIDA64Collector(BaseCollector):
     def __init__(self, report_path: Optional[Path] = None):
         super().__init__("AIDA64")
         self.report_path = report_path or self._find_aida64_report()
+        # Last parse result keyed by (path, mtime_ns, size)
+        self._cache: Optional[Tuple[Tuple[Path, int, int], Dict[str, Any]]] = None
     
     def _find_aida64_report(self) -> Optional[Path]:
         """Try to find AIDA64 report file"""
@@ -33,58 +54,62 @@ class AIDA64Collector(BaseCollector):
     
     async def collect(self) -> Optional[Dict[str, Any]]:
         """Collect data from AIDA64 report"""
-        if not self.report_path or not self.report_path.exists():
+        if not self.report_path:
             return None
         
         try:
-            tree = ET.parse(self.report_path)
-            root = tree.getroot()
-            
-            data = {}
-            
-            # Parse different sections
-            data['computer'] = self._parse_section(root, 'Computer')
-            data['motherboard'] = self._parse_section(root, 'Motherboard')
-            data['processor'] = self._parse_section(root, 'Processor')
-            data['memory'] = self._parse_section(root, 'Memory')
-            data['display'] = self._parse_section(root, 'Display')
-            data['storage'] = self._parse_section(root, 'Storage')
-            data['sensors'] = self._parse_sensors(root)
-            
+            st = self.report_path.stat()
+        except OSError:
+            return None
+        
+        # Reuse the previous parse while the report file is unchanged
+        key = (self.report_path, st.st_mtime_ns, st.st_size)
+        if self._cache and self._cache[0] == key:
+            return self._cache[1]
+        
+        try:
+            data = self._parse_report(self.report_path)
+            self._cache = (key, data)
             return data
         
         except Exception:
             return None
     
-    def _parse_section(self, root: ET.Element, section_name: str) -> Dict[str, str]:
-        """Parse a specific section from AIDA64 report"""
-        section_data = {}
+    def _parse_report(self, path: Path) -> Dict[str, Any]:
+        """Parse all sections and sensors from an AIDA64 report in one pass"""
+        data: Dict[str, Any] = {key: {} for key in _SECTIONS.values()}
+        sensors: Dict[str, Any] = {}
+        data['sensors'] = sensors
         
-        for section in root.findall(f".//{section_name}"):
-            for item in section:
-                if item.tag and item.text:
-                    section_data[item.tag] = item.text
+        for _, elem in ET.iterparse(str(path), events=('end',)):
+            tag = elem.tag
+            
+            if tag == 'Sensor':
+                self._parse_sensor(elem, sensors)
+            elif tag in _SECTIONS:
+                section_data = data[_SECTIONS[tag]]
+                for item in elem:
+                    # Skip comments/processing instructions (non-string tags in lxml)
+                    if isinstance(item.tag, str) and item.text:
+                        section_data[item.tag] = item.text
+            else:
+                # Leave other elements intact: an enclosing section still needs their text
+                continue
+            
+            # Section/sensor fully consumed, release its subtree
+            elem.clear()
         
-        return section_data
+        return data
     
-    def _parse_sensors(self, root: ET.Element) -> Dict[str, float]:
-        """Parse sensor data from AIDA64 report"""
-        sensors = {}
-        
-        # Look for sensor readings
-        for sensor in root.findall(".//Sensor"):
-            name = sensor.get('name')
-            value = sensor.get('value')
-            
-            if name and value:
-                try:
-                    # Try to extract numeric value
-                    numeric_value = float(''.join(c for c in value if c.isdigit() or c == '.'))
-                    sensors[name] = numeric_value
-                except ValueError:
-                    sensors[name] = value
+    def _parse_sensor(self, sensor, sensors: Dict[str, Any]):
+        """Parse a single sensor element into the sensors dict"""
+        name = sensor.get('name')
+        value = sensor.get('value')
         
-        return sensors
+        if name and value:
+            # Try to extract numeric value (thousands separators ignored)
+            match = _NUMBER_RE.search(value.replace(',', ''))
+            sensors[name] = float(match.group()) if match else value
     
     def set_report_path(self, path: Path):
         """Set custom AIDA64 report path"""
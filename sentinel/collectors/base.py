@@ -2,17 +2,40 @@
 Base collector class
 All collectors inherit from this
 """
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, ClassVar
 from loguru import logger
+from ._wmi import com_initialize
 
 
 class BaseCollector(ABC):
     """Base class for all data collectors"""
     
+    # Consecutive failures tolerated before backing off, and the backoff cap
+    BACKOFF_AFTER_FAILURES = 3
+    MAX_BACKOFF_SECONDS = 60.0
+    
+    # A collection slower than this counts as a failure, so one stuck source
+    # can't hold up the whole snapshot
+    COLLECT_TIMEOUT_SECONDS = 5.0
+    
+    # Worker threads shared by all collectors for blocking calls (process table
+    # walks, sensor reads, WMI queries). Each thread enters a COM apartment so
+    # WMI can be used from it on Windows.
+    _executor: ClassVar[ThreadPoolExecutor] = ThreadPoolExecutor(
+        max_workers=8,
+        thread_name_prefix="collector",
+        initializer=com_initialize
+    )
+    
     def __init__(self, name: str):
         self.name = name
         self.enabled = True
+        self._fail_count = 0
+        self._skip_until = 0.0
         logger.debug(f"Initialized collector: {name}")
     
     @abstractmethod
@@ -23,9 +46,15 @@ class BaseCollector(ABC):
         """
         pass
     
+    async def _run_blocking(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking function on the shared collector threads"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+    
     def enable(self):
         """Enable this collector"""
         self.enabled = True
+        self._fail_count = 0
+        self._skip_until = 0.0
         logger.info(f"Enabled collector: {self.name}")
     
     def disable(self):
@@ -35,13 +64,38 @@ class BaseCollector(ABC):
     
     async def safe_collect(self) -> Any:
         """
-        Safely collect data with error handling
+        Safely collect data with error handling and a time limit
+        Collectors that keep failing are skipped with exponential backoff
         """
         if not self.enabled:
             return None
         
+        if self._skip_until and time.monotonic() < self._skip_until:
+            return None
+        
         try:
-            return await self.collect()
+            result = await asyncio.wait_for(self.collect(), self.COLLECT_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            self._record_failure(f"timed out after {self.COLLECT_TIMEOUT_SECONDS}s")
+            return None
         except Exception as e:
-            logger.error(f"Error in collector {self.name}: {e}")
+            self._record_failure(e)
             return None
+        
+        self._fail_count = 0
+        self._skip_until = 0.0
+        return result
+    
+    def _record_failure(self, error: Any):
+        """Log a failed collection and back off once failures keep repeating"""
+        self._fail_count += 1
+        
+        if self._fail_count == 1:
+            logger.error(f"Error in collector {self.name}: {error}")
+        else:
+            logger.warning(f"Collector {self.name} failed {self._fail_count} times in a row: {error}")
+        
+        excess = self._fail_count - self.BACKOFF_AFTER_FAILURES
+        if excess >= 0:
+            backoff = min(self.MAX_BACKOFF_SECONDS, 2.0 ** (excess + 1))
+            self._skip_until = time.monotonic() + backoff
@@ -3,42 +3,73 @@ System context collector
 Collects contextual information about system state and user activity
 """
 import psutil
-from datetime import datetime
-from typing import Optional
+import re
+import time
+from typing import Optional, Tuple
 from collectors.base import BaseCollector
+from collectors.snapshot import ProcessSnapshot
 from models import SystemContext
 
 
+# Process name substrings that indicate an interactive user application
+USER_APP_KEYWORDS = frozenset([
+    'chrome', 'firefox', 'edge', 'code', 'notepad',
+    'explorer', 'discord', 'slack', 'teams',
+])
+
+# Activity categories and their process name substrings, in priority order
+ACTION_KEYWORDS = (
+    ('browsing', ('chrome', 'firefox', 'edge', 'brave')),
+    ('coding', ('code', 'pycharm', 'visual studio', 'sublime')),
+    ('gaming', ('game', 'steam', 'epic')),
+    ('media', ('vlc', 'spotify', 'itunes', 'media player')),
+    ('communication', ('discord', 'slack', 'teams', 'zoom', 'skype')),
+    ('office_work', ('word', 'excel', 'powerpoint', 'outlook')),
+)
+
+# Compiled once: a single scan per name instead of one substring test per keyword
+_USER_APP_RE = re.compile('|'.join(re.escape(app) for app in sorted(USER_APP_KEYWORDS)))
+
+# Anchored alternation of lookaheads: branches are tried in order, so the first
+# category with any keyword in the name wins and is reported via lastgroup
+_ACTION_RE = re.compile(
+    '^(?:' + '|'.join(
+        f"(?=.*(?:{'|'.join(re.escape(k) for k in keywords)}))(?P<{action}>)"
+        for action, keywords in ACTION_KEYWORDS
+    ) + ')',
+    re.DOTALL,
+)
+
+# Lookup tables indexed by time.struct_time fields (tm_wday: Monday == 0)
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Time of day for each hour: morning 5-11, afternoon 12-16, evening 17-20, night otherwise
+_TOD_BUCKETS = ['night'] * 5 + ['morning'] * 7 + ['afternoon'] * 5 + ['evening'] * 4 + ['night'] * 3
+
+
 class ContextCollector(BaseCollector):
     """Collects system context information"""
     
-    def __init__(self):
+    SCAN_TTL_SECONDS = 1.0
+    
+    def __init__(self, snapshot: Optional[ProcessSnapshot] = None):
         super().__init__("Context")
         self._idle_threshold_seconds = 300  # 5 minutes
+        self._process_snapshot = snapshot or ProcessSnapshot(max_age=self.SCAN_TTL_SECONDS)
+        
+        # (snapshot time, user process count, detected action) of the last scan
+        self._last_scan: Optional[Tuple[float, int, Optional[str]]] = None
     
     async def collect(self) -> SystemContext:
         """Collect system context"""
-        now = datetime.now()
+        now = time.localtime()
         
-        # Determine time of day
-        hour = now.hour
-        if 5 <= hour < 12:
-            time_of_day = "morning"
-        elif 12 <= hour < 17:
-            time_of_day = "afternoon"
-        elif 17 <= hour < 21:
-            time_of_day = "evening"
-        else:
-            time_of_day = "night"
+        # Determine time of day and day of week
+        time_of_day = _TOD_BUCKETS[now.tm_hour]
+        day_of_week = DAY_NAMES[now.tm_wday]
         
-        # Get day of week
-        day_of_week = now.strftime("%A")
-        
-        # Detect user activity
-        user_active = self._is_user_active()
-        
-        # Detect user action (basic heuristic)
-        user_action = self._detect_user_action()
+        # Both heuristics scan processes (and may sample CPU), so run them in one thread hop
+        user_active, user_action = await self._run_blocking(self._detect_activity)
         
         return SystemContext(
             user_active=user_active,
@@ -47,25 +78,51 @@ class ContextCollector(BaseCollector):
             user_action=user_action
         )
     
+    def _scan_processes(self) -> Tuple[int, Optional[str]]:
+        """
+        Classify every process name in the shared process snapshot
+        Returns (user application count, first detected action); the result is
+        reused until the snapshot is retaken so both heuristics share one pass
+        """
+        processes = self._process_snapshot.get()
+        taken_at = self._process_snapshot.taken_at
+        if self._last_scan is not None and self._last_scan[0] == taken_at:
+            return self._last_scan[1], self._last_scan[2]
+        
+        user_processes = 0
+        action = None
+        user_app_search = _USER_APP_RE.search
+        action_match = _ACTION_RE.match
+        
+        for pinfo in processes:
+            name = (pinfo.get('name') or '').lower()
+            
+            if user_app_search(name):
+                user_processes += 1
+            
+            # Keep the first detected action (could be improved with frequency counting)
+            if action is None:
+                match = action_match(name)
+                if match:
+                    action = match.lastgroup
+        
+        self._last_scan = (taken_at, user_processes, action)
+        return user_processes, action
+    
+    def _detect_activity(self) -> Tuple[bool, Optional[str]]:
+        """Whether the user is active and what they might be doing (blocking)"""
+        user_active = self._is_user_active()
+        # Reuses the process scan taken above
+        return user_active, self._detect_user_action()
+    
     def _is_user_active(self) -> bool:
         """
         Detect if user is actively using the system
         Uses heuristics like recent process activity, network usage, etc.
         """
         try:
-            # Check if there are recent user processes
-            user_processes = 0
-            for proc in psutil.process_iter(['name', 'create_time']):
-                try:
-                    # Check for common user applications
-                    name = proc.info['name'].lower()
-                    if any(app in name for app in ['chrome', 'firefox', 'edge', 'code', 'notepad', 
-                                                     'explorer', 'discord', 'slack', 'teams']):
-                        user_processes += 1
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
             # If there are active user processes, consider user active
+            user_processes, _ = self._scan_processes()
             if user_processes > 0:
                 return True
             
@@ -85,35 +142,8 @@ class ContextCollector(BaseCollector):
         This is a basic heuristic based on running processes
         """
         try:
-            actions = []
-            
-            for proc in psutil.process_iter(['name']):
-                try:
-                    name = proc.info['name'].lower()
-                    
-                    # Detect common activities
-                    if any(browser in name for browser in ['chrome', 'firefox', 'edge', 'brave']):
-                        actions.append('browsing')
-                    elif any(ide in name for ide in ['code', 'pycharm', 'visual studio', 'sublime']):
-                        actions.append('coding')
-                    elif any(game in name for game in ['game', 'steam', 'epic']):
-                        actions.append('gaming')
-                    elif any(media in name for media in ['vlc', 'spotify', 'itunes', 'media player']):
-                        actions.append('media')
-                    elif any(comm in name for comm in ['discord', 'slack', 'teams', 'zoom', 'skype']):
-                        actions.append('communication')
-                    elif any(office in name for office in ['word', 'excel', 'powerpoint', 'outlook']):
-                        actions.append('office_work')
-                        
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            # Return most common action or None
-            if actions:
-                # Return the first detected action (could be improved with frequency counting)
-                return actions[0]
-            
-            return None
+            _, action = self._scan_processes()
+            return action
             
         except Exception:
             return None
@@ -2,8 +2,11 @@
 CPU metrics collector
 Collects CPU usage, frequency, temperature, and load
 """
+import asyncio
 import psutil
-from typing import Optional
+import sys
+import time
+from typing import Optional, Tuple
 from collectors.base import BaseCollector
 from models import CPUMetrics
 
@@ -11,17 +14,36 @@ from models import CPUMetrics
 class CPUCollector(BaseCollector):
     """Collects CPU metrics"""
     
+    # Shortest window a usage sample may cover; shorter ones are mostly noise
+    MIN_SAMPLE_SECONDS = 0.1
+    
     def __init__(self):
         super().__init__("CPU")
         self._last_cpu_percent = None
+        
+        # Seed psutil's per-core counters so the first collect has a baseline
+        psutil.cpu_percent(interval=None, percpu=True)
+        self._last_sample = time.monotonic()
+        
+        # psutil has no temperature sensors on Windows; don't probe every tick
+        self._has_sensors = hasattr(psutil, 'sensors_temperatures') and sys.platform != 'win32'
+        # (sensor group, entry index) of the CPU temperature once discovered
+        self._temp_entry: Optional[Tuple[str, int]] = None
     
     async def collect(self) -> CPUMetrics:
         """Collect CPU metrics"""
-        # Get overall CPU usage
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        # A collect right after the previous sample would measure a few ms;
+        # wait out the remainder without blocking the event loop
+        remaining = self.MIN_SAMPLE_SECONDS - (time.monotonic() - self._last_sample)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
         
-        # Get per-core usage
-        per_core = psutil.cpu_percent(interval=0.1, percpu=True)
+        # Per-core usage since the previous call (non-blocking)
+        per_core = psutil.cpu_percent(interval=None, percpu=True)
+        self._last_sample = time.monotonic()
+        
+        # Overall usage is the mean across cores
+        cpu_percent = round(sum(per_core) / len(per_core), 1) if per_core else 0.0
         
         # Get CPU frequency
         freq = psutil.cpu_freq()
@@ -35,7 +57,7 @@ class CPUCollector(BaseCollector):
             pass
         
         # Temperature (requires additional setup on Windows)
-        temperature = self._get_temperature()
+        temperature = await self._run_blocking(self._get_temperature) if self._has_sensors else None
         
         return CPUMetrics(
             usage_percent=cpu_percent,
@@ -50,14 +72,30 @@ class CPUCollector(BaseCollector):
         Get CPU temperature
         Note: Requires additional setup on Windows (e.g., OpenHardwareMonitor)
         """
+        if not self._has_sensors:
+            return None
+        
         try:
             temps = psutil.sensors_temperatures()
-            if temps:
-                # Try to find CPU temperature
-                for name, entries in temps.items():
-                    if 'cpu' in name.lower() or 'core' in name.lower():
-                        if entries:
-                            return entries[0].current
         except (AttributeError, OSError):
-            pass
+            return None
+        
+        # Sensor names don't change, so index the known entry directly
+        if self._temp_entry is not None:
+            name, index = self._temp_entry
+            entries = temps.get(name)
+            if entries and len(entries) > index:
+                return entries[index].current
+            self._temp_entry = None
+        
+        if temps:
+            # Try to find CPU temperature
+            for name, entries in temps.items():
+                if 'cpu' in name.lower() or 'core' in name.lower():
+                    if entries:
+                        self._temp_entry = (name, 0)
+                        return entries[0].current
+        
+        # No CPU sensor on this machine; stop polling for one
+        self._has_sensors = False
         return None
@@ -2,12 +2,22 @@
 Disk I/O metrics collector
 Collects disk read/write speeds and queue length
 """
+import os
 import psutil
+import sys
 import time
+from typing import Dict, Optional, Tuple
 from collectors.base import BaseCollector
 from models import DiskMetrics
 
 
+PROC_DISKSTATS = '/proc/diskstats'
+SECTOR_SIZE = 512
+
+# Virtual or stacked block devices whose I/O is already counted on the physical disks
+VIRTUAL_DISK_PREFIXES = ('loop', 'ram', 'zram', 'dm-', 'md')
+
+
 class DiskCollector(BaseCollector):
     """Collects disk I/O metrics"""
     
@@ -15,10 +25,13 @@ class DiskCollector(BaseCollector):
         super().__init__("Disk")
         self._last_io = None
         self._last_time = None
+        
+        # Device name -> whether it is a whole disk (partitions aren't in /sys/block)
+        self._is_disk: Dict[str, bool] = {}
     
     async def collect(self) -> DiskMetrics:
         """Collect disk I/O metrics"""
-        current_io = psutil.disk_io_counters()
+        current_io = self._read_totals()
         current_time = time.time()
         
         if self._last_io is None or self._last_time is None:
@@ -30,7 +43,9 @@ class DiskCollector(BaseCollector):
                 read_mbps=0.0,
                 write_mbps=0.0,
                 queue_length=0,
-                usage_percent=None
+                usage_percent=None,
+                read_bytes_total=current_io[0],
+                write_bytes_total=current_io[1]
             )
         
         # Calculate time delta
@@ -40,8 +55,8 @@ class DiskCollector(BaseCollector):
             time_delta = 0.001  # Avoid division by zero
         
         # Calculate read/write speeds in MB/s
-        read_bytes = current_io.read_bytes - self._last_io.read_bytes
-        write_bytes = current_io.write_bytes - self._last_io.write_bytes
+        read_bytes = current_io[0] - self._last_io[0]
+        write_bytes = current_io[1] - self._last_io[1]
         
         read_mbps = (read_bytes / time_delta) / (1024 * 1024)
         write_mbps = (write_bytes / time_delta) / (1024 * 1024)
@@ -62,5 +77,49 @@ class DiskCollector(BaseCollector):
             read_mbps=round(read_mbps, 2),
             write_mbps=round(write_mbps, 2),
             queue_length=0,  # psutil doesn't provide queue length directly
-            usage_percent=usage_percent
+            usage_percent=usage_percent,
+            read_bytes_total=current_io[0],
+            write_bytes_total=current_io[1]
         )
+    
+    def _read_totals(self) -> Tuple[int, int]:
+        """Total (read, write) bytes across physical disks"""
+        if sys.platform.startswith('linux'):
+            totals = self._read_diskstats_totals()
+            if totals is not None:
+                return totals
+        
+        io = psutil.disk_io_counters()
+        return (io.read_bytes, io.write_bytes) if io else (0, 0)
+    
+    def _read_diskstats_totals(self) -> Optional[Tuple[int, int]]:
+        """Sum sectors read/written for whole disks in /proc/diskstats (Linux)"""
+        try:
+            with open(PROC_DISKSTATS, 'rb') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        
+        is_disk = self._is_disk
+        read_sectors = 0
+        write_sectors = 0
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+            
+            name = fields[2]
+            disk = is_disk.get(name)
+            if disk is None:
+                device = name.decode(errors='replace')
+                disk = (
+                    not device.startswith(VIRTUAL_DISK_PREFIXES)
+                    and os.path.exists(f"/sys/block/{device.replace('/', '!')}")
+                )
+                is_disk[name] = disk
+            
+            if disk:
+                read_sectors += int(fields[5])
+                write_sectors += int(fields[9])
+        
+        return read_sectors * SECTOR_SIZE, write_sectors * SECTOR_SIZE
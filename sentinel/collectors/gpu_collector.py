@@ -2,21 +2,95 @@
 GPU metrics collector
 Supports NVIDIA (via nvidia-smi), AMD (via rocm-smi), and Intel GPUs
 """
+import asyncio
+import atexit
 import subprocess
-from typing import List, Optional
+import time
+from typing import ClassVar, Dict, List, Optional, Tuple
 from collectors.base import BaseCollector
 from models import GPUMetrics
 
+try:
+    import pynvml
+except ImportError:  # Optional: NVML bindings (nvidia-ml-py) avoid forking nvidia-smi
+    pynvml = None
+
+NVIDIA_SMI_QUERY = (
+    "nvidia-smi",
+    "--query-gpu=name,utilization.gpu,memory.used,memory.total,temperature.gpu,power.draw",
+    "--format=csv,noheader,nounits",
+)
+
 
 class GPUCollector(BaseCollector):
     """Collects GPU metrics from multiple vendors"""
     
+    # (NVML devices, nvidia available, amd available), probed once per process:
+    # NVML init and the CLI probes cost up to seconds and can't change at runtime
+    _detected: ClassVar[Optional[Tuple[List[tuple], bool, bool]]] = None
+    
     def __init__(self):
         super().__init__("GPU")
-        self._nvidia_available = self._check_nvidia()
-        self._amd_available = self._check_amd()
+        self._nvml_devices, self._nvidia_available, self._amd_available = self._detect()
+        
+        # Per-source (skip until, current backoff) for sources that came back empty
+        self._source_backoff: Dict[str, Tuple[float, float]] = {}
+    
+    def _source_ready(self, source: str) -> bool:
+        """Whether a GPU source is outside its failure backoff window"""
+        state = self._source_backoff.get(source)
+        return state is None or time.monotonic() >= state[0]
+    
+    def _record_source(self, source: str, ok: bool):
+        """Reset a source's backoff on success, or double it on failure"""
+        if ok:
+            self._source_backoff.pop(source, None)
+            return
+        
+        previous = self._source_backoff.get(source, (0.0, 0.0))[1]
+        backoff = min(self.MAX_BACKOFF_SECONDS, max(1.0, previous * 2))
+        self._source_backoff[source] = (time.monotonic() + backoff, backoff)
+    
+    @classmethod
+    def _detect(cls) -> Tuple[List[tuple], bool, bool]:
+        """Probe the available GPU sources (cached for later instances)"""
+        if cls._detected is None:
+            nvml_devices = cls._init_nvml()
+            nvidia_available = bool(nvml_devices) or cls._check_nvidia()
+            cls._detected = (nvml_devices, nvidia_available, cls._check_amd())
+        return cls._detected
+    
+    @staticmethod
+    def _init_nvml() -> List[tuple]:
+        """Initialize NVML and cache (handle, name) for each NVIDIA GPU"""
+        if pynvml is None:
+            return []
+        
+        try:
+            pynvml.nvmlInit()
+            # Handles are shared by every instance, so release NVML only at exit
+            atexit.register(GPUCollector._shutdown_nvml)
+            devices = []
+            for index in range(pynvml.nvmlDeviceGetCount()):
+                handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+                name = pynvml.nvmlDeviceGetName(handle)
+                if isinstance(name, bytes):
+                    name = name.decode(errors='replace')
+                devices.append((handle, name))
+            return devices
+        except pynvml.NVMLError:
+            return []
+    
+    @staticmethod
+    def _shutdown_nvml():
+        """Release NVML"""
+        try:
+            pynvml.nvmlShutdown()
+        except Exception:
+            pass
     
-    def _check_nvidia(self) -> bool:
+    @staticmethod
+    def _check_nvidia() -> bool:
         """Check if NVIDIA GPU tools are available"""
         try:
             subprocess.run(
@@ -29,7 +103,8 @@ class GPUCollector(BaseCollector):
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
     
-    def _check_amd(self) -> bool:
+    @staticmethod
+    def _check_amd() -> bool:
         """Check if AMD GPU tools are available"""
         try:
             subprocess.run(
@@ -42,14 +117,38 @@ class GPUCollector(BaseCollector):
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
     
+    async def _run_tool(self, *args: str, timeout: float = 2) -> Optional[str]:
+        """Run a vendor CLI tool without blocking the event loop, returning stdout on success"""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+        except OSError:
+            return None
+        
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return None
+        
+        if proc.returncode != 0:
+            return None
+        return stdout.decode(errors='replace')
+    
     async def collect(self) -> Optional[List[GPUMetrics]]:
         """Collect GPU metrics from all available GPUs"""
         gpus = []
         
-        if self._nvidia_available:
+        if self._nvml_devices:
+            gpus.extend(self._collect_nvml())
+        elif self._nvidia_available and self._source_ready('nvidia-smi'):
             nvidia_gpus = await self._collect_nvidia()
-            if nvidia_gpus:
-                gpus.extend(nvidia_gpus)
+            self._record_source('nvidia-smi', bool(nvidia_gpus))
+            gpus.extend(nvidia_gpus)
         
         if self._amd_available:
             amd_gpus = await self._collect_amd()
@@ -57,10 +156,10 @@ class GPUCollector(BaseCollector):
                 gpus.extend(amd_gpus)
         
         # Try GPUtil as fallback
-        if not gpus:
+        if not gpus and self._source_ready('gputil'):
             try:
                 import GPUtil
-                gpu_list = GPUtil.getGPUs()
+                gpu_list = await self._run_blocking(GPUtil.getGPUs)
                 for gpu in gpu_list:
                     gpus.append(GPUMetrics(
                         name=gpu.name,
@@ -72,29 +171,51 @@ class GPUCollector(BaseCollector):
                     ))
             except (ImportError, Exception):
                 pass
+            self._record_source('gputil', bool(gpus))
         
         return gpus if gpus else None
     
+    def _collect_nvml(self) -> List[GPUMetrics]:
+        """Collect NVIDIA GPU metrics through NVML library calls"""
+        gpus = []
+        for handle, name in self._nvml_devices:
+            try:
+                utilization = pynvml.nvmlDeviceGetUtilizationRates(handle)
+                memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            except pynvml.NVMLError:
+                continue
+            
+            try:
+                temperature = float(pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU))
+            except pynvml.NVMLError:
+                temperature = None
+            
+            try:
+                power = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000  # mW -> W
+            except pynvml.NVMLError:
+                power = None
+            
+            gpus.append(GPUMetrics(
+                name=name,
+                usage_percent=float(utilization.gpu),
+                memory_used_gb=memory.used / (1024 ** 3),
+                memory_total_gb=memory.total / (1024 ** 3),
+                temperature_celsius=temperature,
+                power_draw_watts=power
+            ))
+        
+        return gpus
+    
     async def _collect_nvidia(self) -> List[GPUMetrics]:
         """Collect NVIDIA GPU metrics using nvidia-smi"""
         try:
-            result = subprocess.run(
-                [
-                    "nvidia-smi",
-                    "--query-gpu=name,utilization.gpu,memory.used,memory.total,temperature.gpu,power.draw",
-                    "--format=csv,noheader,nounits"
-                ],
-                capture_output=True,
-                text=True,
-                timeout=2,
-                check=False
-            )
+            output = await self._run_tool(*NVIDIA_SMI_QUERY)
             
-            if result.returncode != 0:
+            if output is None:
                 return []
             
             gpus = []
-            for line in result.stdout.strip().split('\n'):
+            for line in output.strip().split('\n'):
                 if not line:
                     continue
                 
@@ -110,27 +231,18 @@ class GPUCollector(BaseCollector):
                     ))
             
             return gpus
-        except (subprocess.TimeoutExpired, ValueError, IndexError):
+        except (ValueError, IndexError):
             return []
     
     async def _collect_amd(self) -> List[GPUMetrics]:
         """Collect AMD GPU metrics using rocm-smi"""
-        try:
-            result = subprocess.run(
-                ["rocm-smi", "--showuse", "--showmeminfo", "vram", "--showtemp"],
-                capture_output=True,
-                text=True,
-                timeout=2,
-                check=False
-            )
-            
-            if result.returncode != 0:
-                return []
-            
-            # Parse rocm-smi output (format varies, this is a basic implementation)
-            # TODO: Improve AMD GPU parsing based on actual rocm-smi output format
-            gpus = []
-            # Placeholder for AMD GPU parsing
-            return gpus
-        except subprocess.TimeoutExpired:
+        output = await self._run_tool("rocm-smi", "--showuse", "--showmeminfo", "vram", "--showtemp")
+        
+        if output is None:
             return []
+        
+        # Parse rocm-smi output (format varies, this is a basic implementation)
+        # TODO: Improve AMD GPU parsing based on actual rocm-smi output format
+        gpus = []
+        # Placeholder for AMD GPU parsing
+        return gpus
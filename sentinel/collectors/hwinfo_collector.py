@@ -5,6 +5,7 @@ Collects data from HWiNFO64 shared memory
 import struct
 import mmap
 from typing import Dict, Any, Optional
+from loguru import logger
 from .base import BaseCollector
 
 
@@ -16,6 +17,28 @@ class HWiNFOCollector(BaseCollector):
     HWINFO_SENSORS_STRING_LEN = 128
     HWINFO_UNIT_STRING_LEN = 16
     
+    # Header: signature, version, revision, poll time, then sensor/reading section layout
+    _HEADER = struct.Struct('<IIqqIIIIII')
+    
+    # Reading element: type, sensor index, id, UTF-16 label and unit, value/min/max/avg.
+    # The strings are skipped as pad bytes, so bulk parsing creates no bytes
+    # objects; they are decoded in place only for kept readings
+    _READING_NUMBERS = struct.Struct(
+        f'<III{HWINFO_SENSORS_STRING_LEN * 2}x{HWINFO_UNIT_STRING_LEN * 2}xdddd'
+    )
+    _LABEL_OFFSET = 12
+    _LABEL_END = _LABEL_OFFSET + HWINFO_SENSORS_STRING_LEN * 2
+    
+    # SENSOR_READING_TYPE enum -> output category (current and other go to 'other')
+    _TYPE_CATEGORIES = {
+        1: 'temperatures',
+        2: 'voltages',
+        3: 'fans',
+        5: 'power',
+        6: 'clocks',
+        7: 'usage',
+    }
+    
     def __init__(self):
         super().__init__("HWiNFO64")
         self.shared_memory = None
@@ -42,72 +65,17 @@ class HWiNFOCollector(BaseCollector):
                 return None
         
         try:
-            # Read shared memory header
-            self.shared_memory.seek(0)
+            # Parse the whole header in one call
+            (signature, version, revision, poll_time,
+             offset_of_sensor_section, size_of_sensor_element, num_sensor_elements,
+             offset_of_reading_section, size_of_reading_element, num_reading_elements
+             ) = self._HEADER.unpack_from(self.shared_memory, 0)
             
             # Verify signature
-            signature = struct.unpack('I', self.shared_memory.read(4))[0]
             if signature != self.HWINFO_SENSORS_SM2_SIGNATURE:
                 return None
             
-            # Read version and revision
-            version = struct.unpack('I', self.shared_memory.read(4))[0]
-            revision = struct.unpack('q', self.shared_memory.read(8))[0]
-            
-            # Read poll time
-            poll_time = struct.unpack('q', self.shared_memory.read(8))[0]
-            
-            # Read offsets
-            offset_of_sensor_section = struct.unpack('I', self.shared_memory.read(4))[0]
-            size_of_sensor_element = struct.unpack('I', self.shared_memory.read(4))[0]
-            num_sensor_elements = struct.unpack('I', self.shared_memory.read(4))[0]
-            
-            offset_of_reading_section = struct.unpack('I', self.shared_memory.read(4))[0]
-            size_of_reading_element = struct.unpack('I', self.shared_memory.read(4))[0]
-            num_reading_elements = struct.unpack('I', self.shared_memory.read(4))[0]
-            
-            # Collect sensor readings
-            sensors = {}
-            
-            for i in range(num_reading_elements):
-                # Seek to reading element
-                offset = offset_of_reading_section + (i * size_of_reading_element)
-                self.shared_memory.seek(offset)
-                
-                # Read reading data
-                reading_type = struct.unpack('I', self.shared_memory.read(4))[0]
-                sensor_index = struct.unpack('I', self.shared_memory.read(4))[0]
-                reading_id = struct.unpack('I', self.shared_memory.read(4))[0]
-                
-                # Read label
-                label_bytes = self.shared_memory.read(self.HWINFO_SENSORS_STRING_LEN * 2)
-                label = label_bytes.decode('utf-16-le', errors='ignore').rstrip('\x00')
-                
-                # Read unit
-                unit_bytes = self.shared_memory.read(self.HWINFO_UNIT_STRING_LEN * 2)
-                unit = unit_bytes.decode('utf-16-le', errors='ignore').rstrip('\x00')
-                
-                # Read value
-                value = struct.unpack('d', self.shared_memory.read(8))[0]
-                
-                # Read min/max/avg
-                value_min = struct.unpack('d', self.shared_memory.read(8))[0]
-                value_max = struct.unpack('d', self.shared_memory.read(8))[0]
-                value_avg = struct.unpack('d', self.shared_memory.read(8))[0]
-                
-                # Store sensor reading
-                if label and value != 0:
-                    sensor_key = label.replace(' ', '_').replace('/', '_')
-                    sensors[sensor_key] = {
-                        'value': value,
-                        'unit': unit,
-                        'min': value_min,
-                        'max': value_max,
-                        'avg': value_avg,
-                        'type': reading_type
-                    }
-            
-            # Organize by category
+            # Collect sensor readings, organized by category
             data = {
                 'temperatures': {},
                 'voltages': {},
@@ -117,30 +85,45 @@ class HWiNFOCollector(BaseCollector):
                 'usage': {},
                 'other': {}
             }
+            other = data['other']
+            categories = {reading_type: data[name] for reading_type, name in self._TYPE_CATEGORIES.items()}
             
-            for key, sensor in sensors.items():
-                unit = sensor['unit'].lower()
-                value = sensor['value']
+            # Copy the reading section out in one slice: HWiNFO rewrites the
+            # block while we parse, so work on a consistent private snapshot
+            end = offset_of_reading_section + num_reading_elements * size_of_reading_element
+            buf = memoryview(self.shared_memory[offset_of_reading_section:end])
+            
+            if size_of_reading_element == self._READING_NUMBERS.size:
+                # Records are packed back to back: parse them all in C
+                records = self._READING_NUMBERS.iter_unpack(buf)
+            else:
+                records = (
+                    self._READING_NUMBERS.unpack_from(buf, i * size_of_reading_element)
+                    for i in range(num_reading_elements)
+                )
+            
+            base = -size_of_reading_element
+            for (reading_type, sensor_index, reading_id,
+                 value, value_min, value_max, value_avg) in records:
+                base += size_of_reading_element
+                
+                # Only decode labels for readings that will be kept
+                if value == 0:
+                    continue
+                
+                label = str(
+                    buf[base + self._LABEL_OFFSET:base + self._LABEL_END], 'utf-16-le', 'ignore'
+                ).split('\x00', 1)[0]
+                if not label:
+                    continue
                 
-                if '°c' in unit or 'temp' in key.lower():
-                    data['temperatures'][key] = value
-                elif 'v' == unit or 'volt' in key.lower():
-                    data['voltages'][key] = value
-                elif 'rpm' in unit or 'fan' in key.lower():
-                    data['fans'][key] = value
-                elif 'w' == unit or 'power' in key.lower():
-                    data['power'][key] = value
-                elif 'mhz' in unit or 'clock' in key.lower():
-                    data['clocks'][key] = value
-                elif '%' in unit or 'usage' in key.lower():
-                    data['usage'][key] = value
-                else:
-                    data['other'][key] = value
+                sensor_key = label.replace(' ', '_').replace('/', '_')
+                categories.get(reading_type, other)[sensor_key] = value
             
             return data
             
         except Exception as e:
-            self.logger.error(f"Error reading HWiNFO shared memory: {e}")
+            logger.error(f"Error reading HWiNFO shared memory: {e}")
             return None
     
     def __del__(self):
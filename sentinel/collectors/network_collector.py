@@ -2,12 +2,35 @@
 Network metrics collector
 Collects network bandwidth usage and connection count
 """
+import ctypes
 import psutil
+import sys
 import time
+from typing import Optional, Tuple
 from collectors.base import BaseCollector
 from models import NetworkMetrics
 
 
+# Kernel socket tables; the 4th column is the TCP state, 01 = ESTABLISHED
+PROC_NET_TCP = ('/proc/net/tcp', '/proc/net/tcp6')
+PROC_NET_DEV = '/proc/net/dev'
+TCP_ESTABLISHED = b'01'
+
+# Address families for GetTcpStatisticsEx
+AF_INET = 2
+AF_INET6 = 23
+
+
+class MIB_TCPSTATS(ctypes.Structure):
+    """TCP statistics returned by GetTcpStatisticsEx (Windows)"""
+    _fields_ = [(name, ctypes.c_ulong) for name in (
+        'dwRtoAlgorithm', 'dwRtoMin', 'dwRtoMax', 'dwMaxConn',
+        'dwActiveOpens', 'dwPassiveOpens', 'dwAttemptFails', 'dwEstabResets',
+        'dwCurrEstab', 'dwInSegs', 'dwOutSegs', 'dwRetransSegs',
+        'dwInErrs', 'dwOutRsts', 'dwNumConns',
+    )]
+
+
 class NetworkCollector(BaseCollector):
     """Collects network metrics"""
     
@@ -18,9 +41,12 @@ class NetworkCollector(BaseCollector):
     
     async def collect(self) -> NetworkMetrics:
         """Collect network metrics"""
-        current_io = psutil.net_io_counters()
+        current_io = self._read_totals()
         current_time = time.time()
         
+        # The connection table walk is slow; run it off the event loop
+        connections_active = await self._run_blocking(self._count_connections)
+        
         if self._last_io is None or self._last_time is None:
             # First collection, initialize
             self._last_io = current_io
@@ -29,7 +55,9 @@ class NetworkCollector(BaseCollector):
             return NetworkMetrics(
                 download_mbps=0.0,
                 upload_mbps=0.0,
-                connections_active=self._count_connections()
+                connections_active=connections_active,
+                bytes_recv_total=current_io[0],
+                bytes_sent_total=current_io[1]
             )
         
         # Calculate time delta
@@ -39,8 +67,8 @@ class NetworkCollector(BaseCollector):
             time_delta = 0.001  # Avoid division by zero
         
         # Calculate download/upload speeds in MB/s
-        bytes_recv = current_io.bytes_recv - self._last_io.bytes_recv
-        bytes_sent = current_io.bytes_sent - self._last_io.bytes_sent
+        bytes_recv = current_io[0] - self._last_io[0]
+        bytes_sent = current_io[1] - self._last_io[1]
         
         download_mbps = (bytes_recv / time_delta) / (1024 * 1024)
         upload_mbps = (bytes_sent / time_delta) / (1024 * 1024)
@@ -52,11 +80,54 @@ class NetworkCollector(BaseCollector):
         return NetworkMetrics(
             download_mbps=round(download_mbps, 2),
             upload_mbps=round(upload_mbps, 2),
-            connections_active=self._count_connections()
+            connections_active=connections_active,
+            bytes_recv_total=current_io[0],
+            bytes_sent_total=current_io[1]
         )
     
+    @staticmethod
+    def _read_totals() -> Tuple[int, int]:
+        """Total (received, sent) bytes across all interfaces"""
+        if sys.platform.startswith('linux'):
+            totals = NetworkCollector._read_net_dev_totals()
+            if totals is not None:
+                return totals
+        
+        io = psutil.net_io_counters()
+        return (io.bytes_recv, io.bytes_sent) if io else (0, 0)
+    
+    @staticmethod
+    def _read_net_dev_totals() -> Optional[Tuple[int, int]]:
+        """Sum received/sent bytes over interfaces in /proc/net/dev (Linux)"""
+        try:
+            with open(PROC_NET_DEV, 'rb') as f:
+                lines = f.read().splitlines()[2:]  # Two header lines
+        except OSError:
+            return None
+        
+        recv = 0
+        sent = 0
+        for line in lines:
+            # "iface: rx_bytes rx_packets ... (8 rx fields) tx_bytes ..."
+            fields = line.partition(b':')[2].split()
+            if len(fields) >= 9:
+                recv += int(fields[0])
+                sent += int(fields[8])
+        return recv, sent
+    
     def _count_connections(self) -> int:
         """Count active network connections"""
+        # Cheap kernel sources first; net_connections walks every process's fds
+        if sys.platform.startswith('linux'):
+            active = self._count_proc_net_tcp()
+        elif sys.platform == 'win32':
+            active = self._count_windows_tcp()
+        else:
+            active = None
+        
+        if active is not None:
+            return active
+        
         try:
             connections = psutil.net_connections(kind='inet')
             # Count established connections
@@ -64,3 +135,38 @@ class NetworkCollector(BaseCollector):
             return active
         except (psutil.AccessDenied, Exception):
             return 0
+    
+    @staticmethod
+    def _count_proc_net_tcp() -> Optional[int]:
+        """Count ESTABLISHED sockets in /proc/net/tcp and tcp6 (Linux)"""
+        active = 0
+        found = False
+        for path in PROC_NET_TCP:
+            try:
+                with open(path, 'rb') as f:
+                    next(f, None)  # Header
+                    for line in f:
+                        fields = line.split(None, 4)
+                        if len(fields) > 3 and fields[3] == TCP_ESTABLISHED:
+                            active += 1
+                found = True
+            except OSError:
+                continue
+        return active if found else None
+    
+    @staticmethod
+    def _count_windows_tcp() -> Optional[int]:
+        """Read the established TCP connection counters from the IP helper API (Windows)"""
+        try:
+            get_stats = ctypes.windll.iphlpapi.GetTcpStatisticsEx
+        except (AttributeError, OSError):
+            return None
+        
+        active = 0
+        found = False
+        for family in (AF_INET, AF_INET6):
+            stats = MIB_TCPSTATS()
+            if get_stats(ctypes.byref(stats), family) == 0:
+                active += stats.dwCurrEstab
+                found = True
+        return active if found else None
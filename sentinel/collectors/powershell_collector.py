@@ -2,133 +2,199 @@
 PowerShell integration collector
 Executes PowerShell commands to collect system data
 """
-import subprocess
+import asyncio
+import base64
 import json
-from typing import Dict, Any, Optional
+import time
+import uuid
+from typing import Dict, Any, Optional, Tuple
 from .base import BaseCollector
 
 
+# Hardware and OS details don't change while the collector runs, so they
+# are queried once. The CIM session lives in the persistent runspace;
+# DCOM avoids depending on the WinRM service for localhost.
+STATIC_SCRIPT = """
+if (-not $global:SentinelCim) {
+    try {
+        $global:SentinelCim = New-CimSession -SessionOption (New-CimSessionOption -Protocol Dcom)
+    } catch {}
+}
+$cim = @{}
+if ($global:SentinelCim) { $cim.CimSession = $global:SentinelCim }
+try {
+    $cs = Get-CimInstance @cim Win32_ComputerSystem
+    $os = Get-CimInstance @cim Win32_OperatingSystem
+    $result.system_info = [pscustomobject]@{
+        CsName = $cs.Name; CsManufacturer = $cs.Manufacturer; CsModel = $cs.Model
+        OsName = $os.Caption; OsVersion = $os.Version; OsArchitecture = $os.OSArchitecture
+    }
+} catch {}
+try {
+    $result.bios = Get-CimInstance @cim Win32_BIOS | Select-Object Manufacturer, Version, ReleaseDate
+} catch {}
+try {
+    $result.motherboard = Get-CimInstance @cim Win32_BaseBoard | Select-Object Manufacturer, Product, Version
+} catch {}
+"""
+
+UPDATES_SCRIPT = """
+try {
+    $Session = New-Object -ComObject Microsoft.Update.Session
+    $Searcher = $Session.CreateUpdateSearcher()
+    $HistoryCount = $Searcher.GetTotalHistoryCount()
+    $Updates = $Searcher.QueryHistory(0, [Math]::Min($HistoryCount, 10))
+    $result.windows_updates = @($Updates | Select-Object Title, Date, @{Name='Result';Expression={
+        switch($_.ResultCode) {
+            0 {'NotStarted'}
+            1 {'InProgress'}
+            2 {'Succeeded'}
+            3 {'SucceededWithErrors'}
+            4 {'Failed'}
+            5 {'Aborted'}
+        }
+    }})
+} catch {}
+"""
+
+# Windows update history is refreshed at most this often
+UPDATES_TTL_SECONDS = 3600
+
+
 class PowerShellCollector(BaseCollector):
     """Collects data via PowerShell commands"""
     
+    TIMEOUT_SECONDS = 20
+    
     def __init__(self):
         super().__init__("PowerShell")
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._available = True
+        self._lock = asyncio.Lock()
+        self._static_cache: Dict[str, Any] = {}
+        self._updates_cache: Optional[Tuple[float, Optional[Dict[str, Any]]]] = None
     
     async def collect(self) -> Optional[Dict[str, Any]]:
         """Collect data from PowerShell"""
-        data = {}
-        
-        # Collect system info
-        system_info = await self._get_system_info()
-        if system_info:
-            data['system_info'] = system_info
-        
-        # Collect BIOS info
-        bios_info = await self._get_bios_info()
-        if bios_info:
-            data['bios'] = bios_info
+        now = time.monotonic()
+        need_static = not self._static_cache
+        need_updates = self._updates_cache is None or now - self._updates_cache[0] >= UPDATES_TTL_SECONDS
         
-        # Collect motherboard info
-        mb_info = await self._get_motherboard_info()
-        if mb_info:
-            data['motherboard'] = mb_info
+        if need_static or need_updates:
+            # Only query what isn't cached, still in a single round-trip
+            script = "$result = @{}\n"
+            if need_static:
+                script += STATIC_SCRIPT
+            if need_updates:
+                script += UPDATES_SCRIPT
+            script += "$result | ConvertTo-Json -Depth 3 -Compress\n"
+            
+            result = await self._run_json(script)
+            if result is not None:
+                if need_static:
+                    for key in ('system_info', 'bios', 'motherboard'):
+                        if result.get(key):
+                            self._static_cache[key] = result[key]
+                if need_updates:
+                    updates = result.get('windows_updates')
+                    self._updates_cache = (now, {
+                        'recent_updates': updates,
+                        'count': len(updates)
+                    } if updates else None)
         
-        # Collect Windows updates
-        updates = await self._get_windows_updates()
-        if updates:
-            data['windows_updates'] = updates
+        data = dict(self._static_cache)
+        if self._updates_cache is not None and self._updates_cache[1]:
+            data['windows_updates'] = self._updates_cache[1]
         
         return data if data else None
     
-    async def _execute_powershell(self, command: str) -> Optional[str]:
-        """Execute PowerShell command and return output"""
-        try:
-            result = subprocess.run(
-                ["powershell", "-Command", command],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                check=False
-            )
-            
-            if result.returncode == 0:
-                return result.stdout.strip()
+    async def _run_json(self, script: str) -> Optional[Dict[str, Any]]:
+        """Run a script that prints a JSON object and parse its output"""
+        output = await self._execute_powershell(script)
+        if not output:
             return None
-        except (subprocess.TimeoutExpired, Exception):
+        
+        try:
+            return json.loads(output)
+        except json.JSONDecodeError:
             return None
     
-    async def _get_system_info(self) -> Optional[Dict[str, str]]:
-        """Get system information"""
-        command = """
-        Get-ComputerInfo | Select-Object CsName, CsManufacturer, CsModel, 
-        OsName, OsVersion, OsArchitecture | ConvertTo-Json
-        """
+    async def close(self):
+        """Stop the persistent PowerShell process"""
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
         
-        output = await self._execute_powershell(command)
-        if output:
-            try:
-                return json.loads(output)
-            except json.JSONDecodeError:
-                pass
-        return None
+        try:
+            proc.stdin.write(b"if ($global:SentinelCim) { Remove-CimSession $global:SentinelCim }\n")
+            proc.stdin.close()
+            await asyncio.wait_for(proc.wait(), timeout=2)
+        except (asyncio.TimeoutError, OSError):
+            proc.kill()
+            await proc.wait()
     
-    async def _get_bios_info(self) -> Optional[Dict[str, str]]:
-        """Get BIOS information"""
-        command = """
-        Get-WmiObject Win32_BIOS | Select-Object Manufacturer, Version, 
-        ReleaseDate | ConvertTo-Json
-        """
+    async def _ensure_process(self) -> Optional[asyncio.subprocess.Process]:
+        """Start the persistent PowerShell process if it isn't running"""
+        if self._proc is not None and self._proc.returncode is None:
+            return self._proc
         
-        output = await self._execute_powershell(command)
-        if output:
-            try:
-                return json.loads(output)
-            except json.JSONDecodeError:
-                pass
-        return None
-    
-    async def _get_motherboard_info(self) -> Optional[Dict[str, str]]:
-        """Get motherboard information"""
-        command = """
-        Get-WmiObject Win32_BaseBoard | Select-Object Manufacturer, Product, 
-        Version | ConvertTo-Json
-        """
+        if not self._available:
+            return None
         
-        output = await self._execute_powershell(command)
-        if output:
-            try:
-                return json.loads(output)
-            except json.JSONDecodeError:
-                pass
-        return None
-    
-    async def _get_windows_updates(self) -> Optional[Dict[str, Any]]:
-        """Get Windows update information"""
-        command = """
-        $Session = New-Object -ComObject Microsoft.Update.Session
-        $Searcher = $Session.CreateUpdateSearcher()
-        $HistoryCount = $Searcher.GetTotalHistoryCount()
-        $Updates = $Searcher.QueryHistory(0, [Math]::Min($HistoryCount, 10))
-        $Updates | Select-Object Title, Date, @{Name='Result';Expression={
-            switch($_.ResultCode) {
-                0 {'NotStarted'}
-                1 {'InProgress'}
-                2 {'Succeeded'}
-                3 {'SucceededWithErrors'}
-                4 {'Failed'}
-                5 {'Aborted'}
-            }
-        }} | ConvertTo-Json
-        """
+        try:
+            self._proc = await asyncio.create_subprocess_exec(
+                "powershell", "-NoProfile", "-NonInteractive", "-Command", "-",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+        except OSError:
+            # PowerShell isn't installed; don't retry on every collection
+            self._available = False
+            return None
         
-        output = await self._execute_powershell(command)
-        if output:
+        return self._proc
+    
+    async def _execute_powershell(self, command: str) -> Optional[str]:
+        """Execute PowerShell command in the persistent process and return output"""
+        async with self._lock:
+            proc = await self._ensure_process()
+            if proc is None:
+                return None
+            
+            # Send the script as one line so multi-line blocks parse correctly,
+            # then echo a unique marker to know where its output ends
+            marker = f"##END##{uuid.uuid4().hex}"
+            encoded = base64.b64encode(command.encode('utf-8')).decode('ascii')
+            request = (
+                "Invoke-Expression ([Text.Encoding]::UTF8.GetString("
+                f"[Convert]::FromBase64String('{encoded}')))\n"
+                f"Write-Output '{marker}'\n"
+            )
+            
             try:
-                updates = json.loads(output)
-                return {
-                    'recent_updates': updates if isinstance(updates, list) else [updates],
-                    'count': len(updates) if isinstance(updates, list) else 1
-                }
-            except json.JSONDecodeError:
-                pass
-        return None
+                proc.stdin.write(request.encode('ascii'))
+                await proc.stdin.drain()
+                output = await asyncio.wait_for(
+                    self._read_until(proc, marker), timeout=self.TIMEOUT_SECONDS
+                )
+            except (asyncio.TimeoutError, OSError):
+                # The process is stuck or gone; restart it on the next call
+                await self.close()
+                return None
+            
+            return output or None
+    
+    @staticmethod
+    async def _read_until(proc: asyncio.subprocess.Process, marker: str) -> str:
+        """Read stdout lines until the marker line"""
+        lines = []
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                raise ConnectionResetError("PowerShell process exited")
+            
+            text = line.decode('utf-8', errors='replace').rstrip('\r\n')
+            if text == marker:
+                return '\n'.join(lines).strip()
+            lines.append(text)
@@ -2,48 +2,54 @@
 Process information collector
 Collects information about running processes
 """
-import psutil
-from typing import List
+import heapq
+from typing import List, Optional
 from collectors.base import BaseCollector
+from collectors.snapshot import ProcessSnapshot
 from models import ProcessInfo
 
 
 class ProcessCollector(BaseCollector):
     """Collects process information"""
     
-    def __init__(self, top_n: int = 10):
+    def __init__(self, top_n: int = 10, snapshot: Optional[ProcessSnapshot] = None):
         super().__init__("Process")
         self.top_n = top_n
+        self._process_snapshot = snapshot or ProcessSnapshot()
     
     async def collect(self) -> List[ProcessInfo]:
         """Collect top N processes by CPU usage"""
-        processes = []
-        
+        # Walking the process table is blocking; keep it off the event loop
+        return await self._run_blocking(self._scan)
+    
+    def _scan(self) -> List[ProcessInfo]:
+        """Scan all processes and return the top N by CPU usage"""
         try:
-            # Get all processes
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info', 'num_threads', 'status']):
-                try:
-                    pinfo = proc.info
-                    
-                    # Get memory in MB
-                    memory_mb = 0.0
-                    if pinfo.get('memory_info'):
-                        memory_mb = pinfo['memory_info'].rss / (1024 * 1024)
-                    
-                    processes.append(ProcessInfo(
-                        name=pinfo.get('name', 'Unknown'),
-                        pid=pinfo.get('pid', 0),
-                        cpu_percent=pinfo.get('cpu_percent', 0.0) or 0.0,
-                        memory_mb=round(memory_mb, 2),
-                        threads=pinfo.get('num_threads', 0) or 0,
-                        status=pinfo.get('status', 'unknown') or 'unknown'
-                    ))
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-            
-            # Sort by CPU usage and return top N
-            processes.sort(key=lambda p: p.cpu_percent, reverse=True)
-            return processes[:self.top_n]
+            # Pick the top N from the raw snapshot (shared with other collectors
+            # in the same tick) and only build models for those
+            top = heapq.nlargest(
+                self.top_n,
+                self._process_snapshot.get(),
+                key=lambda pinfo: pinfo.get('cpu_percent') or 0.0
+            )
+            return [self._to_process_info(pinfo) for pinfo in top]
             
         except Exception:
             return []
+    
+    @staticmethod
+    def _to_process_info(pinfo: dict) -> ProcessInfo:
+        """Build a ProcessInfo from a raw process snapshot entry"""
+        # Get memory in MB
+        memory_mb = 0.0
+        if pinfo.get('memory_info'):
+            memory_mb = pinfo['memory_info'].rss / (1024 * 1024)
+        
+        return ProcessInfo(
+            name=pinfo.get('name', 'Unknown'),
+            pid=pinfo.get('pid', 0),
+            cpu_percent=pinfo.get('cpu_percent', 0.0) or 0.0,
+            memory_mb=round(memory_mb, 2),
+            threads=pinfo.get('num_threads', 0) or 0,
+            status=pinfo.get('status', 'unknown') or 'unknown'
+        )
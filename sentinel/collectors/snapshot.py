@@ -0,0 +1,51 @@
+"""
+Shared process snapshot
+One walk of the process table serves every collector in the same tick
+"""
+import psutil
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from collectors._psutil_fast import fast_process_iter
+
+
+PROCESS_ATTRS = ['pid', 'name', 'cpu_percent', 'memory_info', 'num_threads', 'status']
+
+
+class ProcessSnapshot:
+    """Process table captured once and reused by all collectors that need it"""
+
+    def __init__(self, max_age: float = 1.0):
+        self.max_age = max_age
+        self.processes: List[Dict[str, Any]] = []
+        self.taken_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Force the next get() to rescan (called once per collection tick)"""
+        self.taken_at = None
+
+    def get(self) -> List[Dict[str, Any]]:
+        """
+        Return the current process list, scanning if it is missing or stale
+        Safe to call from collector threads; concurrent callers share one scan
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.taken_at is None or now - self.taken_at >= self.max_age:
+                self.processes = self._scan()
+                self.taken_at = now
+            return self.processes
+
+    @staticmethod
+    def _scan() -> List[Dict[str, Any]]:
+        """Read PROCESS_ATTRS for every running process"""
+        processes = []
+        for proc in fast_process_iter():
+            try:
+                # Read all attributes from one cached /proc parse per process
+                with proc.oneshot():
+                    processes.append(proc.as_dict(attrs=PROCESS_ATTRS))
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+        return processes
@@ -2,96 +2,297 @@
 Temperature sensor collector
 Collects temperature data from various sensors
 """
+import ctypes
+import functools
+import glob
+import os
+import psutil
 import subprocess
-from typing import Dict, Optional, List
+import sys
+from typing import Dict, Optional, List, Tuple
 from .base import BaseCollector
+from ._wmi import WMI_AVAILABLE, WMIConnectionCache, WMISession
+
+
+# hwmon temperature inputs (millidegrees Celsius), including CentOS's /device layout
+HWMON_TEMP_GLOBS = (
+    '/sys/class/hwmon/hwmon*/temp*_input',
+    '/sys/class/hwmon/hwmon*/device/temp*_input',
+)
+
+OHM_NAMESPACE = "root\\OpenHardwareMonitor"
+THERMAL_NAMESPACE = "root\\wmi"
+
+OHM_TEMPERATURE_QUERY = "SELECT Parent, Name, Value FROM Sensor WHERE SensorType = 'Temperature'"
+THERMAL_ZONE_QUERY = "SELECT CurrentTemperature FROM MSAcpi_ThermalZoneTemperature"
+
+# The same ACPI thermal zone readings (tenths of Kelvin) exposed as a performance
+# counter, which PDH reads without going through the WMI provider host
+THERMAL_ZONE_COUNTER = "\\Thermal Zone Information(*)\\High Precision Temperature"
+PDH_FMT_DOUBLE = 0x00000200
+PDH_MORE_DATA = 0x800007D2
+PDH_CSTATUS_OK = (0, 1)  # valid data, new data
+
+
+@functools.lru_cache(maxsize=1)
+def _ohm_available() -> bool:
+    """Probe the OpenHardwareMonitor WMI namespace (once per process)"""
+    if not WMI_AVAILABLE:
+        return False
+    
+    try:
+        WMISession(OHM_NAMESPACE)
+        return True
+    except Exception:
+        return False
+
+
+def _zone_celsius(tenths_kelvin: float) -> float:
+    """Convert an ACPI thermal zone reading (tenths of Kelvin) to Celsius"""
+    return round(tenths_kelvin / 10.0 - 273.15, 1)
+
+
+class PDH_FMT_COUNTERVALUE(ctypes.Structure):
+    """Formatted counter value, read as a double (Windows PDH)"""
+    _fields_ = [('CStatus', ctypes.c_ulong), ('doubleValue', ctypes.c_double)]
+
+
+class PDH_FMT_COUNTERVALUE_ITEM_W(ctypes.Structure):
+    """One instance of a wildcard counter (Windows PDH)"""
+    _fields_ = [('szName', ctypes.c_wchar_p), ('FmtValue', PDH_FMT_COUNTERVALUE)]
+
+
+@functools.lru_cache(maxsize=1)
+def _load_pdh():
+    """Load pdh.dll with its prototypes declared, or None off Windows"""
+    try:
+        pdh = ctypes.windll.pdh
+    except (AttributeError, OSError):
+        return None
+    
+    # Handles stay pointer-sized and PDH_STATUS comes back as a signed LONG
+    handle_out = ctypes.POINTER(ctypes.c_void_p)
+    dword_out = ctypes.POINTER(ctypes.c_ulong)
+    prototypes = {
+        'PdhOpenQueryW': [ctypes.c_wchar_p, ctypes.c_size_t, handle_out],
+        'PdhAddEnglishCounterW': [ctypes.c_void_p, ctypes.c_wchar_p, ctypes.c_size_t, handle_out],
+        'PdhCollectQueryData': [ctypes.c_void_p],
+        'PdhGetFormattedCounterArrayW': [ctypes.c_void_p, ctypes.c_ulong, dword_out, dword_out, ctypes.c_void_p],
+        'PdhCloseQuery': [ctypes.c_void_p],
+    }
+    for name, argtypes in prototypes.items():
+        function = getattr(pdh, name)
+        function.argtypes = argtypes
+        function.restype = ctypes.c_long
+    return pdh
 
 
 class TemperatureCollector(BaseCollector):
     """Collects temperature data from system sensors"""
     
-    def __init__(self):
+    def __init__(self, merge_sources: bool = False):
         super().__init__("Temperature")
-        self._openhardwaremonitor_available = self._check_ohm()
-    
-    def _check_ohm(self) -> bool:
-        """Check if OpenHardwareMonitor is available"""
-        try:
-            # Check if OHM WMI interface is available
-            import wmi
-            w = wmi.WMI(namespace="root\\OpenHardwareMonitor")
-            return True
-        except Exception:
-            return False
+        # False: stop at the first source that returns data; True: combine all
+        self.merge_sources = merge_sources
+        self._connections = WMIConnectionCache()
+        
+        # Resolved once: sensor files are read directly instead of psutil
+        # walking /sys/class/hwmon on every call
+        self._sensors_temperatures = getattr(psutil, 'sensors_temperatures', None)
+        self._hwmon_inputs = self._find_hwmon_inputs() if sys.platform.startswith('linux') else []
+        
+        # (pdh, query, counter) handles for the thermal zone counter, opened on first use
+        self._thermal_counter = None
+        self._thermal_counter_available = sys.platform == 'win32'
+        
+        # Probed on the first collection, off the event loop
+        self._openhardwaremonitor_available: Optional[bool] = None if WMI_AVAILABLE else False
+        
+        # Tried in order; the source that last produced data moves to the front
+        self._sources = [
+            self._collect_from_ohm,
+            self._collect_from_psutil,
+            self._collect_from_thermal_zones,
+        ]
     
     async def collect(self) -> Optional[Dict[str, float]]:
         """Collect temperature data"""
-        temperatures = {}
-        
-        # Try OpenHardwareMonitor first (Windows)
-        if self._openhardwaremonitor_available:
-            ohm_temps = await self._collect_from_ohm()
-            if ohm_temps:
-                temperatures.update(ohm_temps)
-        
-        # Try psutil sensors (Linux/some systems)
-        psutil_temps = await self._collect_from_psutil()
-        if psutil_temps:
-            temperatures.update(psutil_temps)
+        if self.merge_sources:
+            temperatures = {}
+            for source in self._sources:
+                temperatures.update(await source())
+            return temperatures if temperatures else None
         
-        # Try WMI thermal zone (Windows fallback)
-        wmi_temps = await self._collect_from_wmi()
-        if wmi_temps:
-            temperatures.update(wmi_temps)
+        for i, source in enumerate(self._sources):
+            temperatures = await source()
+            if temperatures:
+                if i:
+                    self._sources.insert(0, self._sources.pop(i))
+                return temperatures
         
-        return temperatures if temperatures else None
+        return None
     
     async def _collect_from_ohm(self) -> Dict[str, float]:
         """Collect from OpenHardwareMonitor"""
+        if self._openhardwaremonitor_available is None:
+            self._openhardwaremonitor_available = await self._run_blocking(_ohm_available)
+        if not self._openhardwaremonitor_available:
+            return {}
+        return await self._run_blocking(self._read_ohm)
+    
+    def _read_ohm(self) -> Dict[str, float]:
+        """Query OpenHardwareMonitor temperature sensors over WMI"""
         temps = {}
         try:
-            import wmi
-            w = wmi.WMI(namespace="root\\OpenHardwareMonitor")
-            sensors = w.Sensor()
+            w = self._connections.get(OHM_NAMESPACE)
+            # Filter to temperature sensors in WQL rather than in Python
+            sensors = w.query(OHM_TEMPERATURE_QUERY)
             
             for sensor in sensors:
-                if sensor.SensorType == 'Temperature':
-                    name = f"{sensor.Parent}_{sensor.Name}".replace(' ', '_')
-                    temps[name] = float(sensor.Value)
+                name = f"{sensor.Parent}_{sensor.Name}".replace(' ', '_')
+                temps[name] = float(sensor.Value)
         except Exception:
-            pass
+            self._connections.invalidate(OHM_NAMESPACE)
         
         return temps
     
     async def _collect_from_psutil(self) -> Dict[str, float]:
-        """Collect from psutil sensors"""
+        """Collect from psutil sensors (hwmon files read directly on Linux)"""
         temps = {}
         try:
-            import psutil
-            if hasattr(psutil, 'sensors_temperatures'):
-                sensor_temps = psutil.sensors_temperatures()
-                for name, entries in sensor_temps.items():
-                    for i, entry in enumerate(entries):
-                        key = f"{name}_{i}" if len(entries) > 1 else name
-                        temps[key] = entry.current
-        except (AttributeError, Exception):
+            if self._hwmon_inputs:
+                sensor_temps = await self._run_blocking(self._read_hwmon)
+            elif self._sensors_temperatures:
+                sensor_temps = {
+                    name: [entry.current for entry in entries]
+                    for name, entries in (await self._run_blocking(self._sensors_temperatures)).items()
+                }
+            else:
+                return temps
+            
+            for name, values in sensor_temps.items():
+                for i, value in enumerate(values):
+                    key = f"{name}_{i}" if len(values) > 1 else name
+                    temps[key] = value
+        except Exception:
             pass
         
         return temps
     
+    @staticmethod
+    def _find_hwmon_inputs() -> List[Tuple[str, str]]:
+        """Locate hwmon temperature inputs as (sensor name, path), in psutil's order"""
+        paths = set()
+        for pattern in HWMON_TEMP_GLOBS:
+            paths.update(glob.glob(pattern))
+        
+        inputs = []
+        # Sort on the tempN prefix exactly as psutil does, so sensor indexes don't change
+        for path in sorted(paths, key=lambda p: p[:-len('_input')]):
+            try:
+                with open(os.path.join(os.path.dirname(path), 'name')) as f:
+                    inputs.append((f.read().strip(), path))
+            except OSError:
+                continue
+        return inputs
+    
+    def _read_hwmon(self) -> Dict[str, List[float]]:
+        """Read the current value of every known hwmon input, grouped by sensor name"""
+        readings: Dict[str, List[float]] = {}
+        for name, path in self._hwmon_inputs:
+            try:
+                with open(path, 'rb') as f:
+                    value = float(f.read()) / 1000.0
+            except (OSError, ValueError):
+                continue
+            readings.setdefault(name, []).append(value)
+        return readings
+    
+    async def _collect_from_thermal_zones(self) -> Dict[str, float]:
+        """Collect ACPI thermal zones (Windows), via WMI only without PDH"""
+        return await self._collect_from_pdh() or await self._collect_from_wmi()
+    
+    async def _collect_from_pdh(self) -> Dict[str, float]:
+        """Collect thermal zones from the performance counter (Windows)"""
+        if self._thermal_counter is None:
+            if not self._thermal_counter_available:
+                return {}
+            self._thermal_counter = await self._run_blocking(self._open_thermal_counter)
+            if self._thermal_counter is None:
+                self._thermal_counter_available = False
+                return {}
+        
+        return await self._run_blocking(self._read_pdh)
+    
+    def _read_pdh(self) -> Dict[str, float]:
+        """Sample the thermal zone counter and read every instance"""
+        pdh, query, counter = self._thermal_counter
+        if pdh.PdhCollectQueryData(query) != 0:
+            return {}
+        
+        # First call reports the buffer size needed for all instances
+        size = ctypes.c_ulong(0)
+        count = ctypes.c_ulong(0)
+        status = pdh.PdhGetFormattedCounterArrayW(
+            counter, PDH_FMT_DOUBLE, ctypes.byref(size), ctypes.byref(count), None
+        )
+        if status & 0xFFFFFFFF != PDH_MORE_DATA:
+            return {}
+        
+        buf = ctypes.create_string_buffer(size.value)
+        if pdh.PdhGetFormattedCounterArrayW(
+            counter, PDH_FMT_DOUBLE, ctypes.byref(size), ctypes.byref(count), buf
+        ) != 0:
+            return {}
+        
+        items = ctypes.cast(buf, ctypes.POINTER(PDH_FMT_COUNTERVALUE_ITEM_W * count.value)).contents
+        return {
+            f"ThermalZone_{i}": _zone_celsius(item.FmtValue.doubleValue)
+            for i, item in enumerate(items)
+            if item.FmtValue.CStatus in PDH_CSTATUS_OK
+        }
+    
+    @staticmethod
+    def _open_thermal_counter():
+        """Open a PDH query on the thermal zone counter, or None if it isn't available"""
+        pdh = _load_pdh()
+        if pdh is None:
+            return None
+        
+        query = ctypes.c_void_p()
+        if pdh.PdhOpenQueryW(None, 0, ctypes.byref(query)) != 0:
+            return None
+        
+        counter = ctypes.c_void_p()
+        if pdh.PdhAddEnglishCounterW(query, THERMAL_ZONE_COUNTER, 0, ctypes.byref(counter)) != 0:
+            pdh.PdhCloseQuery(query)
+            return None
+        
+        return pdh, query, counter
+    
     async def _collect_from_wmi(self) -> Dict[str, float]:
         """Collect from WMI thermal zone (Windows)"""
-        temps = {}
+        if not WMI_AVAILABLE:
+            return {}
+        return await self._run_blocking(self._read_thermal_zones)
+    
+    def _read_thermal_zones(self) -> Dict[str, float]:
+        """Query ACPI thermal zone temperatures over WMI"""
         try:
-            import wmi
-            w = wmi.WMI(namespace="root\\wmi")
-            thermal_zones = w.MSAcpi_ThermalZoneTemperature()
-            
-            for i, zone in enumerate(thermal_zones):
-                # Convert from tenths of Kelvin to Celsius
-                temp_celsius = (zone.CurrentTemperature / 10.0) - 273.15
-                temps[f"ThermalZone_{i}"] = round(temp_celsius, 1)
+            w = self._connections.get(THERMAL_NAMESPACE)
+            return {
+                f"ThermalZone_{i}": _zone_celsius(zone.CurrentTemperature)
+                for i, zone in enumerate(w.query(THERMAL_ZONE_QUERY))
+            }
         except Exception:
-            pass
-        
-        return temps
+            self._connections.invalidate(THERMAL_NAMESPACE)
+            return {}
+    
+    def __del__(self):
+        """Close the thermal zone counter query"""
+        if getattr(self, '_thermal_counter', None):
+            try:
+                pdh, query, _ = self._thermal_counter
+                pdh.PdhCloseQuery(query)
+            except Exception:
+                pass
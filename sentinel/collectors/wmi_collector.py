@@ -2,8 +2,36 @@
 WMI (Windows Management Instrumentation) collector
 Collects detailed Windows system information
 """
+import asyncio
 from typing import Dict, Any, Optional, List
 from .base import BaseCollector
+from ._wmi import WMI_AVAILABLE, WMIConnectionCache
+
+
+# Only the properties each method reads are selected; WMISession.query runs
+# them with forward-only, return-immediately flags
+PROCESSOR_QUERY = (
+    "SELECT Name, Manufacturer, NumberOfCores, NumberOfLogicalProcessors, "
+    "MaxClockSpeed, Architecture, L2CacheSize, L3CacheSize FROM Win32_Processor"
+)
+MEMORY_QUERY = (
+    "SELECT Capacity, Speed, Manufacturer, PartNumber, SerialNumber FROM Win32_PhysicalMemory"
+)
+DISK_QUERY = (
+    "SELECT Model, Size, InterfaceType, MediaType, SerialNumber FROM Win32_DiskDrive"
+)
+NETWORK_ADAPTER_QUERY = (
+    "SELECT Name, Manufacturer, MACAddress, Speed, AdapterType FROM Win32_NetworkAdapter "
+    "WHERE PhysicalAdapter = TRUE"
+)
+VIDEO_CONTROLLER_QUERY = (
+    "SELECT Name, AdapterRAM, DriverVersion, VideoProcessor, CurrentRefreshRate, "
+    "MaxRefreshRate FROM Win32_VideoController"
+)
+OS_QUERY = (
+    "SELECT Caption, Version, BuildNumber, OSArchitecture, InstallDate, LastBootUpTime, "
+    "SystemDirectory FROM Win32_OperatingSystem"
+)
 
 
 class WMICollector(BaseCollector):
@@ -12,38 +40,39 @@ class WMICollector(BaseCollector):
     def __init__(self):
         super().__init__("WMI")
         self._wmi_available = self._check_wmi()
+        self._connections = WMIConnectionCache()
     
     def _check_wmi(self) -> bool:
         """Check if WMI is available"""
-        try:
-            import wmi
-            return True
-        except ImportError:
-            return False
+        return WMI_AVAILABLE
     
     async def collect(self) -> Optional[Dict[str, Any]]:
         """Collect WMI data"""
         if not self._wmi_available:
             return None
         
-        data = {}
+        queries = {
+            'processor': self._get_processor_info,
+            'memory': self._get_memory_info,
+            'disk': self._get_disk_info,
+            'network_adapters': self._get_network_adapters,
+            'video_controller': self._get_video_controller,
+            'operating_system': self._get_os_info,
+        }
         
-        # Collect various WMI data
-        data['processor'] = await self._get_processor_info()
-        data['memory'] = await self._get_memory_info()
-        data['disk'] = await self._get_disk_info()
-        data['network_adapters'] = await self._get_network_adapters()
-        data['video_controller'] = await self._get_video_controller()
-        data['operating_system'] = await self._get_os_info()
+        # Each query is a blocking DCOM round-trip; run them side by side on
+        # the collector threads, which each hold their own WMI connection
+        results = await asyncio.gather(*(
+            self._run_blocking(query) for query in queries.values()
+        ))
         
-        return data
+        return dict(zip(queries, results))
     
-    async def _get_processor_info(self) -> Optional[Dict[str, Any]]:
+    def _get_processor_info(self) -> Optional[Dict[str, Any]]:
         """Get processor information"""
         try:
-            import wmi
-            w = wmi.WMI()
-            processors = w.Win32_Processor()
+            w = self._connections.get()
+            processors = w.query(PROCESSOR_QUERY)
             
             if processors:
                 proc = processors[0]
@@ -58,15 +87,15 @@ class WMICollector(BaseCollector):
                     'l3_cache_size': proc.L3CacheSize
                 }
         except Exception:
-            pass
+            # Reconnect on the next collection in case the connection went bad
+            self._connections.invalidate()
         return None
     
-    async def _get_memory_info(self) -> Optional[List[Dict[str, Any]]]:
+    def _get_memory_info(self) -> Optional[List[Dict[str, Any]]]:
         """Get memory module information"""
         try:
-            import wmi
-            w = wmi.WMI()
-            memory_modules = w.Win32_PhysicalMemory()
+            w = self._connections.get()
+            memory_modules = w.query(MEMORY_QUERY)
             
             modules = []
             for mem in memory_modules:
@@ -80,15 +109,15 @@ class WMICollector(BaseCollector):
             
             return modules if modules else None
         except Exception:
-            pass
+            # Reconnect on the next collection in case the connection went bad
+            self._connections.invalidate()
         return None
     
-    async def _get_disk_info(self) -> Optional[List[Dict[str, Any]]]:
+    def _get_disk_info(self) -> Optional[List[Dict[str, Any]]]:
         """Get disk drive information"""
         try:
-            import wmi
-            w = wmi.WMI()
-            disks = w.Win32_DiskDrive()
+            w = self._connections.get()
+            disks = w.query(DISK_QUERY)
             
             disk_list = []
             for disk in disks:
@@ -102,15 +131,15 @@ class WMICollector(BaseCollector):
             
             return disk_list if disk_list else None
         except Exception:
-            pass
+            # Reconnect on the next collection in case the connection went bad
+            self._connections.invalidate()
         return None
     
-    async def _get_network_adapters(self) -> Optional[List[Dict[str, Any]]]:
+    def _get_network_adapters(self) -> Optional[List[Dict[str, Any]]]:
         """Get network adapter information"""
         try:
-            import wmi
-            w = wmi.WMI()
-            adapters = w.Win32_NetworkAdapter(PhysicalAdapter=True)
+            w = self._connections.get()
+            adapters = w.query(NETWORK_ADAPTER_QUERY)
             
             adapter_list = []
             for adapter in adapters:
@@ -124,15 +153,15 @@ class WMICollector(BaseCollector):
             
             return adapter_list if adapter_list else None
         except Exception:
-            pass
+            # Reconnect on the next collection in case the connection went bad
+            self._connections.invalidate()
         return None
     
-    async def _get_video_controller(self) -> Optional[Dict[str, Any]]:
+    def _get_video_controller(self) -> Optional[Dict[str, Any]]:
         """Get video controller information"""
         try:
-            import wmi
-            w = wmi.WMI()
-            controllers = w.Win32_VideoController()
+            w = self._connections.get()
+            controllers = w.query(VIDEO_CONTROLLER_QUERY)
             
             if controllers:
                 ctrl = controllers[0]
@@ -145,15 +174,15 @@ class WMICollector(BaseCollector):
                     'max_refresh_rate': ctrl.MaxRefreshRate
                 }
         except Exception:
-            pass
+            # Reconnect on the next collection in case the connection went bad
+            self._connections.invalidate()
         return None
     
-    async def _get_os_info(self) -> Optional[Dict[str, Any]]:
+    def _get_os_info(self) -> Optional[Dict[str, Any]]:
         """Get operating system information"""
         try:
-            import wmi
-            w = wmi.WMI()
-            os_list = w.Win32_OperatingSystem()
+            w = self._connections.get()
+            os_list = w.query(OS_QUERY)
             
             if os_list:
                 os = os_list[0]
@@ -167,5 +196,6 @@ class WMICollector(BaseCollector):
                     'system_directory': os.SystemDirectory
                 }
         except Exception:
-            pass
+            # Reconnect on the next collection in case the connection went bad
+            self._connections.invalidate()
         return None
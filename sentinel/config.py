@@ -4,26 +4,58 @@ Loads settings from environment variables and provides defaults
 """
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, ClassVar, Dict, Optional
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 
-# Load environment variables
+# Load environment variables (never overrides variables already set)
 load_dotenv()
 
 
+def _flag(value: str) -> bool:
+    """Parse a true/false environment value"""
+    return value.lower() == "true"
+
+
+# Environment variable -> (config section, field, parser)
+# Unset or empty variables fall back to the model defaults
+ENV_SCHEMA = {
+    "COLLECTION_INTERVAL_HIGH": ("intervals", "high_frequency", int),
+    "COLLECTION_INTERVAL_MEDIUM": ("intervals", "medium_frequency", int),
+    "COLLECTION_INTERVAL_LOW": ("intervals", "low_frequency", int),
+    "COLLECTION_INTERVAL_VERY_LOW": ("intervals", "very_low_frequency", int),
+    "HOT_WINDOW_SECONDS": ("intervals", "hot_window_seconds", int),
+    "DATABASE_PATH": ("storage", "database_path", Path),
+    "DATA_RETENTION_DAYS": ("storage", "data_retention_days", int),
+    "ARCHIVE_AFTER_DAYS": ("storage", "archive_after_days", int),
+    "SEND_TO_GEMINI": ("privacy", "send_to_gemini", _flag),
+    "ANONYMIZE_DATA": ("privacy", "anonymize_data", _flag),
+    "LOG_LEVEL": ("system", "log_level", str),
+    "MAX_CPU_OVERHEAD": ("system", "max_cpu_overhead", float),
+    "MAX_RAM_MB": ("system", "max_ram_mb", int),
+    "ENABLE_AIDA64": ("aida64", "enabled", _flag),
+    "AIDA64_SHARED_MEMORY": ("aida64", "shared_memory", _flag),
+    "AIDA64_REPORT_PATH": ("aida64", "report_path", Path),
+    "ENABLE_HWINFO": ("hwinfo", "enabled", _flag),
+    "GEMINI_API_KEY": ("gemini", "api_key", str),
+    "GEMINI_MODEL": ("gemini", "model", str),
+}
+
+
 class CollectionIntervals(BaseModel):
     """Data collection interval configuration"""
     high_frequency: int = Field(default=1, description="High-frequency collection (seconds)")
     medium_frequency: int = Field(default=5, description="Medium-frequency collection (seconds)")
     low_frequency: int = Field(default=30, description="Low-frequency collection (seconds)")
     very_low_frequency: int = Field(default=300, description="Very low-frequency collection (seconds)")
+    hot_window_seconds: int = Field(default=300, description="Samples kept in the in-memory hot metric ring")
 
 
 class StorageConfig(BaseModel):
     """Storage configuration"""
     database_path: Path = Field(default=Path("./data/system_stats.db"))
     data_retention_days: int = Field(default=90)
+    archive_after_days: int = Field(default=0, description="Compress metric history older than this, dropping the raw rows (0 = never)")
     
     def ensure_directories(self):
         """Create necessary directories"""
@@ -86,46 +118,32 @@ class Config(BaseModel):
     hwinfo: HWiNFOConfig = Field(default_factory=HWiNFOConfig)
     gemini: GeminiConfig = Field(default_factory=GeminiConfig)
     
+    _cached: ClassVar[Optional["Config"]] = None
+    
+    @classmethod
+    def load(cls, cached: bool = True) -> "Config":
+        """
+        Load configuration from environment variables
+        The parsed result is shared across calls; pass cached=False for a
+        fresh private instance (e.g. one that will be modified)
+        """
+        if cached:
+            if cls._cached is None:
+                cls._cached = cls._from_env()
+            return cls._cached
+        return cls._from_env()
+    
     @classmethod
-    def load(cls) -> "Config":
-        """Load configuration from environment variables"""
-        # Parse AIDA64 report path
-        aida64_report = os.getenv("AIDA64_REPORT_PATH")
-        aida64_report_path = Path(aida64_report) if aida64_report else None
+    def _from_env(cls) -> "Config":
+        """Parse configuration from environment variables"""
+        env = os.environ
+        sections: Dict[str, Dict[str, Any]] = {}
+        for key, (section, field, parse) in ENV_SCHEMA.items():
+            value = env.get(key)
+            if value:
+                sections.setdefault(section, {})[field] = parse(value)
         
-        return cls(
-            intervals=CollectionIntervals(
-                high_frequency=int(os.getenv("COLLECTION_INTERVAL_HIGH", "1")),
-                medium_frequency=int(os.getenv("COLLECTION_INTERVAL_MEDIUM", "5")),
-                low_frequency=int(os.getenv("COLLECTION_INTERVAL_LOW", "30")),
-                very_low_frequency=int(os.getenv("COLLECTION_INTERVAL_VERY_LOW", "300"))
-            ),
-            storage=StorageConfig(
-                database_path=Path(os.getenv("DATABASE_PATH", "./data/system_stats.db")),
-                data_retention_days=int(os.getenv("DATA_RETENTION_DAYS", "90"))
-            ),
-            privacy=PrivacyConfig(
-                send_to_gemini=os.getenv("SEND_TO_GEMINI", "false").lower() == "true",
-                anonymize_data=os.getenv("ANONYMIZE_DATA", "true").lower() == "true"
-            ),
-            system=SystemConfig(
-                log_level=os.getenv("LOG_LEVEL", "INFO"),
-                max_cpu_overhead=float(os.getenv("MAX_CPU_OVERHEAD", "2.0")),
-                max_ram_mb=int(os.getenv("MAX_RAM_MB", "500"))
-            ),
-            aida64=AIDA64Config(
-                enabled=os.getenv("ENABLE_AIDA64", "false").lower() == "true",
-                shared_memory=os.getenv("AIDA64_SHARED_MEMORY", "true").lower() == "true",
-                report_path=aida64_report_path
-            ),
-            hwinfo=HWiNFOConfig(
-                enabled=os.getenv("ENABLE_HWINFO", "false").lower() == "true"
-            ),
-            gemini=GeminiConfig(
-                api_key=os.getenv("GEMINI_API_KEY"),
-                model=os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
-            )
-        )
+        return cls(**sections)
     
     def initialize(self):
         """Initialize configuration (create directories, etc.)"""
@@ -1,114 +1,155 @@
 """
 Data models for system metrics
-Using Pydantic for validation and serialization
+Slotted dataclasses: these are built on every collection tick, so nothing is
+validated at runtime (neither types nor ranges). DataValidator in
+aggregator/validator.py can range-check a snapshot, but the pipeline doesn't call it
 """
-from datetime import datetime
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
 
+try:
+    import orjson
+except ImportError:  # Optional speedup for snapshot serialization
+    orjson = None
 
-class CPUMetrics(BaseModel):
+
+# Keyword-only so required fields can follow ones with defaults
+_model = dataclass(slots=True, frozen=True, kw_only=True)
+
+
+def _json_default(value: Any) -> Any:
+    """Encode datetimes like orjson does (naive values are taken as UTC)"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def serialize(obj: Any) -> bytes:
+    """Serialize a model (or any JSON-compatible value) to compact JSON bytes"""
+    if orjson is not None:
+        # orjson handles dataclasses and datetimes natively in C
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NAIVE_UTC)
+    
+    if isinstance(obj, _Model):
+        obj = obj.to_dict()
+    return json.dumps(obj, default=_json_default, separators=(',', ':')).encode()
+
+
+class _Model:
+    """Shared helpers for the metric dataclasses"""
+    
+    __slots__ = ()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict (nested models included)"""
+        return asdict(self)
+
+
+@_model
+class CPUMetrics(_Model):
     """CPU metrics snapshot"""
-    usage_percent: float = Field(description="Overall CPU usage percentage")
-    per_core_usage: List[float] = Field(default_factory=list, description="Per-core usage")
-    frequency_mhz: float = Field(description="Current CPU frequency in MHz")
-    temperature_celsius: Optional[float] = Field(default=None, description="CPU temperature")
-    load_average: Optional[List[float]] = Field(default=None, description="Load average (1, 5, 15 min)")
+    usage_percent: float  # Overall CPU usage percentage
+    per_core_usage: List[float] = field(default_factory=list)  # Per-core usage
+    frequency_mhz: float  # Current CPU frequency in MHz
+    temperature_celsius: Optional[float] = None  # CPU temperature
+    load_average: Optional[List[float]] = None  # Load average (1, 5, 15 min)
 
 
-class RAMMetrics(BaseModel):
+@_model
+class RAMMetrics(_Model):
     """RAM metrics snapshot"""
-    total_gb: float = Field(description="Total RAM in GB")
-    used_gb: float = Field(description="Used RAM in GB")
-    available_gb: float = Field(description="Available RAM in GB")
-    cached_gb: Optional[float] = Field(default=None, description="Cached RAM in GB")
-    usage_percent: float = Field(description="RAM usage percentage")
+    total_gb: float  # Total RAM in GB
+    used_gb: float  # Used RAM in GB
+    available_gb: float  # Available RAM in GB
+    cached_gb: Optional[float] = None  # Cached RAM in GB
+    usage_percent: float  # RAM usage percentage
 
 
-class GPUMetrics(BaseModel):
+@_model
+class GPUMetrics(_Model):
     """GPU metrics snapshot"""
-    name: str = Field(description="GPU name/model")
-    usage_percent: float = Field(description="GPU usage percentage")
-    memory_used_gb: float = Field(description="GPU memory used in GB")
-    memory_total_gb: float = Field(description="Total GPU memory in GB")
-    temperature_celsius: Optional[float] = Field(default=None, description="GPU temperature")
-    power_draw_watts: Optional[float] = Field(default=None, description="Power draw in watts")
+    name: str  # GPU name/model
+    usage_percent: float  # GPU usage percentage
+    memory_used_gb: float  # GPU memory used in GB
+    memory_total_gb: float  # Total GPU memory in GB
+    temperature_celsius: Optional[float] = None  # GPU temperature
+    power_draw_watts: Optional[float] = None  # Power draw in watts
 
 
-class DiskMetrics(BaseModel):
+@_model
+class DiskMetrics(_Model):
     """Disk I/O metrics snapshot"""
-    read_mbps: float = Field(description="Read speed in MB/s")
-    write_mbps: float = Field(description="Write speed in MB/s")
-    queue_length: int = Field(description="Disk queue length")
-    usage_percent: Optional[float] = Field(default=None, description="Disk usage percentage")
+    read_mbps: float  # Read speed in MB/s
+    write_mbps: float  # Write speed in MB/s
+    queue_length: int  # Disk queue length
+    usage_percent: Optional[float] = None  # Disk usage percentage
+    read_bytes_total: Optional[int] = None  # Cumulative bytes read (monotonic counter)
+    write_bytes_total: Optional[int] = None  # Cumulative bytes written (monotonic counter)
 
 
-class NetworkMetrics(BaseModel):
+@_model
+class NetworkMetrics(_Model):
     """Network metrics snapshot"""
-    download_mbps: float = Field(description="Download speed in MB/s")
-    upload_mbps: float = Field(description="Upload speed in MB/s")
-    connections_active: int = Field(description="Active network connections")
+    download_mbps: float  # Download speed in MB/s
+    upload_mbps: float  # Upload speed in MB/s
+    connections_active: int  # Active network connections
+    bytes_recv_total: Optional[int] = None  # Cumulative bytes received (monotonic counter)
+    bytes_sent_total: Optional[int] = None  # Cumulative bytes sent (monotonic counter)
 
 
-class ProcessInfo(BaseModel):
+@_model
+class ProcessInfo(_Model):
     """Individual process information"""
-    name: str = Field(description="Process name")
-    pid: int = Field(description="Process ID")
-    cpu_percent: float = Field(description="CPU usage percentage")
-    memory_mb: float = Field(description="Memory usage in MB")
-    threads: int = Field(description="Number of threads")
-    status: str = Field(description="Process status")
+    name: str  # Process name
+    pid: int  # Process ID
+    cpu_percent: float  # CPU usage percentage
+    memory_mb: float  # Memory usage in MB
+    threads: int  # Number of threads
+    status: str  # Process status
 
 
-class SystemContext(BaseModel):
+@_model
+class SystemContext(_Model):
     """System context information"""
-    user_active: bool = Field(description="Is user actively using the system")
-    time_of_day: str = Field(description="Time of day category (morning, afternoon, evening, night)")
-    day_of_week: str = Field(description="Day of the week")
-    user_action: Optional[str] = Field(default=None, description="Detected user action/activity")
+    user_active: bool  # Is user actively using the system
+    time_of_day: str  # Time of day category (morning, afternoon, evening, night)
+    day_of_week: str  # Day of the week
+    user_action: Optional[str] = None  # Detected user action/activity
 
 
-class SystemSnapshot(BaseModel):
+@_model
+class SystemSnapshot(_Model):
     """Complete system metrics snapshot"""
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(default_factory=datetime.utcnow)
     cpu: CPUMetrics
     ram: RAMMetrics
-    gpu: Optional[List[GPUMetrics]] = Field(default=None)
+    gpu: Optional[List[GPUMetrics]] = None
     disk: DiskMetrics
     network: NetworkMetrics
-    processes: List[ProcessInfo] = Field(default_factory=list)
+    processes: List[ProcessInfo] = field(default_factory=list)
     context: SystemContext
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
-class DataPoint(BaseModel):
+@_model
+class DataPoint(_Model):
     """Generic time-series data point"""
     timestamp: datetime
     metric_name: str
     value: float
-    tags: Dict[str, str] = Field(default_factory=dict)
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    tags: Dict[str, str] = field(default_factory=dict)
 
 
-class AnomalyDetection(BaseModel):
+@_model
+class AnomalyDetection(_Model):
     """Anomaly detection result"""
     timestamp: datetime
     metric_name: str
     current_value: float
     expected_value: float
     deviation_std: float
-    severity: str = Field(description="low, medium, high, critical")
-    context: Dict[str, Any] = Field(default_factory=dict)
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    severity: str  # low, medium, high, critical
+    context: Dict[str, Any] = field(default_factory=dict)
@@ -2,8 +2,88 @@
 Baseline calculation for metrics
 Calculates normal operating ranges
 """
-from typing import List, Dict
-from statistics import mean, stdev
+import math
+from array import array
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+
+class _RollingStats:
+    """
+    Running statistics over a fixed window of values
+    Mean and variance are updated incrementally (Welford), min and max come
+    from monotonic deques, so adding a value and reading stats are O(1)
+    The window itself is a flat array of doubles used as a ring, so values
+    aren't kept as individual float objects
+    """
+    
+    __slots__ = ('values', 'head', 'count', 'mean', 'm2', 'mins', 'maxs', 'added')
+    
+    def __init__(self, window_size: int):
+        self.values = array('d', bytes(window_size * array('d').itemsize))
+        self.head = 0  # Next slot to write (the oldest value once full)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+        
+        # (sequence number, value) pairs, increasing / decreasing by value
+        self.mins: Deque[Tuple[int, float]] = deque()
+        self.maxs: Deque[Tuple[int, float]] = deque()
+        self.added = 0
+    
+    def add(self, value: float):
+        """Add a value, evicting the oldest one when the window is full"""
+        values = self.values
+        window_size = len(values)
+        
+        if self.count == window_size:
+            self._remove(values[self.head])
+            
+            # Drop the evicted value from the min/max candidates
+            expired = self.added - window_size
+            if self.mins[0][0] == expired:
+                self.mins.popleft()
+            if self.maxs[0][0] == expired:
+                self.maxs.popleft()
+        
+        values[self.head] = value
+        self.head = (self.head + 1) % window_size
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        
+        while self.mins and self.mins[-1][1] >= value:
+            self.mins.pop()
+        self.mins.append((self.added, value))
+        while self.maxs and self.maxs[-1][1] <= value:
+            self.maxs.pop()
+        self.maxs.append((self.added, value))
+        
+        self.added += 1
+        
+        # Removing values lets rounding error build up; resync once per window
+        # (the window is always full by then)
+        if self.added % window_size == 0:
+            self.mean = math.fsum(values) / self.count
+            self.m2 = math.fsum((v - self.mean) ** 2 for v in values)
+    
+    def _remove(self, value: float):
+        """Reverse the Welford update for a value leaving the window"""
+        self.count -= 1
+        if self.count == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+    
+    @property
+    def std(self) -> float:
+        """Sample standard deviation"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
 
 
 class BaselineCalculator:
@@ -11,25 +91,24 @@ class BaselineCalculator:
     
     def __init__(self, window_size: int = 100):
         self.window_size = window_size
-        self.data: Dict[str, List[float]] = {}
+        self.stats: Dict[str, _RollingStats] = {}
     
     def add_value(self, metric_name: str, value: float):
         """Add a value to the baseline calculation"""
-        if metric_name not in self.data:
-            self.data[metric_name] = []
+        stats = self.stats.get(metric_name)
+        if stats is None:
+            stats = self.stats[metric_name] = _RollingStats(self.window_size)
         
-        self.data[metric_name].append(value)
-        
-        # Keep only the last window_size values
-        if len(self.data[metric_name]) > self.window_size:
-            self.data[metric_name] = self.data[metric_name][-self.window_size:]
+        # Keeps only the last window_size values
+        stats.add(value)
     
     def get_baseline(self, metric_name: str) -> Dict[str, float]:
         """
         Get baseline statistics for a metric
         Returns mean, std, min, max
         """
-        if metric_name not in self.data or len(self.data[metric_name]) < 2:
+        stats = self.stats.get(metric_name)
+        if stats is None or stats.count < 2:
             return {
                 'mean': 0.0,
                 'std': 0.0,
@@ -38,27 +117,26 @@ class BaselineCalculator:
                 'count': 0
             }
         
-        values = self.data[metric_name]
-        
         return {
-            'mean': mean(values),
-            'std': stdev(values) if len(values) > 1 else 0.0,
-            'min': min(values),
-            'max': max(values),
-            'count': len(values)
+            'mean': stats.mean,
+            'std': stats.std,
+            'min': stats.mins[0][1],
+            'max': stats.maxs[0][1],
+            'count': stats.count
         }
     
     def is_anomaly(self, metric_name: str, value: float, std_threshold: float = 3.0) -> bool:
         """
         Check if a value is an anomaly (beyond std_threshold standard deviations)
         """
-        baseline = self.get_baseline(metric_name)
+        stats = self.stats.get(metric_name)
         
-        if baseline['count'] < 10:  # Need enough data
+        if stats is None or stats.count < 10:  # Need enough data
             return False
         
-        if baseline['std'] == 0:  # No variation
+        if stats.m2 == 0:  # No variation
             return False
         
-        deviation = abs(value - baseline['mean']) / baseline['std']
-        return deviation > std_threshold
+        # |value - mean| / std > threshold, squared on both sides: no sqrt or division
+        deviation = value - stats.mean
+        return deviation * deviation * (stats.count - 1) > std_threshold * std_threshold * stats.m2
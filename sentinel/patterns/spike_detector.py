@@ -2,6 +2,8 @@
 Spike detection
 Detects sudden changes in metrics
 """
+import math
+from itertools import islice
 from typing import Dict, Optional, List
 from collections import deque
 
@@ -13,13 +15,33 @@ class SpikeDetector:
         self.window_size = window_size
         self.spike_threshold = spike_threshold
         self.history: Dict[str, deque] = {}
+        
+        # Running sum of each history window and values added since the last resync
+        self._totals: Dict[str, float] = {}
+        self._added: Dict[str, int] = {}
     
     def add_value(self, metric_name: str, value: float):
         """Add a value to the history"""
-        if metric_name not in self.history:
-            self.history[metric_name] = deque(maxlen=self.window_size)
+        history = self.history.get(metric_name)
+        if history is None:
+            history = self.history[metric_name] = deque(maxlen=self.window_size)
+            self._totals[metric_name] = 0.0
+            self._added[metric_name] = 0
+        
+        total = self._totals[metric_name]
+        if len(history) == self.window_size:
+            total -= history[0]
+        history.append(value)
+        total += value
         
-        self.history[metric_name].append(value)
+        # Recompute exactly once per window so rounding error can't build up
+        added = self._added[metric_name] + 1
+        if added >= self.window_size:
+            total = math.fsum(history)
+            added = 0
+        
+        self._totals[metric_name] = total
+        self._added[metric_name] = added
     
     def detect_spike(self, metric_name: str, current_value: float) -> Optional[Dict]:
         """
@@ -29,13 +51,13 @@ class SpikeDetector:
         if metric_name not in self.history:
             return None
         
-        history = list(self.history[metric_name])
+        count = len(self.history[metric_name])
         
-        if len(history) < 3:  # Need some history
+        if count < 3:  # Need some history
             return None
         
         # Calculate average of recent history (excluding current)
-        avg = sum(history) / len(history)
+        avg = self._totals[metric_name] / count
         
         # Calculate change ratio
         if avg == 0:
@@ -45,16 +67,43 @@ class SpikeDetector:
         
         # Check if it's a spike
         if change_ratio > self.spike_threshold:
-            return {
-                'metric': metric_name,
-                'current_value': current_value,
-                'average': avg,
-                'change_ratio': change_ratio,
-                'spike_type': 'increase' if current_value > avg else 'decrease'
-            }
+            return self._spike_info(metric_name, current_value, avg)
         
         return None
     
+    def detect_batch(self, values: Dict[str, float]) -> List[Dict]:
+        """
+        Detect spikes for several metrics at once
+        Returns spike info for the metrics that spiked
+        """
+        spikes = []
+        history = self.history
+        totals = self._totals
+        threshold = self.spike_threshold
+        
+        for metric_name, current_value in values.items():
+            window = history.get(metric_name)
+            if window is None or len(window) < 3:
+                continue
+            
+            # Same test as detect_spike, but the ratio is only computed for spikes
+            avg = totals[metric_name] / len(window)
+            if avg > 0 and abs(current_value - avg) > threshold * avg:
+                spikes.append(self._spike_info(metric_name, current_value, avg))
+        
+        return spikes
+    
+    @staticmethod
+    def _spike_info(metric_name: str, current_value: float, avg: float) -> Dict:
+        """Describe a detected spike"""
+        return {
+            'metric': metric_name,
+            'current_value': current_value,
+            'average': avg,
+            'change_ratio': abs(current_value - avg) / avg,
+            'spike_type': 'increase' if current_value > avg else 'decrease'
+        }
+    
     def get_trend(self, metric_name: str) -> Optional[str]:
         """
         Get trend direction (increasing, decreasing, stable)
@@ -62,15 +111,17 @@ class SpikeDetector:
         if metric_name not in self.history:
             return None
         
-        history = list(self.history[metric_name])
+        history = self.history[metric_name]
+        count = len(history)
         
-        if len(history) < 3:
+        if count < 3:
             return None
         
-        # Simple trend: compare first half to second half
-        mid = len(history) // 2
-        first_half_avg = sum(history[:mid]) / mid
-        second_half_avg = sum(history[mid:]) / (len(history) - mid)
+        # Simple trend: compare first half to second half (summed in place)
+        mid = count // 2
+        first_half_sum = sum(islice(history, mid))
+        first_half_avg = first_half_sum / mid
+        second_half_avg = (self._totals[metric_name] - first_half_sum) / (count - mid)
         
         if second_half_avg > first_half_avg * 1.1:
             return "increasing"
@@ -2,7 +2,8 @@
 Threshold-based detection
 Simple threshold alerts
 """
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from enum import Enum
 
 
@@ -14,12 +15,16 @@ class Severity(Enum):
     CRITICAL = "critical"
 
 
+# Checked in this order; the first threshold reached wins ('low' is never alerted on)
+_CHECK_ORDER = (Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM)
+
+
 class ThresholdDetector:
     """Detect when metrics exceed thresholds"""
     
     def __init__(self):
-        # Default thresholds for common metrics
-        self.thresholds: Dict[str, Dict[str, float]] = {
+        # Default thresholds for common metrics (written only through set_threshold)
+        self._thresholds: Dict[str, Dict[str, float]] = {
             'cpu_usage': {
                 'medium': 70.0,
                 'high': 85.0,
@@ -41,30 +46,44 @@ class ThresholdDetector:
                 'critical': 98.0
             }
         }
+        
+        # metric -> [(threshold, severity)] in check order, rebuilt on set_threshold
+        self._compiled: Dict[str, List[Tuple[float, Severity]]] = {
+            metric_name: self._compile(thresholds)
+            for metric_name, thresholds in self._thresholds.items()
+        }
+    
+    @property
+    def thresholds(self) -> Mapping[str, Mapping[str, float]]:
+        """Read-only view of the thresholds; change them with set_threshold"""
+        return MappingProxyType({
+            metric_name: MappingProxyType(thresholds)
+            for metric_name, thresholds in self._thresholds.items()
+        })
+    
+    @staticmethod
+    def _compile(thresholds: Dict[str, float]) -> List[Tuple[float, Severity]]:
+        """Flatten a metric's thresholds into the (value, severity) scan list"""
+        return [
+            (thresholds[severity.value], severity)
+            for severity in _CHECK_ORDER
+            if severity.value in thresholds
+        ]
     
     def set_threshold(self, metric_name: str, severity: str, value: float):
         """Set a custom threshold"""
-        if metric_name not in self.thresholds:
-            self.thresholds[metric_name] = {}
-        
-        self.thresholds[metric_name][severity] = value
+        thresholds = self._thresholds.setdefault(metric_name, {})
+        thresholds[severity] = value
+        self._compiled[metric_name] = self._compile(thresholds)
     
     def check(self, metric_name: str, value: float) -> Optional[Severity]:
         """
         Check if value exceeds thresholds
         Returns severity level or None
         """
-        if metric_name not in self.thresholds:
-            return None
-        
-        thresholds = self.thresholds[metric_name]
-        
-        if 'critical' in thresholds and value >= thresholds['critical']:
-            return Severity.CRITICAL
-        elif 'high' in thresholds and value >= thresholds['high']:
-            return Severity.HIGH
-        elif 'medium' in thresholds and value >= thresholds['medium']:
-            return Severity.MEDIUM
+        for threshold, severity in self._compiled.get(metric_name, ()):
+            if value >= threshold:
+                return severity
         
         return None
     
@@ -74,10 +93,13 @@ class ThresholdDetector:
         Returns dict of metric_name -> severity for alerts
         """
         alerts = {}
+        compiled = self._compiled
         
         for metric_name, value in metrics.items():
-            severity = self.check(metric_name, value)
-            if severity:
-                alerts[metric_name] = severity
+            # Inlined check(): this runs for every metric on every snapshot
+            for threshold, severity in compiled.get(metric_name, ()):
+                if value >= threshold:
+                    alerts[metric_name] = severity
+                    break
         
         return alerts
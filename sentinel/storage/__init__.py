@@ -4,5 +4,6 @@ Handles data persistence and retrieval
 """
 from .database import Database
 from .repository import Repository
+from .writer import SnapshotWriter
 
-__all__ = ['Database', 'Repository']
+__all__ = ['Database', 'Repository', 'SnapshotWriter']
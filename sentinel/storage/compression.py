@@ -0,0 +1,122 @@
+"""
+Time-series compression
+Gorilla-style encoding for archived metric series: delta-of-delta timestamps
+and XOR-ed float bits, byte-aligned (varints) to stay cheap in pure Python
+"""
+from array import array
+from typing import List, Tuple
+
+
+def _zigzag(value: int) -> int:
+    """Map a signed int to unsigned so small magnitudes stay small"""
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value: int) -> int:
+    """Inverse of _zigzag"""
+    return (value >> 1) ^ -(value & 1)
+
+
+def _put_varint(out: bytearray, value: int):
+    """Append an unsigned LEB128 varint"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Read an unsigned LEB128 varint, returns (value, next position)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_series(timestamps: List[int], values: List[float]) -> bytes:
+    """
+    Encode a series of (integer timestamp, float) points
+    Regular sampling makes most timestamp delta-of-deltas 0 (one byte), and
+    slowly changing values XOR to a few significant bits
+    """
+    out = bytearray()
+    _put_varint(out, len(timestamps))
+    if not timestamps:
+        return bytes(out)
+    
+    # Timestamps: first value, first delta, then delta-of-deltas
+    prev = timestamps[0]
+    prev_delta = 0
+    _put_varint(out, _zigzag(prev))
+    for ts in timestamps[1:]:
+        delta = ts - prev
+        _put_varint(out, _zigzag(delta - prev_delta))
+        prev, prev_delta = ts, delta
+    
+    # Values: raw bits of the first, then XOR with the previous value. A zero
+    # XOR is one 0 byte; otherwise the trailing zero count (+1) and the
+    # remaining significant bits
+    bits = array('Q', array('d', values).tobytes())
+    prev_bits = bits[0]
+    out += bits[:1].tobytes()
+    for value_bits in bits[1:]:
+        xor = value_bits ^ prev_bits
+        if xor == 0:
+            out.append(0)
+        else:
+            trailing = (xor & -xor).bit_length() - 1
+            out.append(trailing + 1)
+            _put_varint(out, xor >> trailing)
+        prev_bits = value_bits
+    
+    return bytes(out)
+
+
+def decode_series(data: bytes) -> Tuple[List[int], List[float]]:
+    """Decode a series written by encode_series, returns (timestamps, values)"""
+    count, pos = _get_varint(data, 0)
+    if count == 0:
+        return [], []
+    
+    timestamps = []
+    value, pos = _get_varint(data, pos)
+    prev = _unzigzag(value)
+    prev_delta = 0
+    timestamps.append(prev)
+    for _ in range(count - 1):
+        value, pos = _get_varint(data, pos)
+        prev_delta += _unzigzag(value)
+        prev += prev_delta
+        timestamps.append(prev)
+    
+    bits = array('Q', data[pos:pos + 8])
+    pos += 8
+    prev_bits = bits[0]
+    for _ in range(count - 1):
+        trailing = data[pos]
+        pos += 1
+        if trailing:
+            xor, pos = _get_varint(data, pos)
+            prev_bits ^= xor << (trailing - 1)
+        bits.append(prev_bits)
+    
+    return timestamps, array('d', bits.tobytes()).tolist()
+
+
+# Per-core usage is stored one byte per core: 0-100% scaled to 0-255
+_PERCENT_SCALE = 2.55
+
+
+def pack_percentages(values: List[float]) -> bytes:
+    """Quantize percentages to one byte each (~0.4% resolution)"""
+    return bytes(round(min(max(value, 0.0), 100.0) * _PERCENT_SCALE) for value in values)
+
+
+def unpack_percentages(data: bytes) -> List[float]:
+    """Inverse of pack_percentages, rounded to 0.1%"""
+    return [round(byte / _PERCENT_SCALE, 1) for byte in data]
@@ -2,32 +2,110 @@
 SQLite database manager
 Handles database connections and schema initialization
 """
+import asyncio
+import os
 import sqlite3
 import aiosqlite
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Callable, List, Optional, TypeVar, Union
 from loguru import logger
+from storage.query_builder import ROLLUP_BUCKET_SECONDS, ROLLUP_METRICS, ROLLUP_TABLE
+
+
+STATEMENT_CACHE_SIZE = 256
+
+# Telemetry can afford to lose the last commit on power loss: WAL with
+# synchronous=NORMAL only fsyncs at checkpoints instead of on every commit
+_CONNECTION_PRAGMAS = """
+PRAGMA foreign_keys = ON;
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -65536;
+PRAGMA mmap_size = 268435456;
+PRAGMA busy_timeout = 5000;
+PRAGMA wal_autocheckpoint = 1000;
+"""
+
+# Read-only connections: WAL lets them read alongside the writer
+_READER_PRAGMAS = """
+PRAGMA query_only = 1;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -16384;
+PRAGMA mmap_size = 268435456;
+PRAGMA busy_timeout = 5000;
+"""
+READ_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# Database path for a private in-memory database (tests, throwaway runs)
+IN_MEMORY = ":memory:"
+
+# Read once per process; every Database instance runs the same script
+_SCHEMA_SQL = (Path(__file__).parent / "schema.sql").read_text()
+
+# Databases created before the rollup table have raw history but no buckets:
+# fold it in once, recorded under this schema_metadata key
+_ROLLUP_BACKFILL_KEY = 'rollup_5m_backfilled'
+_ROLLUP_BACKFILL_SQL = "BEGIN;\n" + "".join(
+    f"""
+INSERT OR IGNORE INTO {ROLLUP_TABLE} (metric, bucket_ts, total, min, max, count)
+SELECT '{metric}', CAST(strftime('%s', s.timestamp) AS INTEGER) / {ROLLUP_BUCKET_SECONDS} * {ROLLUP_BUCKET_SECONDS} AS bucket,
+       SUM(m.{column}), MIN(m.{column}), MAX(m.{column}), COUNT(m.{column})
+FROM {table} m JOIN system_snapshots s ON s.id = m.snapshot_id
+WHERE m.{column} IS NOT NULL
+GROUP BY bucket;
+"""
+    for (table, column), metric in ROLLUP_METRICS.items()
+) + f"""
+INSERT OR IGNORE INTO schema_metadata (key, value) VALUES ('{_ROLLUP_BACKFILL_KEY}', datetime('now'));
+COMMIT;
+"""
+
+T = TypeVar('T')
+
+
+def _run_transaction(conn: sqlite3.Connection, fn: Callable[..., T], args: tuple) -> T:
+    """Run fn inside BEGIN IMMEDIATE ... COMMIT (on the database thread)"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        result = fn(conn, *args)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return result
 
 
 class Database:
     """SQLite database manager with async support"""
     
-    def __init__(self, db_path: Path):
-        self.db_path = db_path
+    def __init__(self, db_path: Union[Path, str]):
+        self.db_path = Path(db_path)
+        # An in-memory database lives on one connection: nothing to pool or size
+        self.in_memory = str(db_path) == IN_MEMORY
         self._connection: Optional[aiosqlite.Connection] = None
-        self._schema_path = Path(__file__).parent / "schema.sql"
+        # Keeps single-statement writes from landing inside an open transaction
+        self._write_lock = asyncio.Lock()
+        # Reader connections, opened on demand up to READ_POOL_SIZE
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue = asyncio.Queue()
+        self._reader_slots = READ_POOL_SIZE
     
     async def connect(self):
         """Establish database connection"""
         if self._connection is None:
             # Ensure directory exists
-            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            if not self.in_memory:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Connect to database
-            self._connection = await aiosqlite.connect(str(self.db_path))
+            # Connect to database (statement cache sized for every query the repository uses)
+            self._connection = await aiosqlite.connect(
+                str(self.db_path), cached_statements=STATEMENT_CACHE_SIZE
+            )
             
-            # Enable foreign keys
-            await self._connection.execute("PRAGMA foreign_keys = ON")
+            # Foreign keys, WAL journal and cache sizing in one round-trip
+            await self._connection.executescript(_CONNECTION_PRAGMAS)
             
             # Initialize schema if needed
             await self._initialize_schema()
@@ -36,7 +114,18 @@ class Database:
     
     async def disconnect(self):
         """Close database connection"""
+        for reader in self._readers:
+            await reader.close()
+        self._readers.clear()
+        self._idle_readers = asyncio.Queue()
+        self._reader_slots = READ_POOL_SIZE
+        
         if self._connection:
+            # Cheap on most runs; refreshes planner statistics when they have drifted
+            try:
+                await self._connection.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning(f"PRAGMA optimize failed: {e}")
             await self._connection.close()
             self._connection = None
             logger.info("Disconnected from database")
@@ -44,34 +133,79 @@ class Database:
     async def _initialize_schema(self):
         """Initialize database schema from SQL file"""
         try:
-            # Read schema file
-            schema_sql = self._schema_path.read_text()
-            
-            # Execute schema
-            await self._connection.executescript(schema_sql)
+            # Execute schema (all IF [NOT] EXISTS, so reruns are no-ops)
+            await self._connection.executescript(_SCHEMA_SQL)
             await self._connection.commit()
             
+            await self._backfill_rollups()
+            
             logger.info("Database schema initialized")
         except Exception as e:
             logger.error(f"Failed to initialize schema: {e}")
             raise
     
+    async def _backfill_rollups(self):
+        """Build 5-minute rollups for raw rows written before the rollup table existed"""
+        async with self._connection.execute(
+            "SELECT 1 FROM schema_metadata WHERE key = ?", (_ROLLUP_BACKFILL_KEY,)
+        ) as cursor:
+            if await cursor.fetchone():
+                return
+        
+        # Buckets already present were written live and are left as they are
+        await self._connection.executescript(_ROLLUP_BACKFILL_SQL)
+        logger.info("Backfilled metric rollups from raw history")
+    
     async def execute(self, query: str, params: tuple = ()):
-        """Execute a query"""
+        """Execute a query and commit it"""
         if not self._connection:
             await self.connect()
         
-        cursor = await self._connection.execute(query, params)
-        await self._connection.commit()
+        async with self._write_lock:
+            cursor = await self._connection.execute(query, params)
+            await self._connection.commit()
         return cursor
     
-    async def execute_many(self, query: str, params_list: list):
-        """Execute a query with multiple parameter sets"""
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["Database"]:
+        """
+        Group writes into a single transaction (one commit, one sync)
+        Commits on exit, rolls back if the block raises
+        """
         if not self._connection:
             await self.connect()
         
+        async with self._write_lock:
+            await self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self
+            except BaseException:
+                await self._connection.rollback()
+                raise
+            await self._connection.commit()
+    
+    async def run_in_transaction(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run fn(conn, *args) in one transaction on the connection's own thread
+        conn is the underlying sqlite3.Connection: every statement fn issues,
+        plus BEGIN and COMMIT, costs a single hop to the database thread
+        instead of one await per statement
+        """
+        if not self._connection:
+            await self.connect()
+        
+        async with self._write_lock:
+            # aiosqlite runs queued callables on its connection thread; it has no
+            # public hook for that, so use the one its own methods are built on
+            return await self._connection._execute(_run_transaction, self._connection._conn, fn, args)
+    
+    async def execute_nocommit(self, query: str, params: tuple = ()):
+        """Execute a query inside the current transaction"""
+        return await self._connection.execute(query, params)
+    
+    async def execute_many(self, query: str, params_list: list):
+        """Execute a query with multiple parameter sets inside the current transaction"""
         await self._connection.executemany(query, params_list)
-        await self._connection.commit()
     
     async def fetch_one(self, query: str, params: tuple = ()):
         """Fetch a single row"""
@@ -89,18 +223,96 @@ class Database:
         cursor = await self._connection.execute(query, params)
         return await cursor.fetchall()
     
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read-only connection from the pool"""
+        if not self._connection:
+            await self.connect()
+        
+        if self.in_memory:
+            # Other connections would open their own, empty database
+            yield self._connection
+            return
+        
+        try:
+            reader = self._idle_readers.get_nowait()
+        except asyncio.QueueEmpty:
+            if self._reader_slots > 0:
+                # Claim the slot before awaiting so concurrent callers can't overshoot
+                self._reader_slots -= 1
+                # Autocommit: sqlite3 never opens an implicit transaction, so a
+                # rejected write can't leave the reader pinned to an old snapshot
+                reader = await aiosqlite.connect(
+                    str(self.db_path), cached_statements=STATEMENT_CACHE_SIZE,
+                    isolation_level=None
+                )
+                await reader.executescript(_READER_PRAGMAS)
+                self._readers.append(reader)
+            else:
+                reader = await self._idle_readers.get()
+        
+        try:
+            yield reader
+        finally:
+            self._idle_readers.put_nowait(reader)
+    
+    async def fetch_one_ro(self, query: str, params: tuple = ()):
+        """Fetch a single row on a pooled read-only connection"""
+        async with self._reader() as reader:
+            async with reader.execute(query, params) as cursor:
+                return await cursor.fetchone()
+    
+    async def fetch_all_ro(self, query: str, params: tuple = ()):
+        """Fetch all rows on a pooled read-only connection (doesn't wait on the writer)"""
+        async with self._reader() as reader:
+            async with reader.execute(query, params) as cursor:
+                return await cursor.fetchall()
+    
+    async def fetch_batches_ro(
+        self, query: str, params: tuple = (), batch_size: int = 1000
+    ) -> AsyncIterator[List[tuple]]:
+        """Fetch rows in fixed-size batches on a pooled read-only connection"""
+        async with self._reader() as reader:
+            async with reader.execute(query, params) as cursor:
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+    
+    async def iterate(self, query: str, params: tuple = (), batch_size: int = 500) -> AsyncIterator[tuple]:
+        """Iterate over result rows without materializing the full result set"""
+        if not self._connection:
+            await self.connect()
+        
+        async with self._connection.execute(query, params) as cursor:
+            cursor.arraysize = batch_size
+            async for row in cursor:
+                yield row
+    
     async def cleanup_old_data(self, days: int):
         """Remove data older than specified days"""
         query = """
         DELETE FROM system_snapshots 
         WHERE timestamp < datetime('now', ?)
         """
-        await self.execute(query, (f"-{days} days",))
+        rollup_query = """
+        DELETE FROM metric_rollup_5m
+        WHERE bucket_ts < CAST(strftime('%s', 'now', ?) AS INTEGER)
+        """
+        archive_query = """
+        DELETE FROM metrics_archive
+        WHERE day < CAST(strftime('%s', 'now', ?) AS INTEGER) / 86400
+        """
+        async with self.transaction():
+            await self.execute_nocommit(query, (f"-{days} days",))
+            await self.execute_nocommit(rollup_query, (f"-{days} days",))
+            await self.execute_nocommit(archive_query, (f"-{days} days",))
         logger.info(f"Cleaned up data older than {days} days")
     
     async def get_database_size(self) -> int:
         """Get database file size in bytes"""
-        if self.db_path.exists():
+        if not self.in_memory and self.db_path.exists():
             return self.db_path.stat().st_size
         return 0
     
@@ -112,6 +324,16 @@ class Database:
         await self._connection.execute("VACUUM")
         logger.info("Database vacuumed")
     
+    async def optimize(self):
+        """Refresh query planner statistics (for long-lived connections)"""
+        if not self._connection:
+            await self.connect()
+        
+        # 0x10002: analyze tables as needed, without a cap on how many are checked
+        async with self._write_lock:
+            await self._connection.execute("PRAGMA optimize(0x10002)")
+        logger.debug("Database optimized")
+    
     async def __aenter__(self):
         """Async context manager entry"""
         await self.connect()
@@ -3,10 +3,25 @@ Database migrations
 Handle schema version upgrades
 """
 from pathlib import Path
+from typing import Tuple
 from loguru import logger
 import aiosqlite
 
 
+Version = Tuple[int, int, int]
+
+
+def parse_version(version: str) -> Version:
+    """Parse a 'major.minor.patch' string into a comparable tuple"""
+    major, minor, patch = (int(part) for part in version.split('.'))
+    return major, minor, patch
+
+
+def format_version(version: Version) -> str:
+    """Format a version tuple as 'major.minor.patch'"""
+    return '.'.join(map(str, version))
+
+
 class MigrationManager:
     """Manage database schema migrations"""
     
@@ -38,24 +53,22 @@ class MigrationManager:
         current_version = await self.get_current_version(conn)
         logger.info(f"Current schema version: {current_version}")
         
+        # Parsed once; versions below compare as tuples
+        current = parse_version(current_version)
+        
         # Define migrations
         migrations = [
-            ("1.0.0", self._migrate_to_1_0_0),
+            ((1, 0, 0), self._migrate_to_1_0_0),
             # Add future migrations here
         ]
         
         for version, migration_func in migrations:
-            if self._version_less_than(current_version, version):
-                logger.info(f"Running migration to {version}")
+            if current < version:
+                version_str = format_version(version)
+                logger.info(f"Running migration to {version_str}")
                 await migration_func(conn)
-                await self.set_version(conn, version)
-                logger.info(f"Migration to {version} complete")
-    
-    def _version_less_than(self, v1: str, v2: str) -> bool:
-        """Compare version strings"""
-        v1_parts = [int(x) for x in v1.split('.')]
-        v2_parts = [int(x) for x in v2.split('.')]
-        return v1_parts < v2_parts
+                await self.set_version(conn, version_str)
+                logger.info(f"Migration to {version_str} complete")
     
     async def _migrate_to_1_0_0(self, conn: aiosqlite.Connection):
         """Initial schema - already created by schema.sql"""
@@ -3,7 +3,38 @@ Query builder utilities
 Helper functions for building SQL queries
 """
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+
+
+# Pre-aggregated 5-minute buckets, maintained by Repository.save_snapshot
+ROLLUP_TABLE = "metric_rollup_5m"
+ROLLUP_BUCKET_SECONDS = 5 * 60
+
+# (metrics table, value column) -> metric name in the rollup table
+ROLLUP_METRICS = {
+    ('cpu_metrics', 'usage_percent'): 'cpu',
+    ('ram_metrics', 'usage_percent'): 'ram',
+    ('disk_metrics', 'read_mbps'): 'disk_read',
+    ('disk_metrics', 'write_mbps'): 'disk_write',
+    ('network_metrics', 'download_mbps'): 'network_download',
+    ('network_metrics', 'upload_mbps'): 'network_upload',
+}
+
+# How each aggregation is recombined from the rollup's per-bucket columns
+_ROLLUP_AGGREGATIONS = {
+    'AVG': "SUM(total) / SUM(count)",
+    'MIN': "MIN(min)",
+    'MAX': "MAX(max)",
+    'SUM': "SUM(total)",
+}
+
+
+def bucket_start(timestamp: datetime) -> int:
+    """Unix time of the rollup bucket holding a (naive UTC) timestamp"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    seconds = int(timestamp.timestamp())
+    return seconds - seconds % ROLLUP_BUCKET_SECONDS
 
 
 class QueryBuilder:
@@ -59,8 +90,10 @@ class QueryBuilder:
             ORDER BY s.timestamp DESC
         """
         
+        # Bound rather than formatted in, so every limit shares one cached statement
         if limit:
-            query += f" LIMIT {limit}"
+            query += " LIMIT ?"
+            params.append(int(limit))
         
         return query, params
     
@@ -76,16 +109,31 @@ class QueryBuilder:
         """
         Build aggregation query
         aggregation: AVG, MIN, MAX, SUM
+        Reads the 5-minute rollup table instead of raw rows when the metric is
+        rolled up and the bucket size is a multiple of 5 minutes (the time
+        range is then matched at bucket granularity)
         """
+        aggregation = aggregation.upper()
+        if aggregation not in _ROLLUP_AGGREGATIONS:
+            raise ValueError(f"Unsupported aggregation: {aggregation}")
+        
+        bucket_seconds = int(group_by_minutes) * 60
+        if bucket_seconds <= 0:
+            raise ValueError("group_by_minutes must be positive")
+        
+        metric = ROLLUP_METRICS.get((metric_table, metric_column))
+        if metric and bucket_seconds % ROLLUP_BUCKET_SECONDS == 0:
+            return QueryBuilder._build_rollup_query(
+                metric, aggregation, bucket_seconds, start_time, end_time
+            )
+        
         time_filter, params = QueryBuilder.build_time_range_filter(
             start_time, end_time, "s.timestamp"
         )
         
         query = f"""
             SELECT 
-                datetime(s.timestamp, 'unixepoch', 
-                    (strftime('%s', s.timestamp) / ({group_by_minutes} * 60)) * ({group_by_minutes} * 60), 
-                    'unixepoch') as time_bucket,
+                datetime((strftime('%s', s.timestamp) / ?) * ?, 'unixepoch') as time_bucket,
                 {aggregation}(m.{metric_column}) as value
             FROM system_snapshots s
             JOIN {metric_table} m ON s.id = m.snapshot_id
@@ -94,7 +142,37 @@ class QueryBuilder:
             ORDER BY time_bucket DESC
         """
         
-        return query, params
+        return query, [bucket_seconds, bucket_seconds, *params]
+    
+    @staticmethod
+    def _build_rollup_query(
+        metric: str,
+        aggregation: str,
+        bucket_seconds: int,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> tuple[str, List[Any]]:
+        """
+        Build aggregation query over the rollup table
+        Returns (query, params)
+        """
+        time_filter, params = QueryBuilder.build_time_range_filter(
+            start_time and bucket_start(start_time),
+            end_time and bucket_start(end_time),
+            "bucket_ts"
+        )
+        
+        query = f"""
+            SELECT 
+                datetime(bucket_ts - bucket_ts % ?, 'unixepoch') as time_bucket,
+                {_ROLLUP_AGGREGATIONS[aggregation]} as value
+            FROM {ROLLUP_TABLE}
+            WHERE metric = ? AND {time_filter}
+            GROUP BY time_bucket
+            ORDER BY time_bucket DESC
+        """
+        
+        return query, [bucket_seconds, metric, *params]
     
     @staticmethod
     def build_insert_query(table: str, data: Dict[str, Any]) -> tuple[str, List[Any]]:
@@ -2,19 +2,103 @@
 Data repository layer
 Provides high-level data access methods
 """
-import json
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+import asyncio
+import sqlite3
+from array import array
+from datetime import datetime, timedelta
+from math import nan as NAN
+from typing import AsyncIterator, List, Optional, Dict, Any, Sequence, Tuple
 from loguru import logger
 
 from storage.database import Database
+from storage.compression import decode_series, encode_series, pack_percentages, unpack_percentages
+from storage.query_builder import ROLLUP_METRICS, ROLLUP_TABLE, bucket_start
+from storage.sql_codegen import insert_statement
 from models import (
     SystemSnapshot, CPUMetrics, RAMMetrics, GPUMetrics,
     DiskMetrics, NetworkMetrics, ProcessInfo, SystemContext,
-    AnomalyDetection
+    AnomalyDetection, serialize
 )
 
 
+# Insert statements, kept as constants so each is prepared once and then
+# served from the connection's statement cache. Model-backed ones are generated
+# with a matching row builder (see sql_codegen)
+_INSERT_SNAPSHOT_SQL = "INSERT INTO system_snapshots (timestamp) VALUES (?)"
+_INSERT_CPU = insert_statement(
+    'cpu_metrics', CPUMetrics, ('usage_percent', 'frequency_mhz', 'temperature_celsius')
+)
+_INSERT_CPU_CORES_SQL = "INSERT INTO cpu_core_usage_packed (cpu_metric_id, usages) VALUES (?, ?)"
+_SELECT_CPU_CORES_SQL = """
+    SELECT p.usages
+    FROM cpu_core_usage_packed p
+    JOIN cpu_metrics c ON c.id = p.cpu_metric_id
+    WHERE c.snapshot_id = ?
+"""
+_INSERT_RAM = insert_statement(
+    'ram_metrics', RAMMetrics, ('total_gb', 'used_gb', 'available_gb', 'cached_gb', 'usage_percent')
+)
+_INSERT_GPU = insert_statement(
+    'gpu_metrics', GPUMetrics,
+    ('name', 'usage_percent', 'memory_used_gb', 'memory_total_gb',
+     'temperature_celsius', 'power_draw_watts')
+)
+_INSERT_DISK = insert_statement(
+    'disk_metrics', DiskMetrics, ('read_mbps', 'write_mbps', 'queue_length', 'usage_percent')
+)
+_INSERT_NETWORK = insert_statement(
+    'network_metrics', NetworkMetrics, ('download_mbps', 'upload_mbps', 'connections_active')
+)
+_INSERT_PROCESS = insert_statement(
+    'process_info', ProcessInfo,
+    ('name', 'pid', 'cpu_percent', 'memory_mb', 'threads', 'status')
+)
+_INSERT_CONTEXT = insert_statement(
+    'system_context', SystemContext,
+    ('user_active', 'time_of_day', 'day_of_week', 'user_action')
+)
+_UPSERT_ROLLUP_SQL = f"""
+    INSERT INTO {ROLLUP_TABLE} (metric, bucket_ts, total, min, max, count)
+    VALUES (?, ?, ?, ?, ?, 1)
+    ON CONFLICT (metric, bucket_ts) DO UPDATE SET
+        total = total + excluded.total,
+        min = MIN(min, excluded.min),
+        max = MAX(max, excluded.max),
+        count = count + 1
+"""
+_UPSERT_ARCHIVE_SQL = (
+    "INSERT INTO metrics_archive (metric, day, blob) VALUES (?, ?, ?) "
+    "ON CONFLICT (metric, day) DO UPDATE SET blob = excluded.blob"
+)
+_SELECT_ARCHIVE_SQL = (
+    "SELECT blob FROM metrics_archive WHERE metric = ? AND day >= ? ORDER BY day"
+)
+_INSERT_ANOMALY_SQL = (
+    "INSERT INTO anomalies (timestamp, metric_name, current_value, expected_value, "
+    "deviation_std, severity, context_json) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROS_PER_DAY = 86400 * 1_000_000
+
+
+def _to_micros(timestamp: datetime) -> int:
+    """Microseconds since the epoch for a naive UTC datetime"""
+    return (timestamp - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(micros: int) -> datetime:
+    """Naive UTC datetime for microseconds since the epoch"""
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    """Snapshot timestamps come back from SQLite as ISO strings"""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
 class Repository:
     """Data access layer for system metrics"""
     
@@ -26,167 +110,117 @@ class Repository:
         Save a complete system snapshot to database
         Returns the snapshot ID
         """
+        return (await self.save_snapshots([snapshot]))[0]
+    
+    async def save_snapshots(self, snapshots: List[SystemSnapshot]) -> List[int]:
+        """
+        Save several snapshots in one transaction
+        Rows for each metrics table are inserted with a single executemany
+        across the whole batch. Returns the snapshot IDs in input order
+        """
         try:
-            # Insert snapshot
-            cursor = await self.db.execute(
-                "INSERT INTO system_snapshots (timestamp) VALUES (?)",
-                (snapshot.timestamp,)
-            )
-            snapshot_id = cursor.lastrowid
-            
-            # Save CPU metrics
-            await self._save_cpu_metrics(snapshot_id, snapshot.cpu)
-            
-            # Save RAM metrics
-            await self._save_ram_metrics(snapshot_id, snapshot.ram)
-            
-            # Save GPU metrics
-            if snapshot.gpu:
-                await self._save_gpu_metrics(snapshot_id, snapshot.gpu)
-            
-            # Save disk metrics
-            await self._save_disk_metrics(snapshot_id, snapshot.disk)
-            
-            # Save network metrics
-            await self._save_network_metrics(snapshot_id, snapshot.network)
-            
-            # Save process info
-            if snapshot.processes:
-                await self._save_process_info(snapshot_id, snapshot.processes)
+            # The whole batch runs on the database thread in one hop
+            snapshot_ids = await self.db.run_in_transaction(self._write_snapshots, snapshots)
             
-            # Save context
-            await self._save_context(snapshot_id, snapshot.context)
-            
-            logger.debug(f"Saved snapshot {snapshot_id} at {snapshot.timestamp}")
-            return snapshot_id
+            for snapshot_id, snapshot in zip(snapshot_ids, snapshots):
+                logger.debug(f"Saved snapshot {snapshot_id} at {snapshot.timestamp}")
+            return snapshot_ids
             
         except Exception as e:
             logger.error(f"Failed to save snapshot: {e}")
             raise
     
-    async def _save_cpu_metrics(self, snapshot_id: int, cpu: CPUMetrics):
-        """Save CPU metrics"""
-        cursor = await self.db.execute(
-            """
-            INSERT INTO cpu_metrics 
-            (snapshot_id, usage_percent, frequency_mhz, temperature_celsius)
-            VALUES (?, ?, ?, ?)
-            """,
-            (snapshot_id, cpu.usage_percent, cpu.frequency_mhz, cpu.temperature_celsius)
-        )
+    @staticmethod
+    def _write_snapshots(conn: sqlite3.Connection, snapshots: List[SystemSnapshot]) -> List[int]:
+        """Insert a batch of snapshots (runs on the database thread, inside a transaction)"""
+        # Parent rows go one at a time: their ids key the child rows
+        snapshot_ids = []
+        core_params = []
+        for snapshot in snapshots:
+            cursor = conn.execute(_INSERT_SNAPSHOT_SQL, (snapshot.timestamp,))
+            snapshot_id = cursor.lastrowid
+            snapshot_ids.append(snapshot_id)
+            
+            cursor = conn.execute(_INSERT_CPU.sql, _INSERT_CPU.row(snapshot_id, snapshot.cpu))
+            if snapshot.cpu.per_core_usage:
+                # lastrowid comes back with the cursor, no extra query needed
+                core_params.append((cursor.lastrowid, pack_percentages(snapshot.cpu.per_core_usage)))
         
-        cpu_metric_id = cursor.lastrowid
+        batch = list(zip(snapshot_ids, snapshots))
         
-        # Save per-core usage
-        if cpu.per_core_usage:
-            params = [
-                (cpu_metric_id, idx, usage)
-                for idx, usage in enumerate(cpu.per_core_usage)
-            ]
-            await self.db.execute_many(
-                "INSERT INTO cpu_core_usage (cpu_metric_id, core_index, usage_percent) VALUES (?, ?, ?)",
-                params
-            )
-    
-    async def _save_ram_metrics(self, snapshot_id: int, ram: RAMMetrics):
-        """Save RAM metrics"""
-        await self.db.execute(
-            """
-            INSERT INTO ram_metrics 
-            (snapshot_id, total_gb, used_gb, available_gb, cached_gb, usage_percent)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (snapshot_id, ram.total_gb, ram.used_gb, ram.available_gb, 
-             ram.cached_gb, ram.usage_percent)
-        )
-    
-    async def _save_gpu_metrics(self, snapshot_id: int, gpus: List[GPUMetrics]):
-        """Save GPU metrics"""
-        params = [
-            (snapshot_id, gpu.name, gpu.usage_percent, gpu.memory_used_gb,
-             gpu.memory_total_gb, gpu.temperature_celsius, gpu.power_draw_watts)
-            for gpu in gpus
+        # Save per-core usage (one packed row per sample)
+        if core_params:
+            conn.executemany(_INSERT_CPU_CORES_SQL, core_params)
+        
+        # Save RAM metrics
+        conn.executemany(_INSERT_RAM.sql, [
+            _INSERT_RAM.row(snapshot_id, s.ram) for snapshot_id, s in batch
+        ])
+        
+        # Save GPU metrics
+        gpu_params = [
+            _INSERT_GPU.row(snapshot_id, gpu)
+            for snapshot_id, s in batch
+            for gpu in s.gpu or ()
         ]
-        await self.db.execute_many(
-            """
-            INSERT INTO gpu_metrics 
-            (snapshot_id, name, usage_percent, memory_used_gb, memory_total_gb, 
-             temperature_celsius, power_draw_watts)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            params
-        )
-    
-    async def _save_disk_metrics(self, snapshot_id: int, disk: DiskMetrics):
-        """Save disk metrics"""
-        await self.db.execute(
-            """
-            INSERT INTO disk_metrics 
-            (snapshot_id, read_mbps, write_mbps, queue_length, usage_percent)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (snapshot_id, disk.read_mbps, disk.write_mbps, 
-             disk.queue_length, disk.usage_percent)
-        )
-    
-    async def _save_network_metrics(self, snapshot_id: int, network: NetworkMetrics):
-        """Save network metrics"""
-        await self.db.execute(
-            """
-            INSERT INTO network_metrics 
-            (snapshot_id, download_mbps, upload_mbps, connections_active)
-            VALUES (?, ?, ?, ?)
-            """,
-            (snapshot_id, network.download_mbps, network.upload_mbps, 
-             network.connections_active)
-        )
-    
-    async def _save_process_info(self, snapshot_id: int, processes: List[ProcessInfo]):
-        """Save process information"""
-        params = [
-            (snapshot_id, proc.name, proc.pid, proc.cpu_percent, 
-             proc.memory_mb, proc.threads, proc.status)
-            for proc in processes
+        if gpu_params:
+            conn.executemany(_INSERT_GPU.sql, gpu_params)
+        
+        # Save disk metrics
+        conn.executemany(_INSERT_DISK.sql, [
+            _INSERT_DISK.row(snapshot_id, s.disk) for snapshot_id, s in batch
+        ])
+        
+        # Save network metrics
+        conn.executemany(_INSERT_NETWORK.sql, [
+            _INSERT_NETWORK.row(snapshot_id, s.network) for snapshot_id, s in batch
+        ])
+        
+        # Save process info
+        process_params = [
+            _INSERT_PROCESS.row(snapshot_id, proc)
+            for snapshot_id, s in batch
+            for proc in s.processes
         ]
-        await self.db.execute_many(
-            """
-            INSERT INTO process_info 
-            (snapshot_id, name, pid, cpu_percent, memory_mb, threads, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            params
-        )
+        if process_params:
+            conn.executemany(_INSERT_PROCESS.sql, process_params)
+        
+        # Save context
+        conn.executemany(_INSERT_CONTEXT.sql, [
+            _INSERT_CONTEXT.row(snapshot_id, s.context) for snapshot_id, s in batch
+        ])
+        
+        # Fold into the 5-minute rollups
+        conn.executemany(_UPSERT_ROLLUP_SQL, [
+            row for s in snapshots for row in Repository._rollup_rows(s)
+        ])
+        
+        return snapshot_ids
     
-    async def _save_context(self, snapshot_id: int, context: SystemContext):
-        """Save system context"""
-        await self.db.execute(
-            """
-            INSERT INTO system_context 
-            (snapshot_id, user_active, time_of_day, day_of_week, user_action)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (snapshot_id, context.user_active, context.time_of_day, 
-             context.day_of_week, context.user_action)
+    @staticmethod
+    def _rollup_rows(snapshot: SystemSnapshot) -> List[tuple]:
+        """Upsert rows adding the snapshot's headline metrics to their 5-minute buckets"""
+        bucket = bucket_start(snapshot.timestamp)
+        values = (
+            ('cpu', snapshot.cpu.usage_percent),
+            ('ram', snapshot.ram.usage_percent),
+            ('disk_read', snapshot.disk.read_mbps),
+            ('disk_write', snapshot.disk.write_mbps),
+            ('network_download', snapshot.network.download_mbps),
+            ('network_upload', snapshot.network.upload_mbps),
         )
+        return [(metric, bucket, value, value, value) for metric, value in values]
     
     async def save_anomaly(self, anomaly: AnomalyDetection):
         """Save anomaly detection result"""
         await self.db.execute(
-            """
-            INSERT INTO anomalies 
-            (timestamp, metric_name, current_value, expected_value, 
-             deviation_std, severity, context_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+            _INSERT_ANOMALY_SQL,
             (anomaly.timestamp, anomaly.metric_name, anomaly.current_value,
              anomaly.expected_value, anomaly.deviation_std, anomaly.severity,
-             json.dumps(anomaly.context))
+             serialize(anomaly.context).decode())
         )
     
-    async def get_recent_snapshots(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get recent snapshots with basic metrics"""
-        rows = await self.db.fetch_all(
-            """
+    _RECENT_SNAPSHOTS_QUERY = """
             SELECT 
                 s.id, s.timestamp,
                 c.usage_percent as cpu_usage,
@@ -200,81 +234,262 @@ class Repository:
             LEFT JOIN network_metrics n ON s.id = n.snapshot_id
             ORDER BY s.timestamp DESC
             LIMIT ?
-            """,
-            (limit,)
-        )
+            """
+    
+    @staticmethod
+    def _snapshot_row_to_dict(row: tuple) -> Dict[str, Any]:
+        """Convert a recent-snapshots row to a JSON-ready dict (ISO timestamp string)"""
+        timestamp = row[1]
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.isoformat()
         
-        return [
-            {
-                'id': row[0],
-                'timestamp': row[1],
-                'cpu_usage': row[2],
-                'ram_usage': row[3],
-                'disk_read': row[4],
-                'disk_write': row[5],
-                'net_download': row[6],
-                'net_upload': row[7]
-            }
-            for row in rows
-        ]
+        return {
+            'id': row[0],
+            'timestamp': timestamp,
+            'cpu_usage': row[2],
+            'ram_usage': row[3],
+            'disk_read': row[4],
+            'disk_write': row[5],
+            'net_download': row[6],
+            'net_upload': row[7]
+        }
+    
+    async def get_recent_snapshots(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get recent snapshots with basic metrics"""
+        rows = await self.db.fetch_all_ro(self._RECENT_SNAPSHOTS_QUERY, (limit,))
+        return [self._snapshot_row_to_dict(row) for row in rows]
+    
+    # Column name -> array typecode for columnar snapshot reads (None = plain list)
+    _SNAPSHOT_COLUMNS = (
+        ('id', 'q'),
+        ('timestamp', None),
+        ('cpu_usage', 'd'),
+        ('ram_usage', 'd'),
+        ('disk_read', 'd'),
+        ('disk_write', 'd'),
+        ('net_download', 'd'),
+        ('net_upload', 'd'),
+    )
+    
+    async def get_recent_snapshots_columnar(self, limit: int = 100) -> Dict[str, Sequence]:
+        """
+        Get recent snapshots as one column per metric (newest first)
+        Numeric columns are contiguous arrays with NaN for missing values, which
+        avoids building a dict per row for callers that aggregate or plot
+        """
+        result: Dict[str, Sequence] = {
+            name: array(typecode) if typecode else []
+            for name, typecode in self._SNAPSHOT_COLUMNS
+        }
+        targets = [(result[name], typecode) for name, typecode in self._SNAPSHOT_COLUMNS]
+        
+        # Rows are transposed straight into the columns a batch at a time, so
+        # the full result never exists as a list of row tuples
+        async for rows in self.db.fetch_batches_ro(self._RECENT_SNAPSHOTS_QUERY, (limit,)):
+            for (column, typecode), values in zip(targets, zip(*rows)):
+                if typecode == 'd' and None in values:
+                    column.extend([NAN if v is None else v for v in values])
+                else:
+                    column.extend(values)
+        return result
+    
+    async def iter_recent_snapshots(self, limit: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """Stream recent snapshots with basic metrics, one row at a time"""
+        async for row in self.db.iterate(self._RECENT_SNAPSHOTS_QUERY, (limit,)):
+            yield self._snapshot_row_to_dict(row)
+    
+    @staticmethod
+    def _history_cutoff(hours: int) -> datetime:
+        """
+        Start of a history window, bound as a plain value (snapshot timestamps are UTC)
+        so the timestamp index is searched on a constant
+        """
+        return datetime.utcnow() - timedelta(hours=hours)
+    
+    # Metric name -> (metrics table, value column) for history queries
+    # Same series as the rollup, so everything archive_old_data deletes is archived
+    _METRIC_SOURCES = {name: source for source, name in ROLLUP_METRICS.items()}
+    
+    _METRIC_HISTORY_QUERIES = {
+        name: f"""
+            SELECT s.timestamp, m.{column} as value
+            FROM system_snapshots s
+            JOIN {table} m ON s.id = m.snapshot_id
+            WHERE s.timestamp >= ?
+            ORDER BY s.timestamp DESC
+            LIMIT ?
+        """
+        for name, (table, column) in _METRIC_SOURCES.items()
+    }
+    
+    _METRIC_COUNT_QUERIES = {
+        name: f"""
+            SELECT COUNT(*)
+            FROM system_snapshots s
+            JOIN {table} m ON s.id = m.snapshot_id
+            WHERE s.timestamp >= ?
+        """
+        for name, (table, _column) in _METRIC_SOURCES.items()
+    }
+    
+    _ROLLING_AVG_QUERIES = {
+        name: f"""
+            SELECT s.timestamp,
+                AVG(m.{column}) OVER (
+                    ORDER BY s.timestamp ROWS BETWEEN ? PRECEDING AND CURRENT ROW
+                ) as value
+            FROM system_snapshots s
+            JOIN {table} m ON s.id = m.snapshot_id
+            WHERE s.timestamp >= ?
+            ORDER BY s.timestamp
+        """
+        for name, (table, column) in _METRIC_SOURCES.items()
+    }
     
     async def get_metric_history(
         self, 
         metric_name: str, 
-        hours: int = 24
+        hours: int = 24,
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Get historical data for a specific metric"""
-        # Map metric names to tables
-        metric_queries = {
-            'cpu': """
-                SELECT s.timestamp, c.usage_percent as value
-                FROM system_snapshots s
-                JOIN cpu_metrics c ON s.id = c.snapshot_id
-                WHERE s.timestamp > datetime('now', ?)
-                ORDER BY s.timestamp
-            """,
-            'ram': """
-                SELECT s.timestamp, r.usage_percent as value
-                FROM system_snapshots s
-                JOIN ram_metrics r ON s.id = r.snapshot_id
-                WHERE s.timestamp > datetime('now', ?)
-                ORDER BY s.timestamp
-            """,
-            'disk_read': """
-                SELECT s.timestamp, d.read_mbps as value
-                FROM system_snapshots s
-                JOIN disk_metrics d ON s.id = d.snapshot_id
-                WHERE s.timestamp > datetime('now', ?)
-                ORDER BY s.timestamp
-            """,
-            'network_download': """
-                SELECT s.timestamp, n.download_mbps as value
-                FROM system_snapshots s
-                JOIN network_metrics n ON s.id = n.snapshot_id
-                WHERE s.timestamp > datetime('now', ?)
-                ORDER BY s.timestamp
-            """
-        }
+        """
+        Get historical data for a specific metric, oldest first
+        With a limit, only the most recent `limit` points are fetched
+        """
+        query = self._METRIC_HISTORY_QUERIES.get(metric_name)
+        if not query:
+            return []
         
-        query = metric_queries.get(metric_name)
+        cutoff = self._history_cutoff(hours)
+        # SQLite treats a negative LIMIT as unbounded
+        rows = await self.db.fetch_all_ro(query, (cutoff, -1 if limit is None else limit))
+        history = [{'timestamp': row[0], 'value': row[1]} for row in reversed(rows)]
+        
+        # Older points may already have moved to the archive
+        if limit is None or len(history) < limit:
+            archived = await self._get_archived_points(metric_name, cutoff)
+            if limit is not None:
+                archived = archived[max(len(archived) - (limit - len(history)), 0):]
+            history[:0] = archived
+        
+        return history
+    
+    async def get_rolling_avg(
+        self,
+        metric_name: str,
+        hours: int = 24,
+        window: int = 60
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a metric's moving average over the last `window` points, oldest first
+        Computed by SQLite's window functions in one pass over the range
+        """
+        query = self._ROLLING_AVG_QUERIES.get(metric_name)
         if not query:
             return []
         
-        rows = await self.db.fetch_all(query, (f"-{hours} hours",))
+        # The frame includes the current row, so it reaches back window - 1 rows
+        rows = await self.db.fetch_all_ro(
+            query, (max(window - 1, 0), self._history_cutoff(hours))
+        )
         return [{'timestamp': row[0], 'value': row[1]} for row in rows]
     
-    async def get_statistics(self) -> Dict[str, Any]:
-        """Get database statistics"""
-        total_snapshots = await self.db.fetch_one(
-            "SELECT COUNT(*) FROM system_snapshots"
-        )
+    async def count_metric_history(self, metric_name: str, hours: int = 24) -> int:
+        """Count data points available for a metric in the time range"""
+        query = self._METRIC_COUNT_QUERIES.get(metric_name)
+        if not query:
+            return 0
         
-        oldest_snapshot = await self.db.fetch_one(
-            "SELECT MIN(timestamp) FROM system_snapshots"
+        cutoff = self._history_cutoff(hours)
+        row = await self.db.fetch_one_ro(query, (cutoff,))
+        archived = await self._get_archived_points(metric_name, cutoff)
+        return (row[0] if row else 0) + len(archived)
+    
+    async def get_core_usage(self, snapshot_id: int) -> List[float]:
+        """Get per-core CPU usage for a snapshot (quantized to ~0.4%)"""
+        row = await self.db.fetch_one_ro(_SELECT_CPU_CORES_SQL, (snapshot_id,))
+        return unpack_percentages(row[0]) if row else []
+    
+    async def _get_archived_points(self, metric_name: str, cutoff: datetime) -> List[Dict[str, Any]]:
+        """Decode archived points for a metric from cutoff onwards, oldest first"""
+        start = _to_micros(cutoff)
+        rows = await self.db.fetch_all_ro(
+            _SELECT_ARCHIVE_SQL, (metric_name, start // _MICROS_PER_DAY)
         )
         
-        newest_snapshot = await self.db.fetch_one(
-            "SELECT MAX(timestamp) FROM system_snapshots"
+        points = []
+        for (blob,) in rows:
+            timestamps, values = decode_series(blob)
+            points.extend(
+                {'timestamp': str(_from_micros(ts)), 'value': value}
+                for ts, value in zip(timestamps, values)
+                if ts >= start
+            )
+        return points
+    
+    async def archive_old_data(self, days: int = 7) -> int:
+        """
+        Move history older than `days` (whole UTC days) into the compressed archive
+        The archived metrics (every rolled-up series) stay readable through
+        get_metric_history; the rest of the raw snapshot rows, including GPU,
+        per-core, process and context rows, are deleted.
+        Returns the number of snapshots archived
+        """
+        boundary_day = _to_micros(self._history_cutoff(days * 24)) // _MICROS_PER_DAY
+        boundary = _from_micros(boundary_day * _MICROS_PER_DAY)
+        
+        async with self.db.transaction():
+            for metric_name, (table, column) in self._METRIC_SOURCES.items():
+                cursor = await self.db.execute_nocommit(f"""
+                    SELECT s.timestamp, m.{column}
+                    FROM system_snapshots s
+                    JOIN {table} m ON s.id = m.snapshot_id
+                    WHERE s.timestamp < ?
+                    ORDER BY s.timestamp
+                """, (boundary,))
+                
+                days_points: Dict[int, Tuple[List[int], List[float]]] = {}
+                for timestamp, value in await cursor.fetchall():
+                    micros = _to_micros(_parse_timestamp(timestamp))
+                    ts_list, value_list = days_points.setdefault(micros // _MICROS_PER_DAY, ([], []))
+                    ts_list.append(micros)
+                    value_list.append(value)
+                
+                for day, (ts_list, value_list) in days_points.items():
+                    # Merge with anything archived for the same day earlier
+                    cursor = await self.db.execute_nocommit(
+                        "SELECT blob FROM metrics_archive WHERE metric = ? AND day = ?",
+                        (metric_name, day)
+                    )
+                    existing = await cursor.fetchone()
+                    if existing:
+                        old_ts, old_values = decode_series(existing[0])
+                        merged = sorted(zip(old_ts + ts_list, old_values + value_list))
+                        ts_list = [ts for ts, _ in merged]
+                        value_list = [value for _, value in merged]
+                    
+                    await self.db.execute_nocommit(
+                        _UPSERT_ARCHIVE_SQL,
+                        (metric_name, day, encode_series(ts_list, value_list))
+                    )
+            
+            cursor = await self.db.execute_nocommit(
+                "DELETE FROM system_snapshots WHERE timestamp < ?", (boundary,)
+            )
+            archived = cursor.rowcount
+        
+        if archived:
+            logger.info(f"Archived {archived} snapshots older than {boundary}")
+        return archived
+    
+    async def get_statistics(self) -> Dict[str, Any]:
+        """Get database statistics"""
+        # Kept as separate statements so MIN/MAX stay single index lookups;
+        # they run side by side on pooled readers
+        total_snapshots, oldest_snapshot, newest_snapshot = await asyncio.gather(
+            self.db.fetch_one_ro("SELECT COUNT(*) FROM system_snapshots"),
+            self.db.fetch_one_ro("SELECT MIN(timestamp) FROM system_snapshots"),
+            self.db.fetch_one_ro("SELECT MAX(timestamp) FROM system_snapshots"),
         )
         
         db_size = await self.db.get_database_size()
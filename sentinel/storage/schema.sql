@@ -21,9 +21,18 @@ CREATE TABLE IF NOT EXISTS cpu_metrics (
     FOREIGN KEY (snapshot_id) REFERENCES system_snapshots(id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_cpu_snapshot ON cpu_metrics(snapshot_id);
+-- Covers metric history reads (join on snapshot_id, read usage_percent) without a row lookup
+CREATE INDEX IF NOT EXISTS idx_cpu_snapshot_usage_percent ON cpu_metrics(snapshot_id, usage_percent);
+DROP INDEX IF EXISTS idx_cpu_snapshot;
+
+-- CPU per-core usage, all cores of a sample in one row (one byte per core, see compression.pack_percentages)
+CREATE TABLE IF NOT EXISTS cpu_core_usage_packed (
+    cpu_metric_id INTEGER PRIMARY KEY,
+    usages BLOB NOT NULL,
+    FOREIGN KEY (cpu_metric_id) REFERENCES cpu_metrics(id) ON DELETE CASCADE
+);
 
--- CPU per-core usage
+-- CPU per-core usage, one row per core (legacy layout, no longer written)
 CREATE TABLE IF NOT EXISTS cpu_core_usage (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     cpu_metric_id INTEGER NOT NULL,
@@ -44,7 +53,9 @@ CREATE TABLE IF NOT EXISTS ram_metrics (
     FOREIGN KEY (snapshot_id) REFERENCES system_snapshots(id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_ram_snapshot ON ram_metrics(snapshot_id);
+-- Covers metric history reads (join on snapshot_id, read usage_percent) without a row lookup
+CREATE INDEX IF NOT EXISTS idx_ram_snapshot_usage_percent ON ram_metrics(snapshot_id, usage_percent);
+DROP INDEX IF EXISTS idx_ram_snapshot;
 
 -- GPU metrics
 CREATE TABLE IF NOT EXISTS gpu_metrics (
@@ -72,7 +83,9 @@ CREATE TABLE IF NOT EXISTS disk_metrics (
     FOREIGN KEY (snapshot_id) REFERENCES system_snapshots(id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_disk_snapshot ON disk_metrics(snapshot_id);
+-- Covers metric history reads (join on snapshot_id, read read_mbps) without a row lookup
+CREATE INDEX IF NOT EXISTS idx_disk_snapshot_read_mbps ON disk_metrics(snapshot_id, read_mbps);
+DROP INDEX IF EXISTS idx_disk_snapshot;
 
 -- Network metrics
 CREATE TABLE IF NOT EXISTS network_metrics (
@@ -84,7 +97,9 @@ CREATE TABLE IF NOT EXISTS network_metrics (
     FOREIGN KEY (snapshot_id) REFERENCES system_snapshots(id) ON DELETE CASCADE
 );
 
-CREATE INDEX IF NOT EXISTS idx_network_snapshot ON network_metrics(snapshot_id);
+-- Covers metric history reads (join on snapshot_id, read download_mbps) without a row lookup
+CREATE INDEX IF NOT EXISTS idx_network_snapshot_download_mbps ON network_metrics(snapshot_id, download_mbps);
+DROP INDEX IF EXISTS idx_network_snapshot;
 
 -- Process information
 CREATE TABLE IF NOT EXISTS process_info (
@@ -115,6 +130,27 @@ CREATE TABLE IF NOT EXISTS system_context (
 
 CREATE INDEX IF NOT EXISTS idx_context_snapshot ON system_context(snapshot_id);
 
+-- Pre-aggregated 5-minute buckets per metric (bucket_ts = bucket start, unix time)
+-- Updated with each snapshot so aggregation queries read buckets, not raw rows
+CREATE TABLE IF NOT EXISTS metric_rollup_5m (
+    metric TEXT NOT NULL,
+    bucket_ts INTEGER NOT NULL,
+    total REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (metric, bucket_ts)
+) WITHOUT ROWID;
+
+-- Cold tier: one compressed series per metric per day (day = unix time // 86400)
+-- Blobs are written by storage/compression.py once hot rows age out
+CREATE TABLE IF NOT EXISTS metrics_archive (
+    metric TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    blob BLOB NOT NULL,
+    PRIMARY KEY (metric, day)
+) WITHOUT ROWID;
+
 -- Anomaly detection results
 CREATE TABLE IF NOT EXISTS anomalies (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -0,0 +1,46 @@
+"""
+SQL code generation
+Builds INSERT statements and row builders for model dataclasses once, at import
+"""
+from dataclasses import fields
+from typing import Any, Callable, NamedTuple, Sequence, Tuple, Type
+
+
+class InsertStatement(NamedTuple):
+    """A prepared INSERT and the function that builds its parameter tuple"""
+    sql: str
+    row: Callable[..., Tuple[Any, ...]]
+
+
+def insert_statement(
+    table: str,
+    model: Type,
+    columns: Sequence[str],
+    parent_columns: Sequence[str] = ('snapshot_id',)
+) -> InsertStatement:
+    """
+    Generate INSERT SQL for a model's columns, plus row(*parents, obj)
+    returning (*parents, obj.col1, obj.col2, ...) as a compiled lambda, so
+    building each row is plain attribute loads with no loops or lookups
+    """
+    model_fields = {field.name for field in fields(model)}
+    unknown = [column for column in columns if column not in model_fields]
+    if unknown:
+        raise ValueError(f"{model.__name__} has no field(s): {', '.join(unknown)}")
+    
+    all_columns = (*parent_columns, *columns)
+    for name in all_columns:
+        if not name.isidentifier():
+            raise ValueError(f"Invalid column name: {name!r}")
+    
+    sql = (
+        f"INSERT INTO {table} ({', '.join(all_columns)}) "
+        f"VALUES ({', '.join('?' * len(all_columns))})"
+    )
+    
+    parents = ''.join(f"{name}, " for name in parent_columns)
+    values = ''.join(f"obj.{name}, " for name in columns)
+    source = f"lambda {parents}obj: ({parents}{values})"
+    row = eval(compile(source, f"<insert {table}>", 'eval'), {})
+    
+    return InsertStatement(sql, row)
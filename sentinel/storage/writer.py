@@ -0,0 +1,98 @@
+"""
+Batched snapshot writer
+Group-commits queued snapshots from a single background task
+"""
+import asyncio
+from typing import List, Optional, Tuple
+from loguru import logger
+
+from storage.repository import Repository
+from models import SystemSnapshot
+
+
+class SnapshotWriter:
+    """
+    Queue snapshots and write them in batches
+    Each batch is one transaction with one executemany per table, so the
+    commit and the hops to the database thread are shared by every snapshot
+    that queued up while the previous batch was being written
+    """
+    
+    def __init__(self, repository: Repository, max_batch: int = 64, max_delay: float = 0.0):
+        self.repository = repository
+        self.max_batch = max_batch
+        # Extra time to wait for more snapshots once one arrives (0 = write what is queued)
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the background writer task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.debug("Snapshot writer started")
+    
+    async def stop(self):
+        """Write everything still queued, then stop the writer task"""
+        if self._task is None:
+            return
+        
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        logger.debug("Snapshot writer stopped")
+    
+    def submit(self, snapshot: SystemSnapshot) -> asyncio.Future:
+        """Queue a snapshot; the returned future resolves to its snapshot ID"""
+        if self._task is None:
+            raise RuntimeError("Snapshot writer is not running")
+        
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((snapshot, future))
+        return future
+    
+    async def _run(self):
+        """Drain the queue in batches until stopped"""
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            
+            batch = [item]
+            stopping = await self._fill_batch(batch)
+            await self._write(batch)
+    
+    async def _fill_batch(self, batch: List[Tuple[SystemSnapshot, asyncio.Future]]) -> bool:
+        """Top up a batch from the queue; returns True if stop was requested"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        
+        while len(batch) < self.max_batch:
+            try:
+                if self.max_delay > 0:
+                    item = await asyncio.wait_for(self._queue.get(), deadline - loop.time())
+                else:
+                    item = self._queue.get_nowait()
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            
+            if item is None:
+                return True
+            batch.append(item)
+        
+        return False
+    
+    async def _write(self, batch: List[Tuple[SystemSnapshot, asyncio.Future]]):
+        """Write one batch and resolve its futures"""
+        try:
+            snapshot_ids = await self.repository.save_snapshots([snapshot for snapshot, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), snapshot_id in zip(batch, snapshot_ids):
+            if not future.done():
+                future.set_result(snapshot_id)
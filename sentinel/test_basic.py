@@ -111,7 +111,7 @@ async def test_pipeline():
         
         # Store in database
         print("\nStoring in database...")
-        snapshot_id = await pipeline.collect_and_store()
+        snapshot_id, _ = await pipeline.collect_and_store()
         print(f"✓ Stored with ID: {snapshot_id}")
         
         # Get statistics
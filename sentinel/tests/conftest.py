@@ -0,0 +1,40 @@
+"""
+Shared pytest fixtures
+"""
+import asyncio
+from typing import Tuple
+import pytest
+import pytest_asyncio
+from collectors import (
+    CPUCollector, RAMCollector, GPUCollector, DiskCollector,
+    NetworkCollector, ProcessCollector, ContextCollector
+)
+from models import DiskMetrics, NetworkMetrics, SystemSnapshot
+from tests.fixtures.sample_data import create_sample_snapshot
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session", autouse=True)
+async def _warm_collectors():
+    """Pay the one-off collector imports and probes (NVML, vendor CLIs) before any test"""
+    for cls in (CPUCollector, RAMCollector, GPUCollector, DiskCollector,
+                NetworkCollector, ProcessCollector, ContextCollector):
+        await cls().collect()
+
+
+@pytest.fixture(scope="session")
+def sample_snapshot() -> SystemSnapshot:
+    """Complete sample snapshot, shared by every test (models are frozen)"""
+    return create_sample_snapshot()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def warmed_rate_collectors() -> Tuple[DiskCollector, NetworkCollector, DiskMetrics, NetworkMetrics]:
+    """
+    Disk and network collectors with a first sample taken and one shared wait
+    behind them, so their next collect() reports real rates
+    Returns (disk collector, network collector, first disk sample, first network sample)
+    """
+    disk, network = DiskCollector(), NetworkCollector()
+    disk_metrics, network_metrics = await asyncio.gather(disk.collect(), network.collect())
+    await asyncio.sleep(0.1)
+    return disk, network, disk_metrics, network_metrics
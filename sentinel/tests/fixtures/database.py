@@ -0,0 +1,15 @@
+"""
+Database test helpers
+"""
+from storage import Database
+
+
+async def clear_database(db: Database):
+    """Delete every data row so a shared database starts each test empty"""
+    tables = await db.fetch_all(
+        "SELECT name FROM sqlite_master "
+        "WHERE type = 'table' AND name NOT LIKE 'sqlite_%' AND name != 'schema_metadata'"
+    )
+    async with db.transaction():
+        for (table,) in tables:
+            await db.execute_nocommit(f"DELETE FROM {table}")
@@ -1,13 +1,20 @@
 """
 Sample test data fixtures
+The models are frozen, so each sample is built once and shared
 """
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional
 from models import (
     CPUMetrics, RAMMetrics, GPUMetrics, DiskMetrics,
     NetworkMetrics, ProcessInfo, SystemContext, SystemSnapshot
 )
 
+# Taken once at import so every sample snapshot shares one timestamp
+_SAMPLE_TS = datetime.utcnow()
 
+
+@lru_cache(maxsize=1)
 def create_sample_cpu_metrics() -> CPUMetrics:
     """Create sample CPU metrics"""
     return CPUMetrics(
@@ -18,6 +25,7 @@ def create_sample_cpu_metrics() -> CPUMetrics:
     )
 
 
+@lru_cache(maxsize=1)
 def create_sample_ram_metrics() -> RAMMetrics:
     """Create sample RAM metrics"""
     return RAMMetrics(
@@ -29,6 +37,7 @@ def create_sample_ram_metrics() -> RAMMetrics:
     )
 
 
+@lru_cache(maxsize=1)
 def create_sample_gpu_metrics() -> GPUMetrics:
     """Create sample GPU metrics"""
     return GPUMetrics(
@@ -41,6 +50,7 @@ def create_sample_gpu_metrics() -> GPUMetrics:
     )
 
 
+@lru_cache(maxsize=1)
 def create_sample_disk_metrics() -> DiskMetrics:
     """Create sample disk metrics"""
     return DiskMetrics(
@@ -51,6 +61,7 @@ def create_sample_disk_metrics() -> DiskMetrics:
     )
 
 
+@lru_cache(maxsize=1)
 def create_sample_network_metrics() -> NetworkMetrics:
     """Create sample network metrics"""
     return NetworkMetrics(
@@ -60,6 +71,7 @@ def create_sample_network_metrics() -> NetworkMetrics:
     )
 
 
+@lru_cache(maxsize=1)
 def create_sample_process_info() -> ProcessInfo:
     """Create sample process info"""
     return ProcessInfo(
@@ -72,6 +84,7 @@ def create_sample_process_info() -> ProcessInfo:
     )
 
 
+@lru_cache(maxsize=1)
 def create_sample_context() -> SystemContext:
     """Create sample system context"""
     return SystemContext(
@@ -82,10 +95,11 @@ def create_sample_context() -> SystemContext:
     )
 
 
-def create_sample_snapshot() -> SystemSnapshot:
-    """Create complete sample snapshot"""
+@lru_cache(maxsize=1)
+def create_sample_snapshot(ts: Optional[datetime] = None) -> SystemSnapshot:
+    """Create complete sample snapshot (at ts, or the shared sample timestamp)"""
     return SystemSnapshot(
-        timestamp=datetime.utcnow(),
+        timestamp=ts or _SAMPLE_TS,
         cpu=create_sample_cpu_metrics(),
         ram=create_sample_ram_metrics(),
         gpu=[create_sample_gpu_metrics()],
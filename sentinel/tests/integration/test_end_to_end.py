@@ -13,7 +13,7 @@ from aggregator import Pipeline
 async def test_end_to_end_pipeline():
     """Test complete pipeline end-to-end"""
     # Setup test configuration
-    config = Config.load()
+    config = Config.load(cached=False)
     config.storage.database_path = Path("./test_data/test_e2e.db")
     
     pipeline = Pipeline(config)
@@ -22,12 +22,12 @@ async def test_end_to_end_pipeline():
         # Initialize pipeline
         await pipeline.initialize()
         
-        # Collect and store multiple snapshots
-        snapshot_ids = []
+        # Collect multiple snapshots, then store them in one transaction
+        snapshots = []
         for i in range(3):
-            snapshot_id = await pipeline.collect_and_store()
-            snapshot_ids.append(snapshot_id)
+            snapshots.append(await pipeline.collect_once())
             await asyncio.sleep(0.1)
+        snapshot_ids = await pipeline.repository.save_snapshots(snapshots)
         
         # Verify all snapshots were stored
         assert len(snapshot_ids) == 3
@@ -3,12 +3,15 @@ Unit tests for collectors
 """
 import pytest
 import asyncio
+import sys
 from collectors import (
     CPUCollector, RAMCollector, GPUCollector,
-    DiskCollector, NetworkCollector, ProcessCollector, ContextCollector
+    DiskCollector, NetworkCollector, ProcessCollector, ContextCollector,
+    AIDA64Collector, HWiNFOCollector, PowerShellCollector, BaseCollector
 )
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_cpu_collector():
     """Test CPU collector"""
@@ -21,6 +24,7 @@ async def test_cpu_collector():
     assert len(metrics.per_core_usage) > 0
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_ram_collector():
     """Test RAM collector"""
@@ -33,39 +37,76 @@ async def test_ram_collector():
     assert metrics.used_gb <= metrics.total_gb
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
-async def test_disk_collector():
+async def test_disk_collector(warmed_rate_collectors):
     """Test Disk collector"""
-    collector = DiskCollector()
-    
-    # First collection initializes
-    metrics1 = await collector.collect()
+    collector, _, metrics1, _ = warmed_rate_collectors
     assert metrics1 is not None
     
     # Second collection should have real data
-    await asyncio.sleep(0.1)
     metrics2 = await collector.collect()
     assert metrics2.read_mbps >= 0
     assert metrics2.write_mbps >= 0
+    assert metrics2.read_bytes_total >= metrics1.read_bytes_total
+    assert metrics2.write_bytes_total >= metrics1.write_bytes_total
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
-async def test_network_collector():
+async def test_network_collector(warmed_rate_collectors):
     """Test Network collector"""
-    collector = NetworkCollector()
-    
-    # First collection initializes
-    metrics1 = await collector.collect()
+    _, collector, _, metrics1 = warmed_rate_collectors
     assert metrics1 is not None
     
     # Second collection should have real data
-    await asyncio.sleep(0.1)
     metrics2 = await collector.collect()
     assert metrics2.download_mbps >= 0
     assert metrics2.upload_mbps >= 0
+    assert metrics2.bytes_recv_total >= metrics1.bytes_recv_total
+    assert metrics2.bytes_sent_total >= metrics1.bytes_sent_total
     assert metrics2.connections_active >= 0
 
 
+@pytest.mark.asyncio
+async def test_all_collectors_parallel():
+    """Test every core collector in one gather, sharing a single rate-sampling wait"""
+    from collectors.context_collector import DAY_NAMES
+    
+    cpu, ram, gpu, disk, network = (
+        CPUCollector(), RAMCollector(), GPUCollector(), DiskCollector(), NetworkCollector()
+    )
+    process, context = ProcessCollector(top_n=5), ContextCollector()
+    
+    cpu_metrics, ram_metrics, gpus, disk1, network1, processes, context_data = await asyncio.gather(
+        cpu.collect(), ram.collect(), gpu.collect(), disk.collect(),
+        network.collect(), process.collect(), context.collect()
+    )
+    
+    # Rate-based collectors need a second sample
+    await asyncio.sleep(0.1)
+    disk2, network2 = await asyncio.gather(disk.collect(), network.collect())
+    
+    assert 0 <= cpu_metrics.usage_percent <= 100
+    assert len(cpu_metrics.per_core_usage) > 0
+    assert ram_metrics.used_gb <= ram_metrics.total_gb
+    assert gpus is None or isinstance(gpus, list)
+    assert disk2.read_mbps >= 0
+    assert disk2.read_bytes_total >= disk1.read_bytes_total
+    assert network2.download_mbps >= 0
+    assert network2.bytes_recv_total >= network1.bytes_recv_total
+    assert len(processes) <= 5
+    assert context_data.time_of_day in ['morning', 'afternoon', 'evening', 'night']
+    assert context_data.day_of_week in DAY_NAMES
+    assert isinstance(context_data.user_active, bool)
+    
+    # Both context heuristics share one process scan per collection
+    scanned_at = context._last_scan[0]
+    context._detect_user_action()
+    assert context._last_scan[0] == scanned_at
+
+
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_process_collector():
     """Test Process collector"""
@@ -82,16 +123,290 @@ async def test_process_collector():
         assert proc.cpu_percent >= 0
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_context_collector():
     """Test Context collector"""
+    from collectors.context_collector import DAY_NAMES
+    
     collector = ContextCollector()
     context = await collector.collect()
     
     assert context is not None
     assert context.time_of_day in ['morning', 'afternoon', 'evening', 'night']
-    assert context.day_of_week
+    assert context.day_of_week in DAY_NAMES
     assert isinstance(context.user_active, bool)
+    
+    # Both heuristics share one process scan per collection
+    scanned_at = collector._last_scan[0]
+    collector._detect_user_action()
+    assert collector._last_scan[0] == scanned_at
+
+
+def test_gpu_source_backoff():
+    """Test GPU sources that come back empty are skipped with doubling backoff"""
+    collector = GPUCollector()
+    
+    collector._record_source('nvidia-smi', False)
+    collector._record_source('nvidia-smi', False)
+    assert collector._source_backoff['nvidia-smi'][1] == 2.0
+    assert not collector._source_ready('nvidia-smi')
+    
+    collector._record_source('nvidia-smi', True)
+    assert collector._source_ready('nvidia-smi')
+
+
+def test_gpu_detection_shared():
+    """Test GPU source probing runs once and is reused by later instances"""
+    first, second = GPUCollector(), GPUCollector()
+    
+    assert GPUCollector._detected is not None
+    assert first._nvml_devices is second._nvml_devices
+    assert first._nvidia_available == second._nvidia_available
+
+
+def _hwinfo_shared_memory(readings):
+    """Build an in-memory HWiNFO shared memory block with the given readings"""
+    import mmap
+    import struct
+    
+    header = HWiNFOCollector._HEADER
+    # Reading layout with the label and unit strings filled in
+    record = struct.Struct(
+        f'<III{HWiNFOCollector.HWINFO_SENSORS_STRING_LEN * 2}s'
+        f'{HWiNFOCollector.HWINFO_UNIT_STRING_LEN * 2}sdddd'
+    )
+    assert record.size == HWiNFOCollector._READING_NUMBERS.size
+    buf = mmap.mmap(-1, header.size + record.size * len(readings))
+    buf[:header.size] = header.pack(
+        HWiNFOCollector.HWINFO_SENSORS_SM2_SIGNATURE, 1, 0, 0,
+        0, 0, 0, header.size, record.size, len(readings)
+    )
+    for i, (reading_type, label, unit, value) in enumerate(readings):
+        start = header.size + i * record.size
+        buf[start:start + record.size] = record.pack(
+            reading_type, 0, i, label.encode('utf-16-le'), unit.encode('utf-16-le'),
+            value, value, value, value
+        )
+    return buf
+
+
+@pytest.mark.asyncio
+async def test_hwinfo_collector_parses_shared_memory():
+    """Test HWiNFO readings are parsed and grouped by category"""
+    collector = HWiNFOCollector()
+    collector.shared_memory = _hwinfo_shared_memory([
+        (1, "CPU Temp", "\u00b0C", 55.0),
+        (3, "CPU Fan", "RPM", 900.0),
+        (7, "GPU Load", "%", 20.0),
+        (5, "Fan Controller Power", "W", 2.5),
+        (4, "CPU Current", "A", 1.5),
+        (1, "Idle Sensor", "\u00b0C", 0.0),
+    ])
+    
+    data = await collector.collect()
+    
+    # Categories come from the reading type, not from label or unit text
+    assert data['temperatures'] == {'CPU_Temp': 55.0}
+    assert data['fans'] == {'CPU_Fan': 900.0}
+    assert data['usage'] == {'GPU_Load': 20.0}
+    assert data['power'] == {'Fan_Controller_Power': 2.5}
+    assert data['other'] == {'CPU_Current': 1.5}
+
+
+@pytest.mark.asyncio
+async def test_powershell_collector_caches_static_info():
+    """Test static PowerShell data is queried once and reused"""
+    collector = PowerShellCollector()
+    scripts = []
+    
+    async def fake_execute(script):
+        scripts.append(script)
+        return '{"bios": {"Manufacturer": "ACME"}, "windows_updates": [{"Title": "KB1"}]}'
+    
+    collector._execute_powershell = fake_execute
+    
+    first = await collector.collect()
+    second = await collector.collect()
+    
+    assert len(scripts) == 1
+    assert first == second
+    assert first['bios'] == {"Manufacturer": "ACME"}
+    assert first['windows_updates']['count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_wmi_collector_runs_queries_in_threads():
+    """Test WMI queries run concurrently off the event loop"""
+    import threading
+    from collectors import WMICollector
+    
+    collector = WMICollector()
+    collector._wmi_available = True
+    barrier = threading.Barrier(2, timeout=5)
+    
+    def fake_query():
+        # Only returns if the other query is running at the same time
+        barrier.wait()
+        return threading.current_thread().name
+    
+    collector._get_processor_info = fake_query
+    collector._get_memory_info = fake_query
+    for name in ('_get_disk_info', '_get_network_adapters', '_get_video_controller', '_get_os_info'):
+        setattr(collector, name, lambda: None)
+    
+    data = await collector.collect()
+    
+    assert data['processor'].startswith('collector')
+    assert data['memory'].startswith('collector')
+    assert data['operating_system'] is None
+
+
+@pytest.mark.asyncio
+async def test_temperature_collector_reads_hwmon(tmp_path, monkeypatch):
+    """Test hwmon inputs are located once and read directly"""
+    from collectors import temperature_collector
+    
+    for hwmon, name, inputs in (('hwmon0', 'coretemp', {1: 45000, 2: 47500}), ('hwmon1', 'nvme', {1: 38850})):
+        (tmp_path / hwmon).mkdir()
+        (tmp_path / hwmon / 'name').write_text(name + '\n')
+        for index, value in inputs.items():
+            (tmp_path / hwmon / f'temp{index}_input').write_text(f'{value}\n')
+    
+    monkeypatch.setattr(temperature_collector, 'HWMON_TEMP_GLOBS', (str(tmp_path / 'hwmon*' / 'temp*_input'),))
+    collector = temperature_collector.TemperatureCollector()
+    collector._hwmon_inputs = collector._find_hwmon_inputs()
+    
+    temps = await collector._collect_from_psutil()
+    
+    assert temps == {'coretemp_0': 45.0, 'coretemp_1': 47.5, 'nvme': 38.85}
+
+
+@pytest.mark.asyncio
+async def test_temperature_collector_source_order():
+    """Test temperature sources stop at the first hit and remember it"""
+    from collectors import TemperatureCollector
+    
+    calls = []
+    
+    def source(name, temps):
+        async def collect():
+            calls.append(name)
+            return temps
+        return collect
+    
+    empty, sensors = source('empty', {}), source('sensors', {'cpu': 50.0})
+    collector = TemperatureCollector()
+    collector._sources = [empty, sensors, source('zones', {'zone': 40.0})]
+    
+    assert await collector.collect() == {'cpu': 50.0}
+    assert calls == ['empty', 'sensors']
+    assert collector._sources[:2] == [sensors, empty]
+    
+    collector.merge_sources = True
+    assert await collector.collect() == {'cpu': 50.0, 'zone': 40.0}
+
+
+@pytest.mark.asyncio
+async def test_temperature_collector_pdh_off_loop():
+    """Test the PDH counter is sampled on a worker thread, not the event loop"""
+    import threading
+    from collectors import TemperatureCollector
+    
+    threads = []
+    
+    class FakePdh:
+        def PdhCollectQueryData(self, query):
+            threads.append(threading.get_ident())
+            return 1  # no data
+        
+        def PdhCloseQuery(self, query):
+            pass
+    
+    collector = TemperatureCollector()
+    collector._thermal_counter = (FakePdh(), None, None)
+    
+    assert await collector._collect_from_pdh() == {}
+    assert threads and threads[0] != threading.get_ident()
+    
+    # A collector whose __init__ never ran has no counter to close
+    TemperatureCollector.__new__(TemperatureCollector).__del__()
+
+
+def test_fast_process_iter_fallback():
+    """Test the pre-6.0 psutil fallback caches Process instances by PID"""
+    import os
+    from collectors import _psutil_fast
+    
+    procs = {proc.pid: proc for proc in _psutil_fast._iter_pids()}
+    
+    assert os.getpid() in procs
+    assert _psutil_fast._process_cache[os.getpid()] is procs[os.getpid()]
+    assert next(p for p in _psutil_fast._iter_pids() if p.pid == os.getpid()) is procs[os.getpid()]
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="Linux /proc only")
+def test_count_proc_net_tcp():
+    """Test established connections are counted from /proc/net/tcp"""
+    from collectors.network_collector import NetworkCollector
+    
+    active = NetworkCollector._count_proc_net_tcp()
+    
+    assert isinstance(active, int)
+    assert active >= 0
+
+
+@pytest.mark.asyncio
+async def test_process_snapshot_shared_between_collectors():
+    """Test process and context collectors reuse one process table walk"""
+    from collectors.snapshot import ProcessSnapshot
+    
+    snapshot = ProcessSnapshot()
+    process_collector = ProcessCollector(top_n=5, snapshot=snapshot)
+    context_collector = ContextCollector(snapshot=snapshot)
+    
+    processes = await process_collector.collect()
+    taken_at = snapshot.taken_at
+    await context_collector.collect()
+    
+    assert processes
+    assert snapshot.taken_at == taken_at
+    
+    snapshot.invalidate()
+    await process_collector.collect()
+    assert snapshot.taken_at != taken_at
+
+
+@pytest.mark.asyncio
+async def test_context_collector_scans_off_loop():
+    """Test both context heuristics read the process snapshot on a worker thread"""
+    import threading
+    
+    threads = []
+    
+    class RecordingSnapshot:
+        taken_at = 1.0
+        
+        def get(self):
+            threads.append(threading.get_ident())
+            return [{'name': 'code.exe'}]
+    
+    context = await ContextCollector(snapshot=RecordingSnapshot()).collect()
+    
+    assert context.user_active and context.user_action == 'coding'
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+
+
+def test_context_action_classification():
+    """Test action keywords keep their category priority"""
+    from collectors.context_collector import _ACTION_RE
+    
+    assert _ACTION_RE.match("chrome.exe").lastgroup == "browsing"
+    assert _ACTION_RE.match("steam_code").lastgroup == "coding"  # coding outranks gaming
+    assert _ACTION_RE.match("winword.exe").lastgroup == "office_work"
+    assert _ACTION_RE.match("bash") is None
+
 
 
 @pytest.mark.asyncio
@@ -117,3 +432,72 @@ async def test_collector_enable_disable():
     # Should work again
     result = await collector.safe_collect()
     assert result is not None
+
+
+@pytest.mark.asyncio
+async def test_aida64_collector(tmp_path):
+    """Test AIDA64 report parsing"""
+    report = tmp_path / "report.xml"
+    report.write_text(
+        "<Report>"
+        "<Computer><OS>Windows 11</OS></Computer>"
+        "<Processor><Name>Ryzen 7</Name></Processor>"
+        "<Sensors>"
+        "<Sensor name='CPU' value='45 \u00b0C'/>"
+        "<Sensor name='Fan' value='1,234 RPM'/>"
+        "<Sensor name='Vcore' value='-1.25 V'/>"
+        "<Sensor name='State' value='N/A'/>"
+        "</Sensors>"
+        "</Report>",
+        encoding="utf-8"
+    )
+    
+    collector = AIDA64Collector(report_path=report)
+    data = await collector.collect()
+    
+    assert data['computer'] == {'OS': 'Windows 11'}
+    assert data['processor'] == {'Name': 'Ryzen 7'}
+    assert data['sensors'] == {'CPU': 45.0, 'Fan': 1234.0, 'Vcore': -1.25, 'State': 'N/A'}
+    
+    # Unchanged report is served from cache
+    assert await collector.collect() is data
+
+
+@pytest.mark.asyncio
+async def test_safe_collect_backoff():
+    """Test persistently failing collectors are skipped with backoff"""
+    calls = 0
+    
+    class FailingCollector(BaseCollector):
+        async def collect(self):
+            nonlocal calls
+            calls += 1
+            raise RuntimeError("source unavailable")
+    
+    collector = FailingCollector("Failing")
+    
+    for _ in range(collector.BACKOFF_AFTER_FAILURES + 2):
+        assert await collector.safe_collect() is None
+    
+    # Backoff kicked in after the allowed failures
+    assert calls == collector.BACKOFF_AFTER_FAILURES
+    
+    # Re-enabling clears the backoff
+    collector.enable()
+    await collector.safe_collect()
+    assert calls == collector.BACKOFF_AFTER_FAILURES + 1
+
+
+@pytest.mark.asyncio
+async def test_safe_collect_timeout():
+    """Test a collector that hangs is cut off and counted as a failure"""
+    class HangingCollector(BaseCollector):
+        COLLECT_TIMEOUT_SECONDS = 0.01
+        
+        async def collect(self):
+            await asyncio.sleep(10)
+    
+    collector = HangingCollector("Hanging")
+    
+    assert await asyncio.wait_for(collector.safe_collect(), 1.0) is None
+    assert collector._fail_count == 1
@@ -129,3 +129,41 @@ def test_system_snapshot():
     assert snapshot.disk.read_mbps == 100.0
     assert snapshot.network.connections_active == 25
     assert isinstance(snapshot.timestamp, datetime)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_serialize_snapshot(monkeypatch, use_orjson, sample_snapshot):
+    """Test snapshots serialize to the same JSON with and without orjson"""
+    import json
+    import models
+    
+    if use_orjson and models.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(models, 'orjson', None)
+    
+    snapshot = sample_snapshot
+    data = json.loads(models.serialize(snapshot))
+    
+    assert data['cpu']['usage_percent'] == snapshot.cpu.usage_percent
+    assert data['processes'][0]['name'] == snapshot.processes[0].name
+    assert data['timestamp'] == snapshot.timestamp.isoformat() + '+00:00'
+
+
+def test_sample_snapshot_timestamp():
+    """Test sample snapshots share one timestamp unless given their own"""
+    from tests.fixtures.sample_data import _SAMPLE_TS, create_sample_snapshot
+    
+    ts = datetime(2024, 1, 1, 12, 0, 0)
+    assert create_sample_snapshot().timestamp == _SAMPLE_TS
+    assert create_sample_snapshot(ts).timestamp == ts
+
+
+@pytest.mark.parametrize("model", [
+    CPUMetrics, RAMMetrics, GPUMetrics, DiskMetrics,
+    NetworkMetrics, ProcessInfo, SystemContext, SystemSnapshot
+])
+def test_models_are_slotted(model):
+    """Test metric models carry no per-instance __dict__"""
+    assert '__slots__' in vars(model)
+    assert '__dict__' not in dir(model)
@@ -19,6 +19,15 @@ def test_threshold_detector():
     # Test custom threshold
     detector.set_threshold('custom_metric', 'high', 80.0)
     assert detector.check('custom_metric', 85.0) == Severity.HIGH
+    
+    # Overriding a default takes effect immediately
+    detector.set_threshold('cpu_usage', 'critical', 99.0)
+    assert detector.check('cpu_usage', 98.0) == Severity.HIGH
+    assert detector.thresholds['cpu_usage']['critical'] == 99.0
+    
+    # Direct writes would bypass the compiled lookup, so the view is read-only
+    with pytest.raises(TypeError):
+        detector.thresholds['cpu_usage']['high'] = 80.0
 
 
 def test_threshold_detector_multiple():
@@ -57,6 +66,27 @@ def test_baseline_calculator():
     assert baseline['max'] == 59.0
 
 
+def test_baseline_rolling_window():
+    """Test incremental baseline stats match a full recompute after eviction"""
+    from statistics import mean, stdev
+    
+    calc = BaselineCalculator(window_size=5)
+    values = [3.0, 9.0, 1.0, 7.0, 7.0, 2.0, 8.0, 4.0, 4.0, 6.0, 5.0]
+    
+    for i, value in enumerate(values):
+        calc.add_value('cpu', value)
+        window = values[max(0, i - 4):i + 1]
+        if len(window) < 2:
+            continue
+        
+        baseline = calc.get_baseline('cpu')
+        assert baseline['count'] == len(window)
+        assert baseline['mean'] == pytest.approx(mean(window))
+        assert baseline['std'] == pytest.approx(stdev(window))
+        assert baseline['min'] == min(window)
+        assert baseline['max'] == max(window)
+
+
 def test_baseline_anomaly_detection():
     """Test anomaly detection"""
     calc = BaselineCalculator()
@@ -92,6 +122,21 @@ def test_spike_detector():
     assert spike is None
 
 
+def test_spike_detector_batch():
+    """Test batch detection matches per-metric detection"""
+    detector = SpikeDetector(window_size=5, spike_threshold=1.5)
+    for _ in range(5):
+        detector.add_value('cpu', 50.0)
+        detector.add_value('ram', 40.0)
+    detector.add_value('disk', 10.0)
+    
+    current = {'cpu': 150.0, 'ram': 41.0, 'disk': 500.0, 'gpu': 90.0}
+    spikes = detector.detect_batch(current)
+    
+    assert spikes == [detector.detect_spike('cpu', 150.0)]
+    assert detector.detect_spike('ram', 41.0) is None
+
+
 def test_spike_detector_trend():
     """Test trend detection"""
     detector = SpikeDetector(window_size=10)
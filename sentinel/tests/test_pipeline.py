@@ -2,18 +2,24 @@
 Unit tests for pipeline
 """
 import pytest
+import pytest_asyncio
 import asyncio
+from dataclasses import replace
 from pathlib import Path
 from config import Config
 from aggregator import Pipeline
+from aggregator.ring_buffer import MetricRingBuffer, RingBuffer
+from aggregator.validator import DataValidator
+from storage.database import IN_MEMORY
+from tests.fixtures.database import clear_database
 
 
-@pytest.fixture
-async def test_pipeline():
-    """Create a test pipeline"""
-    config = Config.load()
-    # Use test database
-    config.storage.database_path = Path("./test_data/test_pipeline.db")
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_pipeline():
+    """Create one pipeline (connect, schema, collectors) for the whole module"""
+    config = Config.load(cached=False)
+    # Use an in-memory test database
+    config.storage.database_path = Path(IN_MEMORY)
     
     pipeline = Pipeline(config)
     await pipeline.initialize()
@@ -21,25 +27,26 @@ async def test_pipeline():
     yield pipeline
     
     await pipeline.shutdown()
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def test_pipeline(shared_pipeline):
+    """Hand each test the shared pipeline with empty tables and fresh in-memory state"""
+    yield shared_pipeline
     
-    # Cleanup
-    if config.storage.database_path.exists():
-        config.storage.database_path.unlink()
-    if config.storage.database_path.parent.exists():
-        try:
-            config.storage.database_path.parent.rmdir()
-        except OSError:
-            pass
+    await clear_database(shared_pipeline.database)
+    shared_pipeline._hot_ring.clear()
+    shared_pipeline._reset_adaptive_state()
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_pipeline_initialization(test_pipeline):
     """Test pipeline initialization"""
     assert test_pipeline.database is not None
     assert test_pipeline.repository is not None
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_collect_once(test_pipeline):
     """Test single data collection"""
     snapshot = await test_pipeline.collect_once()
@@ -52,20 +59,109 @@ async def test_collect_once(test_pipeline):
     assert snapshot.context is not None
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_collect_and_store(test_pipeline):
     """Test collecting and storing data"""
-    snapshot_id = await test_pipeline.collect_and_store()
+    snapshot_id, snapshot = await test_pipeline.collect_and_store()
     
     assert snapshot_id > 0
+    assert snapshot.cpu is not None
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_pipeline_statistics(test_pipeline):
     """Test getting pipeline statistics"""
-    # Collect some data first
-    await test_pipeline.collect_and_store()
+    # Collect some data first, stored as one batch
+    snapshots = [await test_pipeline.collect_once() for _ in range(3)]
+    await test_pipeline.repository.save_snapshots(snapshots)
     
     stats = await test_pipeline.get_statistics()
     
-    assert stats['total_snapshots'] > 0
+    assert stats['total_snapshots'] >= 3
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_adaptive_interval(test_pipeline, sample_snapshot):
+    """Test polling interval backs off when stable and resets on change"""
+    base = test_pipeline.adaptive_interval
+    snapshot = sample_snapshot
+    
+    # Stable metrics: interval doubles after enough stable ticks
+    for _ in range(test_pipeline.ADAPTIVE_STABLE_TICKS + 1):
+        test_pipeline._update_adaptive_interval(Pipeline._hot_values(snapshot))
+    assert test_pipeline.adaptive_interval == min(base * 2, test_pipeline._max_interval)
+    
+    # Large change: interval snaps back to base
+    busy = replace(snapshot, cpu=replace(snapshot.cpu, usage_percent=99.0))
+    test_pipeline._update_adaptive_interval(Pipeline._hot_values(busy))
+    assert test_pipeline.adaptive_interval == base
+
+
+def test_validate_snapshot(sample_snapshot):
+    """Test single-pass snapshot validation"""
+    snapshot = sample_snapshot
+    assert DataValidator.validate_snapshot(snapshot) == []
+    
+    snapshot = replace(
+        snapshot,
+        cpu=replace(snapshot.cpu, usage_percent=150.0),
+        ram=replace(snapshot.ram, used_gb=snapshot.ram.total_gb + 1)
+    )
+    errors = DataValidator.validate_snapshot(snapshot)
+    assert len(errors) == 2
+    assert errors[0].startswith("CPU usage")
+
+
+def test_ring_buffer_get_recent():
+    """Test the most recent items come back oldest first"""
+    ring = RingBuffer(capacity=4)
+    for i in range(6):
+        ring.append(i)
+    
+    assert ring.get_recent(2) == [4, 5]
+    assert ring.get_recent(10) == [2, 3, 4, 5]
+    assert ring.get_recent(0) == []
+
+
+def test_metric_ring_buffer():
+    """Test hot metric ring keeps the most recent samples contiguous"""
+    ring = MetricRingBuffer(('a', 'b'), capacity=3)
+    assert len(ring.get_recent('a', 5)) == 0
+    
+    for i in range(5):
+        ring.append((float(i), float(i * 10)))
+    
+    assert len(ring) == 3
+    assert ring.get_recent('a', 5).tolist() == [2.0, 3.0, 4.0]
+    assert ring.get_recent('b', 2).tolist() == [30.0, 40.0]
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_hot_ring_updated_on_store(test_pipeline):
+    """Test collect_and_store feeds the hot metric ring"""
+    await test_pipeline.collect_and_store()
+    
+    recent = test_pipeline.get_recent_array('cpu_usage', 10)
+    assert len(recent) == 1
+    assert 0 <= recent[0] <= 100
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_shutdown_propagates_cancellation():
+    """Test cancelling shutdown reaches the caller, while a cancelled collection task does not"""
+    config = Config.load(cached=False)
+    config.storage.database_path = Path(IN_MEMORY)
+    pipeline = Pipeline(config)
+    await pipeline.initialize()
+    
+    pipeline._collection_task = asyncio.create_task(asyncio.sleep(3600))
+    shutdown = asyncio.create_task(pipeline.shutdown())
+    await asyncio.sleep(0)
+    shutdown.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await shutdown
+    
+    # The collection task went down with it; a second shutdown completes
+    assert pipeline._collection_task.cancelled()
+    await pipeline.shutdown()
+    assert pipeline.database._connection is None
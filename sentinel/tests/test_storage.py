@@ -1,44 +1,73 @@
 """
 Unit tests for storage layer
 """
+import json
+import sqlite3
 import pytest
+import pytest_asyncio
 import asyncio
-from pathlib import Path
-from datetime import datetime
-from storage import Database, Repository
+from datetime import datetime, timedelta
+from storage import Database, Repository, SnapshotWriter
+from storage.database import IN_MEMORY
+from storage.compression import decode_series, encode_series
+from storage.query_builder import QueryBuilder
+from storage.sql_codegen import insert_statement
+from tests.fixtures.database import clear_database
 from models import (
     CPUMetrics, RAMMetrics, DiskMetrics, NetworkMetrics,
-    SystemContext, SystemSnapshot
+    SystemContext, SystemSnapshot, AnomalyDetection
 )
 
 
-@pytest.fixture
-async def test_db():
-    """Create a test database"""
-    db_path = Path("./test_data/test.db")
-    db_path.parent.mkdir(parents=True, exist_ok=True)
+def _snapshot(timestamp: datetime, cpu_usage: float = 50.0, per_core_usage=()) -> SystemSnapshot:
+    """Build a minimal snapshot for storage tests"""
+    return SystemSnapshot(
+        timestamp=timestamp,
+        cpu=CPUMetrics(usage_percent=cpu_usage, per_core_usage=list(per_core_usage), frequency_mhz=3000.0),
+        ram=RAMMetrics(total_gb=16.0, used_gb=8.0, available_gb=8.0, usage_percent=50.0),
+        disk=DiskMetrics(read_mbps=1.0, write_mbps=1.0, queue_length=0),
+        network=NetworkMetrics(download_mbps=1.0, upload_mbps=1.0, connections_active=1),
+        context=SystemContext(user_active=True, time_of_day="afternoon", day_of_week="Monday")
+    )
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def shared_db():
+    """Create one in-memory test database (connect, schema) for the whole module"""
+    db = Database(IN_MEMORY)
+    await db.connect()
+    
+    yield db
     
-    db = Database(db_path)
+    await db.disconnect()
+
+
+@pytest_asyncio.fixture
+async def disk_db(tmp_path):
+    """Create an on-disk test database, for behaviour that needs real files (WAL, reader pool)"""
+    db = Database(tmp_path / "test.db")
     await db.connect()
     
     yield db
     
     await db.disconnect()
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def test_db(shared_db):
+    """Hand each test the shared database, emptied afterwards"""
+    yield shared_db
     
-    # Cleanup
-    if db_path.exists():
-        db_path.unlink()
-    if db_path.parent.exists():
-        db_path.parent.rmdir()
+    await clear_database(shared_db)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_database_connection(test_db):
     """Test database connection"""
     assert test_db._connection is not None
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_save_snapshot(test_db):
     """Test saving a snapshot"""
     repo = Repository(test_db)
@@ -78,24 +107,16 @@ async def test_save_snapshot(test_db):
     snapshot_id = await repo.save_snapshot(snapshot)
     
     assert snapshot_id > 0
+    assert await repo.get_core_usage(snapshot_id) == [49.8, 54.9]
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_get_recent_snapshots(test_db):
     """Test retrieving recent snapshots"""
     repo = Repository(test_db)
     
     # Save a snapshot first
-    snapshot = SystemSnapshot(
-        timestamp=datetime.utcnow(),
-        cpu=CPUMetrics(usage_percent=50.0, per_core_usage=[], frequency_mhz=3000.0),
-        ram=RAMMetrics(total_gb=16.0, used_gb=8.0, available_gb=8.0, usage_percent=50.0),
-        disk=DiskMetrics(read_mbps=100.0, write_mbps=50.0, queue_length=0),
-        network=NetworkMetrics(download_mbps=10.0, upload_mbps=5.0, connections_active=25),
-        context=SystemContext(user_active=True, time_of_day="afternoon", day_of_week="Monday")
-    )
-    
-    await repo.save_snapshot(snapshot)
+    await repo.save_snapshot(_snapshot(datetime.utcnow()))
     
     # Retrieve snapshots
     snapshots = await repo.get_recent_snapshots(limit=10)
@@ -104,7 +125,7 @@ async def test_get_recent_snapshots(test_db):
     assert 'cpu_usage' in snapshots[0]
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_database_statistics(test_db):
     """Test database statistics"""
     repo = Repository(test_db)
@@ -114,3 +135,286 @@ async def test_database_statistics(test_db):
     assert 'total_snapshots' in stats
     assert 'database_size_mb' in stats
     assert isinstance(stats['total_snapshots'], int)
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_iter_recent_snapshots(test_db):
+    """Test streaming recent snapshots matches the list version"""
+    repo = Repository(test_db)
+    
+    for i in range(3):
+        await repo.save_snapshot(_snapshot(datetime(2024, 1, 1, 12, 0, i), cpu_usage=10.0 * i))
+    
+    streamed = [row async for row in repo.iter_recent_snapshots(limit=2)]
+    
+    assert streamed == await repo.get_recent_snapshots(limit=2)
+    assert [row['cpu_usage'] for row in streamed] == [20.0, 10.0]
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_metric_history_limit(test_db):
+    """Test metric history returns only the newest points, oldest first"""
+    repo = Repository(test_db)
+    now = datetime.utcnow()
+    
+    for i in range(5):
+        await repo.save_snapshot(_snapshot(now - timedelta(seconds=5 - i), cpu_usage=10.0 * i))
+    
+    history = await repo.get_metric_history('cpu', hours=1, limit=2)
+    
+    assert [point['value'] for point in history] == [30.0, 40.0]
+    assert len(await repo.get_metric_history('cpu', hours=1)) == 5
+    assert await repo.count_metric_history('cpu', hours=1) == 5
+    assert await repo.get_metric_history('unknown') == []
+    
+    rolling = await repo.get_rolling_avg('cpu', hours=1, window=2)
+    assert [point['value'] for point in rolling] == [0.0, 5.0, 15.0, 25.0, 35.0]
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_transaction_rolls_back(test_db):
+    """Test a failing transaction leaves no partial writes behind"""
+    with pytest.raises(RuntimeError):
+        async with test_db.transaction():
+            await test_db.execute_nocommit(
+                "INSERT INTO system_snapshots (timestamp) VALUES (?)",
+                (datetime(2024, 1, 1),)
+            )
+            raise RuntimeError("boom")
+    
+    row = await test_db.fetch_one("SELECT COUNT(*) FROM system_snapshots")
+    assert row[0] == 0
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_recent_snapshots_columnar(test_db):
+    """Test columnar snapshot reads line up with the row-based version"""
+    repo = Repository(test_db)
+    assert len((await repo.get_recent_snapshots_columnar(limit=5))['cpu_usage']) == 0
+    
+    for i in range(3):
+        await repo.save_snapshot(_snapshot(datetime(2024, 1, 1, 12, 0, i), cpu_usage=10.0 * i))
+    
+    columns = await repo.get_recent_snapshots_columnar(limit=2)
+    rows = await repo.get_recent_snapshots(limit=2)
+    
+    assert columns['cpu_usage'].tolist() == [20.0, 10.0]
+    assert list(columns['id']) == [row['id'] for row in rows]
+    assert columns['timestamp'] == [row['timestamp'] for row in rows]
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_aggregation_uses_rollup(test_db):
+    """Test rollup aggregation matches aggregating the raw rows"""
+    repo = Repository(test_db)
+    
+    for i in range(6):
+        await repo.save_snapshot(_snapshot(datetime(2024, 1, 1, 12, 2 * i, 0), cpu_usage=10.0 * i))
+    
+    expected = {
+        "AVG": [50.0, 35.0, 10.0],
+        "MIN": [50.0, 30.0, 0.0],
+        "MAX": [50.0, 40.0, 20.0],
+        "SUM": [50.0, 70.0, 30.0],
+    }
+    for aggregation, values in expected.items():
+        query, params = QueryBuilder.build_aggregation_query(
+            "cpu_metrics", "usage_percent", aggregation, group_by_minutes=5
+        )
+        assert "metric_rollup_5m" in query
+        rows = await test_db.fetch_all(query, tuple(params))
+        assert [row[1] for row in rows] == values
+        assert rows[0][0] == "2024-01-01 12:10:00"
+    
+    # 7 minutes is not a multiple of the rollup size, so raw rows are bucketed
+    query, params = QueryBuilder.build_aggregation_query(
+        "cpu_metrics", "usage_percent", "MAX", group_by_minutes=7
+    )
+    assert "metric_rollup_5m" not in query
+    rows = await test_db.fetch_all(query, tuple(params))
+    assert rows[0][1] == 50.0
+    assert all(row[0] is not None for row in rows)
+    
+    with pytest.raises(ValueError):
+        QueryBuilder.build_aggregation_query("cpu_metrics", "usage_percent", "AVG); DROP TABLE x; --")
+    
+    query, params = QueryBuilder.build_metric_query("cpu_metrics", "usage_percent", limit=2)
+    assert "LIMIT ?" in query and params == [2]
+    assert len(await test_db.fetch_all(query, tuple(params))) == 2
+
+
+@pytest.mark.disk
+@pytest.mark.asyncio
+async def test_rollup_backfill(disk_db):
+    """Test raw history from before the rollup table is aggregated after reconnecting"""
+    repo = Repository(disk_db)
+    for i in range(6):
+        await repo.save_snapshot(_snapshot(datetime(2024, 1, 1, 12, 2 * i, 0), cpu_usage=10.0 * i))
+    
+    # An older database: raw rows, no buckets, never backfilled
+    await disk_db.execute("DELETE FROM metric_rollup_5m")
+    await disk_db.execute("DELETE FROM schema_metadata WHERE key = 'rollup_5m_backfilled'")
+    await disk_db.disconnect()
+    await disk_db.connect()
+    
+    query, params = QueryBuilder.build_aggregation_query(
+        "cpu_metrics", "usage_percent", "AVG", group_by_minutes=5
+    )
+    rows = await disk_db.fetch_all(query, tuple(params))
+    assert [row[1] for row in rows] == [50.0, 35.0, 10.0]
+    
+    # Runs once: buckets written after the backfill are not folded in again
+    await disk_db.disconnect()
+    await disk_db.connect()
+    assert await disk_db.fetch_all(query, tuple(params)) == rows
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_save_anomaly(test_db):
+    """Test anomaly context is stored as compact JSON"""
+    repo = Repository(test_db)
+    anomaly = AnomalyDetection(
+        timestamp=datetime(2024, 1, 1, 12, 0, 0),
+        metric_name="cpu",
+        current_value=95.0,
+        expected_value=40.0,
+        deviation_std=4.2,
+        severity="high",
+        context={"process": "python", "since": datetime(2024, 1, 1, 11, 59, 0)}
+    )
+    
+    await repo.save_anomaly(anomaly)
+    
+    row = await test_db.fetch_one("SELECT context_json FROM anomalies")
+    assert json.loads(row[0]) == {"process": "python", "since": "2024-01-01T11:59:00+00:00"}
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_snapshot_writer_batches(test_db):
+    """Test queued snapshots are written together and each gets its own ID"""
+    repo = Repository(test_db)
+    writer = SnapshotWriter(repo)
+    writer.start()
+    
+    futures = [
+        writer.submit(_snapshot(datetime(2024, 1, 1, 12, 0, i), cpu_usage=10.0 * i, per_core_usage=[1.0, 2.0]))
+        for i in range(3)
+    ]
+    snapshot_ids = await asyncio.gather(*futures)
+    await writer.stop()
+    
+    assert len(set(snapshot_ids)) == 3
+    cores = await test_db.fetch_one("SELECT COUNT(*), SUM(length(usages)) FROM cpu_core_usage_packed")
+    assert tuple(cores) == (3, 6)
+    history = await repo.get_recent_snapshots(limit=3)
+    assert [row['id'] for row in history] == snapshot_ids[::-1]
+
+
+@pytest.mark.disk
+@pytest.mark.asyncio
+async def test_db_pragmas(disk_db):
+    """Test connections come up with the tuned journal, sync and cache settings"""
+    expected = {
+        'journal_mode': 'wal',
+        'synchronous': 1,  # NORMAL
+        'temp_store': 2,  # MEMORY
+        'cache_size': -65536,
+        'foreign_keys': 1,
+    }
+    for pragma, value in expected.items():
+        row = await disk_db.fetch_one(f"PRAGMA {pragma}")
+        assert row[0] == value, pragma
+
+
+@pytest.mark.disk
+@pytest.mark.asyncio
+async def test_read_pool_is_read_only(disk_db):
+    """Test pooled reads see committed data and cannot write"""
+    await disk_db.execute(
+        "INSERT INTO system_snapshots (timestamp) VALUES (?)", (datetime(2024, 1, 1),)
+    )
+    
+    rows = await asyncio.gather(*(
+        disk_db.fetch_one_ro("SELECT COUNT(*) FROM system_snapshots") for _ in range(8)
+    ))
+    assert all(row[0] == 1 for row in rows)
+    
+    with pytest.raises(sqlite3.OperationalError):
+        await disk_db.fetch_all_ro("DELETE FROM system_snapshots")
+    
+    # The rejected write must not pin the reader to an old snapshot
+    await disk_db.execute("DELETE FROM system_snapshots")
+    rows = await asyncio.gather(*(
+        disk_db.fetch_one_ro("SELECT COUNT(*) FROM system_snapshots") for _ in range(8)
+    ))
+    assert all(row[0] == 0 for row in rows)
+
+
+def test_series_compression_roundtrip():
+    """Test delta-of-delta / XOR encoding is lossless"""
+    timestamps = [1_700_000_000_000_000 + i * 1_000_000 + (i % 3) for i in range(100)]
+    values = [50.0 if i % 7 else 12.5 * i for i in range(100)]
+    
+    blob = encode_series(timestamps, values)
+    
+    assert decode_series(blob) == (timestamps, values)
+    assert len(blob) < len(timestamps) * 16 // 4
+    assert decode_series(encode_series([], [])) == ([], [])
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_archive_old_data(test_db):
+    """Test archived history stays readable after the raw rows are removed"""
+    repo = Repository(test_db)
+    now = datetime.utcnow()
+    
+    for i in range(4):
+        await repo.save_snapshot(_snapshot(now - timedelta(days=10, seconds=i), cpu_usage=10.0 * i, per_core_usage=[1.0]))
+    
+    before = await repo.get_metric_history('cpu', hours=24 * 11)
+    upload_before = await repo.get_metric_history('network_upload', hours=24 * 11)
+    
+    assert await repo.archive_old_data(days=7) == 4
+    
+    stats = await repo.get_statistics()
+    assert stats['total_snapshots'] == 0
+    assert await repo.get_metric_history('cpu', hours=24 * 11) == before
+    assert await repo.get_metric_history('network_upload', hours=24 * 11) == upload_before
+    assert await repo.get_metric_history('cpu', hours=24 * 11, limit=2) == before[-2:]
+    assert await repo.count_metric_history('cpu', hours=24 * 11) == 4
+    assert await repo.get_metric_history('cpu', hours=1) == []
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_run_in_transaction(test_db):
+    """Test synchronous batches commit together or not at all"""
+    def insert(conn, fail):
+        conn.execute("INSERT INTO system_snapshots (timestamp) VALUES (?)", (datetime(2024, 1, 1),))
+        if fail:
+            raise ValueError("boom")
+        return conn.execute("SELECT COUNT(*) FROM system_snapshots").fetchone()[0]
+    
+    with pytest.raises(ValueError):
+        await test_db.run_in_transaction(insert, True)
+    assert await test_db.run_in_transaction(insert, False) == 1
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_aiosqlite_internals(test_db):
+    """Test the aiosqlite internals run_in_transaction relies on still exist"""
+    import inspect
+    
+    assert inspect.iscoroutinefunction(test_db._connection._execute)
+    assert isinstance(test_db._connection._conn, sqlite3.Connection)
+
+
+def test_insert_statement_codegen():
+    """Test generated INSERT SQL and row builders"""
+    statement = insert_statement('ram_metrics', RAMMetrics, ('used_gb', 'usage_percent'))
+    assert statement.sql == "INSERT INTO ram_metrics (snapshot_id, used_gb, usage_percent) VALUES (?, ?, ?)"
+    
+    ram = RAMMetrics(total_gb=16.0, used_gb=8.0, available_gb=8.0, usage_percent=50.0)
+    assert statement.row(7, ram) == (7, 8.0, 50.0)
+    
+    with pytest.raises(ValueError):
+        insert_statement('ram_metrics', RAMMetrics, ('swap_gb',))
@@ -0,0 +1,74 @@
+"""
+Unit tests for utilities
+"""
+import platform
+from datetime import datetime, timezone
+from utils.formatters import format_bytes, format_metric_value, format_percentage, format_timestamp
+from utils.system_utils import get_system_info, is_linux
+from utils.time_utils import parse_timestamp, seconds_until_next_interval
+
+
+def test_format_timestamp():
+    """Test timestamps format to whole seconds without a zone offset"""
+    assert format_timestamp(datetime(2024, 1, 2, 3, 4, 5, 678901)) == "2024-01-02 03:04:05"
+    assert format_timestamp(datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)) == "2024-01-02 03:04:05"
+
+
+def test_format_metric_value():
+    """Test metric names pick their unit by the first matching keyword"""
+    assert format_metric_value('cpu_usage_percent', 42.04) == "42.0%"
+    assert format_metric_value('disk_read_mbps', 1.5) == "1.50 MB/s"
+    assert format_metric_value('GPU_Usage_GB', 3.0) == "3.0%"  # 'usage' outranks 'gb'
+    assert format_metric_value('frequency_mhz', 3600.4) == "3600 MHz"
+    assert format_metric_value('temperature_celsius', 65.0) == "65.0°C"
+    assert format_metric_value('queue_length', 2.0) == "2.00"
+
+
+def test_system_info_is_cached_copy():
+    """Test system info is gathered once but handed out as independent dicts"""
+    info = get_system_info()
+    info['platform'] = 'changed'
+    
+    assert get_system_info()['platform'] == platform.system()
+    assert is_linux() == (platform.system() == 'Linux')
+
+
+def test_parse_timestamp():
+    """Test each supported timestamp shape parses, anything else gives None"""
+    expected = datetime(2024, 1, 2, 3, 4, 5)
+    
+    assert parse_timestamp("2024-01-02T03:04:05") == expected
+    assert parse_timestamp("2024-01-02 03:04:05") == expected
+    assert parse_timestamp("2024/01/02 03:04:05") == expected
+    assert parse_timestamp("02-01-2024 03:04:05") == expected
+    assert parse_timestamp("2024/1/5 10:00:00") == datetime(2024, 1, 5, 10)
+    assert parse_timestamp("5-1-2024 10:00:00") == datetime(2024, 1, 5, 10)
+    assert parse_timestamp("2024-1-5 10:00:00") == datetime(2024, 1, 5, 10)
+    assert parse_timestamp("2024-13-01 00:00:00") is None
+    assert parse_timestamp("yesterday") is None
+
+
+def test_format_bytes():
+    """Test byte counts pick the largest unit below 1024"""
+    assert format_bytes(512) == "512.00 B"
+    assert format_bytes(1024) == "1.00 KB"
+    assert format_bytes(1536 * 1024) == "1.50 MB"
+    assert format_bytes(2 ** 60) == "1024.00 PB"
+    assert format_bytes(float('inf')) == "inf PB"
+    assert format_bytes(float('nan')) == "nan PB"
+
+
+def test_format_percentage():
+    """Test percentage color bands switch at 50 and 80"""
+    assert format_percentage(49.9) == "[green]49.9%[/green]"
+    assert format_percentage(50.0) == "[yellow]50.0%[/yellow]"
+    assert format_percentage(80.0) == "[red]80.0%[/red]"
+
+
+def test_seconds_until_next_interval(monkeypatch):
+    """Test interval boundaries are measured on the epoch clock"""
+    import utils.time_utils as time_utils
+    
+    monkeypatch.setattr(time_utils.time, 'time', lambda: 1_700_000_042.5)
+    assert seconds_until_next_interval(60) == 57.5
+    assert 0 < seconds_until_next_interval(300) <= 300
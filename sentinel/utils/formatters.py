@@ -1,32 +1,49 @@
 """
 Data formatting utilities
 """
+import math
+from bisect import bisect_right
 from datetime import datetime
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
 
 
 def format_bytes(bytes_value: float) -> str:
     """Format bytes to human-readable string"""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.2f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.2f} PB"
+    if bytes_value < 1024:
+        return f"{bytes_value:.2f} B"
+    if not math.isfinite(bytes_value):
+        # inf/nan (a bad sensor read) have no bit length; show them in the largest unit
+        return f"{bytes_value:.2f} {_BYTE_UNITS[-1]}"
+    
+    # Each unit is 10 more bits: pick it from the bit length, then divide once
+    index = min((int(bytes_value).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (10 * index)):.2f} {_BYTE_UNITS[index]}"
+
+
+# Color bands: below 50 green, below 80 yellow, otherwise red
+_PERCENT_CUTOFFS = (50.0, 80.0)
+_PERCENT_TEMPLATES = (
+    "[green]{:.1f}%[/green]",
+    "[yellow]{:.1f}%[/yellow]",
+    "[red]{:.1f}%[/red]",
+)
 
 
 def format_percentage(value: float) -> str:
     """Format percentage with color coding"""
-    if value < 50:
-        return f"[green]{value:.1f}%[/green]"
-    elif value < 80:
-        return f"[yellow]{value:.1f}%[/yellow]"
-    else:
-        return f"[red]{value:.1f}%[/red]"
+    return _PERCENT_TEMPLATES[bisect_right(_PERCENT_CUTOFFS, value)].format(value)
 
 
 def format_timestamp(dt: datetime) -> str:
-    """Format timestamp for display"""
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
+    """Format timestamp for display (YYYY-MM-DD HH:MM:SS)"""
+    # isoformat is ~4x faster than strftime; drop the zone so no offset is appended
+    if dt.tzinfo is not None:
+        dt = dt.replace(tzinfo=None)
+    return dt.isoformat(' ', 'seconds')
 
 
 def format_duration(seconds: float) -> str:
@@ -41,19 +58,39 @@ def format_duration(seconds: float) -> str:
         return f"{hours:.1f}h"
 
 
+# Metric name substring -> unit category, checked in order (first match wins)
+_METRIC_CATEGORY_RULES = (
+    ('percent', 'percent'),
+    ('usage', 'percent'),
+    ('mbps', 'mbps'),
+    ('mb/s', 'mbps'),
+    ('gb', 'gb'),
+    ('mhz', 'mhz'),
+    ('celsius', 'celsius'),
+    ('watts', 'watts'),
+)
+
+_METRIC_FORMATS = {
+    'percent': "{:.1f}%",
+    'mbps': "{:.2f} MB/s",
+    'gb': "{:.2f} GB",
+    'mhz': "{:.0f} MHz",
+    'celsius': "{:.1f}°C",
+    'watts': "{:.1f}W",
+    None: "{:.2f}",
+}
+
+
+@lru_cache(maxsize=512)
+def _metric_category(metric_name: str) -> Optional[str]:
+    """Resolve a metric name to its unit category (names repeat every snapshot)"""
+    name = metric_name.lower()
+    for needle, category in _METRIC_CATEGORY_RULES:
+        if needle in name:
+            return category
+    return None
+
+
 def format_metric_value(metric_name: str, value: float) -> str:
     """Format metric value based on metric type"""
-    if 'percent' in metric_name.lower() or 'usage' in metric_name.lower():
-        return f"{value:.1f}%"
-    elif 'mbps' in metric_name.lower() or 'mb/s' in metric_name.lower():
-        return f"{value:.2f} MB/s"
-    elif 'gb' in metric_name.lower():
-        return f"{value:.2f} GB"
-    elif 'mhz' in metric_name.lower():
-        return f"{value:.0f} MHz"
-    elif 'celsius' in metric_name.lower():
-        return f"{value:.1f}°C"
-    elif 'watts' in metric_name.lower():
-        return f"{value:.1f}W"
-    else:
-        return f"{value:.2f}"
+    return _METRIC_FORMATS[_metric_category(metric_name)].format(value)
@@ -4,14 +4,21 @@ Helper functions for system operations
 """
 import platform
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional
 
 
-def get_system_info() -> Dict[str, str]:
-    """Get basic system information"""
+# Fixed for the life of the process
+_SYSTEM = platform.system()
+_CPU_COUNT = os.cpu_count() or 1
+
+
+@lru_cache(maxsize=1)
+def _system_info() -> Dict[str, str]:
+    """Collect system information once (platform.processor() may spawn a subprocess)"""
     return {
-        'platform': platform.system(),
+        'platform': _SYSTEM,
         'platform_release': platform.release(),
         'platform_version': platform.version(),
         'architecture': platform.machine(),
@@ -20,19 +27,25 @@ def get_system_info() -> Dict[str, str]:
     }
 
 
+def get_system_info() -> Dict[str, str]:
+    """Get basic system information"""
+    # Copy so callers can't modify the cached dict
+    return dict(_system_info())
+
+
 def is_windows() -> bool:
     """Check if running on Windows"""
-    return platform.system() == 'Windows'
+    return _SYSTEM == 'Windows'
 
 
 def is_linux() -> bool:
     """Check if running on Linux"""
-    return platform.system() == 'Linux'
+    return _SYSTEM == 'Linux'
 
 
 def is_macos() -> bool:
     """Check if running on macOS"""
-    return platform.system() == 'Darwin'
+    return _SYSTEM == 'Darwin'
 
 
 def get_hostname() -> str:
@@ -53,8 +66,9 @@ def get_file_size_mb(path: Path) -> float:
     return path.stat().st_size / (1024 * 1024)
 
 
+@lru_cache(maxsize=1)
 def is_admin() -> bool:
-    """Check if running with admin/root privileges"""
+    """Check if running with admin/root privileges (checked once per process)"""
     try:
         if is_windows():
             import ctypes
@@ -67,7 +81,7 @@ def is_admin() -> bool:
 
 def get_cpu_count() -> int:
     """Get number of CPU cores"""
-    return os.cpu_count() or 1
+    return _CPU_COUNT
 
 
 def get_env_var(name: str, default: Optional[str] = None) -> Optional[str]:
@@ -1,7 +1,10 @@
 """
 Time and date utilities
 """
+import re
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
 
@@ -30,29 +33,36 @@ def format_duration(seconds: float) -> str:
         return f"{days:.1f}d"
 
 
+# strptime fallbacks, picked by a loose prefix so only formats that can match
+# are tried (fromisoformat already covers zero-padded "YYYY-MM-DD HH:MM:SS[.ffffff]")
+_ISO_PREFIX = re.compile(r'\d{4}-\d{2}-\d{2}')
+_STRPTIME_FORMATS = (
+    (re.compile(r'\d{4}-'), ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S.%f")),
+    (re.compile(r'\d{4}/'), ("%Y/%m/%d %H:%M:%S",)),
+    (re.compile(r'\d{1,2}-\d{1,2}-\d{4}'), ("%d-%m-%Y %H:%M:%S",)),
+)
+
+
+@lru_cache(maxsize=1024)
 def parse_timestamp(timestamp_str: str) -> Optional[datetime]:
     """
     Parse timestamp string to datetime
     Supports ISO format and common formats
     """
-    try:
-        return datetime.fromisoformat(timestamp_str)
-    except ValueError:
-        pass
-    
-    # Try common formats
-    formats = [
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M:%S.%f",
-        "%Y/%m/%d %H:%M:%S",
-        "%d-%m-%Y %H:%M:%S",
-    ]
-    
-    for fmt in formats:
+    if _ISO_PREFIX.match(timestamp_str):
         try:
-            return datetime.strptime(timestamp_str, fmt)
+            return datetime.fromisoformat(timestamp_str)
         except ValueError:
-            continue
+            pass
+    
+    for pattern, formats in _STRPTIME_FORMATS:
+        if pattern.match(timestamp_str):
+            for fmt in formats:
+                try:
+                    return datetime.strptime(timestamp_str, fmt)
+                except ValueError:
+                    continue
+            break
     
     return None
 
@@ -79,7 +89,6 @@ def is_business_hours(timestamp: datetime) -> bool:
 
 def seconds_until_next_interval(interval_seconds: int) -> float:
     """Calculate seconds until next interval boundary"""
-    now = datetime.utcnow()
-    seconds_since_epoch = now.timestamp()
-    seconds_into_interval = seconds_since_epoch % interval_seconds
-    return interval_seconds - seconds_into_interval
+    # Straight from the epoch clock: a naive utcnow().timestamp() is read as
+    # local time, which shifted boundaries by the UTC offset
+    return interval_seconds - time.time() % interval_seconds